@@ -0,0 +1,182 @@
+"""
+farrow_cache.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Cache of the Farrow coefficient designs (lagrange_genCoeff,
+  wls_deng_2004, wls_deng_2007).
+
+  A design is identified by a key computed from the name of the design
+  function, its parameters and the hash of the source files used by the
+  function (so the internal constants, e.g. tolerances and Taylor orders,
+  are part of the key and a change of the code invalidates the cache).
+  The designs are kept in an in-process memo and in an on-disk store
+  (one .npy file per design) with a size-bounded LRU eviction.
+
+  The on-disk store is in FARROW_CACHE_DIR (environment variable), or in
+  ~/.cache/vhdl_toolbox/farrow by default. Set FARROW_CACHE_DIR to an empty
+  string to disable it.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import numbers
+import os
+
+import numpy as np
+
+from lagrange_genCoeff import lagrange_genCoeff
+from wls_deng_2004 import wls_deng_2004
+from wls_deng_2007 import wls_deng_2007
+
+CACHE_DIR = os.environ.get('FARROW_CACHE_DIR',
+                           os.path.join(os.path.expanduser('~'), '.cache',
+                                        'vhdl_toolbox', 'farrow'))
+CACHE_MAX_BYTES = 64 * 2**20
+
+# In-process memo: key -> H
+_memo = {}
+
+
+def _canon(value):
+  """Converts a parameter to a JSON value (0.5 and np.float64(0.5) are equal)."""
+  if isinstance(value, (bool, np.bool_)):
+    return bool(value)
+  if isinstance(value, numbers.Integral):
+    return int(value)
+  if isinstance(value, numbers.Real):
+    return float(value)
+  if isinstance(value, str):
+    return value
+  raise TypeError("Parameter %r cannot be used in the cache key." % (value,))
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version(files):
+  """Returns the SHA-256 of the content of the source files."""
+  sha = hashlib.sha256()
+  for fileName in files:
+    with open(fileName, "rb") as file:
+      sha.update(file.read())
+  return sha.hexdigest()
+
+
+def design_key(func, args, kwargs, deps=()):
+  """Returns the key of a design.
+
+  Args:
+    func: Design function.
+    args: Positional parameters.
+    kwargs: Keyword parameters.
+    deps: Names of the source files used by 'func' (same directory as 'func').
+
+  Returns:
+    Hex string.
+  """
+  src_file = inspect.getsourcefile(func)
+  src_dir = os.path.dirname(src_file)
+  files = (src_file,) + tuple(os.path.join(src_dir, dep) for dep in deps)
+
+  # Same key for positional and keyword parameters
+  params = inspect.signature(func).bind(*args, **kwargs)
+  params.apply_defaults()
+
+  payload = json.dumps({'method': func.__name__,
+                        'params': {k: _canon(v) for k, v in params.arguments.items()},
+                        'code': _code_version(files)},
+                       sort_keys=True)
+  return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _evict(cache_dir, max_bytes):
+  """Deletes the least recently used designs until the store fits in max_bytes."""
+  entries = []
+  for name in os.listdir(cache_dir):
+    if not name.endswith('.npy'):
+      continue
+    try:
+      st = os.stat(os.path.join(cache_dir, name))
+    except OSError:
+      continue
+    entries.append((st.st_mtime, st.st_size, name))
+
+  total = sum(size for _, size, _ in entries)
+  for _, size, name in sorted(entries):
+    if total <= max_bytes:
+      break
+    try:
+      os.remove(os.path.join(cache_dir, name))
+    except OSError:
+      pass
+    total -= size
+
+
+def _disk_load(cache_dir, key):
+  path = os.path.join(cache_dir, key + '.npy')
+  try:
+    H = np.load(path)
+  except (OSError, ValueError):
+    return None
+
+  # Most recently used
+  try:
+    os.utime(path)
+  except OSError:
+    pass
+  return H
+
+
+def _disk_store(cache_dir, key, H, max_bytes):
+  try:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, key + '.npy')
+    path_tmp = '%s.%i.tmp' % (path, os.getpid())
+    with open(path_tmp, "wb") as file:
+      np.save(file, H)
+    os.replace(path_tmp, path)
+    _evict(cache_dir, max_bytes)
+  except OSError:
+    pass
+
+
+def farrow_cache(func, deps=()):
+  """Returns a cached version of a Farrow design function.
+
+  The returned function has the same parameters as 'func' and returns a
+  copy of the stored H matrix, so the caller can modify it.
+
+  Args:
+    func: Design function (returns a NumPy array).
+    deps: Names of the other source files used by 'func'.
+  """
+  @functools.wraps(func)
+  def wrapper(*args, **kwargs):
+    key = design_key(func, args, kwargs, deps)
+
+    H = _memo.get(key)
+    if H is None and CACHE_DIR:
+      H = _disk_load(CACHE_DIR, key)
+    if H is None:
+      H = np.asarray(func(*args, **kwargs))
+      if CACHE_DIR:
+        _disk_store(CACHE_DIR, key, H, CACHE_MAX_BYTES)
+    _memo[key] = H
+    return H.copy()
+
+  return wrapper
+
+
+def clear_cache(disk=True):
+  """Clears the in-process memo and, if 'disk' is True, the on-disk store."""
+  _memo.clear()
+  if disk and CACHE_DIR and os.path.isdir(CACHE_DIR):
+    _evict(CACHE_DIR, 0)
+
+
+# Cached design functions
+lagrange_genCoeff_cached = farrow_cache(lagrange_genCoeff)
+wls_deng_2004_cached = farrow_cache(wls_deng_2004, deps=('wls_integrals.py',))
+wls_deng_2007_cached = farrow_cache(wls_deng_2007, deps=('wls_integrals.py',))
@@ -0,0 +1,120 @@
+"""
+farrow_freqresp.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Frequency response of the Fractional Delay (FD) FIR filters obtained from
+  a Farrow structure, for all the fractional delays at once.
+
+  The responses of all the filters are computed with one batched real FFT:
+    - complex response FFT(h[n]) (fd_cplx_response), magnitude and
+      unwrapped phase,
+    - group delay from Re(FFT(n*h[n]) / FFT(h[n])).
+  The frequency grid is the same of scipy.signal.freqz(b, 1, nFFT, whole=False).
+"""
+
+import numpy as np
+
+
+def farrow_fd_filters(H_Farrow, delay_vec):
+  """Computes the FD FIR filters of a Farrow structure.
+
+  h(d) = sum_m d**m * H_Farrow[m, :]
+
+  Args:
+    H_Farrow: Matrix of Farrow coefficients, size (num_filters, num_coeffs).
+    delay_vec: Vector of fractional delays.
+
+  Returns:
+    h_mat: Matrix of FD FIR filters, size (len(delay_vec), num_coeffs).
+  """
+  delay_vec = np.asarray(delay_vec, dtype=np.float64).reshape(-1)
+  d_powers = delay_vec[:, np.newaxis] ** np.arange(np.shape(H_Farrow)[0])
+  return d_powers @ H_Farrow
+
+
+def _dtft(h_mat, nFFT):
+  """DTFT of each row of h_mat on w = pi*k/nFFT, k = 0, ..., nFFT-1."""
+  num_taps = np.shape(h_mat)[1]
+  L = 2*nFFT
+
+  # Time aliasing when the filters are longer than the FFT
+  if num_taps > L:
+    pad = (-num_taps) % L
+    h_mat = np.pad(h_mat, ((0, 0), (0, pad)))
+    h_mat = h_mat.reshape(np.shape(h_mat)[0], -1, L).sum(axis=1)
+  return np.fft.rfft(h_mat, n=L, axis=1)[:, :nFFT]
+
+
+def fd_cplx_response(h_mat, nFFT):
+  """Complex frequency response of a set of FIR filters.
+
+  Args:
+    h_mat: Matrix of FIR filters, one filter for each row.
+    nFFT: Number of frequency points between 0 and pi (pi excluded).
+
+  Returns:
+    w: Frequency vector [rad/sample], size nFFT.
+    Hf: Complex response, size (nFFT, num_filters).
+  """
+  h_mat = np.atleast_2d(np.asarray(h_mat, dtype=np.float64))
+  w = np.pi * np.arange(nFFT) / nFFT
+  return w, _dtft(h_mat, nFFT).T
+
+
+def fd_group_delay(h_mat, Hf, nFFT):
+  """Group delay Re(FFT(n*h[n]) / FFT(h[n])) of a set of FIR filters.
+
+  Args:
+    h_mat: Matrix of FIR filters, one filter for each row.
+    Hf: Complex response of fd_cplx_response, size (nFFT, num_filters).
+    nFFT: Number of frequency points between 0 and pi (pi excluded).
+
+  Returns:
+    Group delay [samples], size (nFFT, num_filters). As in
+    scipy.signal.group_delay, it is 0 where the response is ~0.
+  """
+  h_mat = np.atleast_2d(np.asarray(h_mat, dtype=np.float64))
+  n = np.arange(np.shape(h_mat)[1])
+  Hf_n = _dtft(h_mat * n, nFFT).T
+  singular = np.abs(Hf) < 10 * np.finfo(np.float64).eps
+  Hf_grpDel = np.zeros(np.shape(Hf))
+  Hf_grpDel[~singular] = np.real(Hf_n[~singular] / Hf[~singular])
+  return Hf_grpDel
+
+
+def fd_freq_response(h_mat, nFFT, mag=True, phase=True, grp_delay=True):
+  """Frequency response of a set of FIR filters.
+
+  Args:
+    h_mat: Matrix of FIR filters, one filter for each row.
+    nFFT: Number of frequency points between 0 and pi (pi excluded).
+    mag: If True, the magnitude response is computed.
+    phase: If True, the unwrapped phase response is computed.
+    grp_delay: If True, the group delay is computed.
+
+  Returns:
+    w: Frequency vector [rad/sample], size nFFT.
+    Hf_mag_dB: Magnitude response [dB], size (nFFT, num_filters), or None.
+    Hf_ph: Unwrapped phase response [rad], size (nFFT, num_filters), or None.
+    Hf_grpDel: Group delay [samples], size (nFFT, num_filters), or None.
+      As in scipy.signal.group_delay, it is 0 where the response is ~0.
+  """
+  w = np.pi * np.arange(nFFT) / nFFT
+  Hf_mag_dB, Hf_ph, Hf_grpDel = None, None, None
+
+  if mag or phase or grp_delay:
+    _, Hf = fd_cplx_response(h_mat, nFFT)
+
+  if mag:
+    with np.errstate(divide='ignore'):
+      Hf_mag_dB = 20 * np.log10(np.abs(Hf))
+
+  if phase:
+    Hf_ph = np.unwrap(np.angle(Hf), axis=0)
+
+  if grp_delay:
+    Hf_grpDel = fd_group_delay(h_mat, Hf, nFFT)
+
+  return w, Hf_mag_dB, Hf_ph, Hf_grpDel
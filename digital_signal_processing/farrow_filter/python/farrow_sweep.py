@@ -0,0 +1,201 @@
+"""
+farrow_sweep.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Design space exploration of the Farrow filter. The designs of a grid of
+  parameters (method, M, N, alpha, number of coefficients) are computed in
+  a process pool, each design is scored with passband error metrics and the
+  results are written in a CSV table.
+
+  Methods:
+    - 'wls_2004': wls_deng_2004(M, N, alpha)
+    - 'wls_2007': wls_deng_2007(M, N, alpha)
+    - 'lagrange': lagrange_genCoeff(num_coeffs)
+
+  Metrics, over the passband [0, alpha*pi] and delays spanning one sample
+  (d in [-0.5, 0.5] for WLS, [0, 1] for Lagrange as in the main scripts):
+    - cplx_err_dB:  max |H(w, d) - exp(-j*w*(D + d))| in dB
+    - mag_err_dB:   max |20*log10(|H(w, d)|)|
+    - gd_err:       max |grpdelay(w, d) - (D + d)| in samples
+  where D is the delay of the filter for d = 0.
+
+  Usage:
+    python farrow_sweep.py --methods wls_2004 wls_2007 --M 2 4 6 --N 4 8 \\
+                           --alpha 0.5 0.8 --out sweep.csv
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from farrow_cache import lagrange_genCoeff_cached, wls_deng_2004_cached, wls_deng_2007_cached
+from farrow_freqresp import farrow_fd_filters, fd_cplx_response, fd_group_delay
+
+METHODS = ('wls_2004', 'wls_2007', 'lagrange')
+
+CSV_FIELDS = ('method', 'M', 'N', 'alpha', 'num_coeffs', 'num_filters',
+              'cplx_err_dB', 'mag_err_dB', 'gd_err', 'time_s')
+
+
+def farrow_design(method, M=None, N=None, alpha=None, num_coeffs=None):
+  """Designs a Farrow filter as in the main scripts.
+
+  The progress messages of the design functions are discarded, so the
+  outputs of parallel workers do not interleave.
+
+  Returns:
+    H_Farrow: Matrix of Farrow coefficients, size (num_filters, num_taps).
+    D: Delay of the filter for d = 0 [samples].
+    delay_min: Minimum fractional delay of the design range.
+  """
+  with contextlib.redirect_stdout(io.StringIO()):
+    if method == 'wls_2004':
+      H_Farrow = wls_deng_2004_cached(M, N, alpha)
+    elif method == 'wls_2007':
+      H_Farrow = wls_deng_2007_cached(M, N, alpha)
+    elif method == 'lagrange':
+      H_Farrow = lagrange_genCoeff_cached(num_coeffs)
+    else:
+      raise ValueError('Invalid method. Choose one of %s.' % ', '.join(METHODS))
+
+  # Same post-processing of the main scripts
+  H_Farrow[np.abs(H_Farrow) < 1e-12] = 0
+  if method == 'wls_2004':
+    H_Farrow[0, :] = np.round(H_Farrow[0, :])
+
+  if method == 'lagrange':
+    D = np.floor((num_coeffs - 1) / 2)
+    delay_min = 0.0
+  else:
+    D = (np.shape(H_Farrow)[1] - 1) / 2
+    delay_min = -0.5
+  return H_Farrow, D, delay_min
+
+
+def farrow_score(H_Farrow, D, delay_min, alpha, num_delays=33, nFFT=2**10):
+  """Passband error metrics of a Farrow design (see the module description).
+
+  Returns:
+    Dictionary with the keys 'cplx_err_dB', 'mag_err_dB' and 'gd_err'.
+  """
+  delay_vec = np.linspace(delay_min, delay_min + 1, num_delays)
+  h_mat = farrow_fd_filters(H_Farrow, delay_vec)
+  # Complex response (rows: frequencies, columns: delays)
+  w, Hf = fd_cplx_response(h_mat, nFFT)
+  Hf_grpDel = fd_group_delay(h_mat, Hf, nFFT)
+
+  pb = w <= alpha * np.pi
+  D_vec = D + delay_vec
+  cplx_err = np.abs(Hf[pb] - np.exp(-1j * np.outer(w[pb], D_vec)))
+  with np.errstate(divide='ignore'):
+    cplx_err_dB = 20 * np.log10(np.max(cplx_err))
+    Hf_mag_dB = 20 * np.log10(np.abs(Hf[pb]))
+  return {'cplx_err_dB': float(cplx_err_dB),
+          'mag_err_dB': float(np.max(np.abs(Hf_mag_dB))),
+          'gd_err': float(np.max(np.abs(Hf_grpDel[pb] - D_vec)))}
+
+
+def _run_point(point):
+  """Designs and scores one point of the grid (executed by the workers)."""
+  method, M, N, alpha, num_coeffs, num_delays, nFFT = point
+  t_start = time.perf_counter()
+  H_Farrow, D, delay_min = farrow_design(method, M, N, alpha, num_coeffs)
+  row = {'method': method, 'M': M, 'N': N, 'alpha': alpha,
+         'num_coeffs': np.shape(H_Farrow)[1],
+         'num_filters': np.shape(H_Farrow)[0]}
+  row.update(farrow_score(H_Farrow, D, delay_min, alpha, num_delays, nFFT))
+  row['time_s'] = time.perf_counter() - t_start
+  return row
+
+
+def sweep_points(methods, M_list, N_list, alpha_list, num_coeffs_list):
+  """Returns the grid of (method, M, N, alpha, num_coeffs)."""
+  points = []
+  for method in methods:
+    if method == 'lagrange':
+      points += [(method, None, None, alpha, num_coeffs)
+                 for num_coeffs, alpha in itertools.product(num_coeffs_list, alpha_list)]
+    else:
+      points += [(method, M, N, alpha, None)
+                 for M, N, alpha in itertools.product(M_list, N_list, alpha_list)]
+  return points
+
+
+def farrow_sweep(methods, M_list=(), N_list=(), alpha_list=(0.5,),
+                 num_coeffs_list=(), num_delays=33, nFFT=2**10, jobs=None):
+  """Designs and scores all the points of a parameter grid.
+
+  Args:
+    methods: List of methods (see METHODS).
+    M_list, N_list: Values of M and N (WLS methods).
+    alpha_list: Values of alpha (passband edge normalized to pi).
+    num_coeffs_list: Values of num_coeffs (Lagrange method).
+    num_delays: Number of fractional delays used for the metrics.
+    nFFT: Number of frequency points between 0 and pi.
+    jobs: Number of worker processes (None: number of CPUs, 1: no pool).
+
+  Returns:
+    List of dictionaries (keys in CSV_FIELDS), sorted by cplx_err_dB.
+  """
+  points = [p + (num_delays, nFFT)
+            for p in sweep_points(methods, M_list, N_list, alpha_list, num_coeffs_list)]
+  if jobs == 1:
+    rows = [_run_point(p) for p in points]
+  else:
+    num_workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(points) // (4 * num_workers))
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+      rows = list(pool.map(_run_point, points, chunksize=chunksize))
+  return sorted(rows, key=lambda row: row['cplx_err_dB'])
+
+
+def write_sweep_csv(fileName, rows):
+  """Writes the results of farrow_sweep in a CSV file."""
+  with open(fileName, "w", newline='') as file:
+    writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for row in rows:
+      writer.writerow({k: ('' if row[k] is None else row[k]) for k in CSV_FIELDS})
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Design space exploration of the Farrow filter.')
+  parser.add_argument('--methods', nargs='+', choices=METHODS, default=['wls_2007'])
+  parser.add_argument('--M', nargs='+', type=int, default=[4], help='WLS: number of filters minus one')
+  parser.add_argument('--N', nargs='+', type=int, default=[4], help='WLS: filter order parameter')
+  parser.add_argument('--alpha', nargs='+', type=float, default=[0.5], help='passband edge normalized to pi')
+  parser.add_argument('--num-coeffs', nargs='+', type=int, default=[5], help='Lagrange: number of coefficients')
+  parser.add_argument('--num-delays', type=int, default=33, help='fractional delays used for the metrics')
+  parser.add_argument('--nfft', type=int, default=2**10, help='frequency points between 0 and pi')
+  parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: number of CPUs)')
+  parser.add_argument('--out', default='farrow_sweep.csv', help='output CSV file')
+  args = parser.parse_args(argv)
+
+  rows = farrow_sweep(args.methods, args.M, args.N, args.alpha, args.num_coeffs,
+                      args.num_delays, args.nfft, args.jobs)
+  write_sweep_csv(args.out, rows)
+
+  # Summary (only the main process prints)
+  print('%-9s %3s %3s %6s %6s %12s %11s %9s' %
+        ('method', 'M', 'N', 'alpha', 'taps', 'cplx_err_dB', 'mag_err_dB', 'gd_err'))
+  for row in rows[:10]:
+    print('%-9s %3s %3s %6.3f %6i %12.2f %11.2e %9.2e' %
+          (row['method'], '-' if row['M'] is None else row['M'],
+           '-' if row['N'] is None else row['N'], row['alpha'],
+           row['num_coeffs'], row['cplx_err_dB'], row['mag_err_dB'], row['gd_err']))
+  print('%i designs written in %s' % (len(rows), args.out))
+  return 0 if rows else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -3,12 +3,29 @@
  Author: Daniele Giardino
  Date: 2025.06.24
 
- Description: 
+ Description:
    Generates the coefficients of the Farrow filter using the Lagrange
    interpolation method.
+
+   The column j of the Farrow matrix contains the coefficients of the
+   Lagrange basis polynomial L_j(d) on the nodes t_k = k - floor(N/2),
+   k = 0, ..., N (modified Farrow structure), i.e. the Vandermonde inverse
+   shifted by floor(N/2). The polynomials are computed with integers:
+     - P(d) = prod_k (d - t_k);
+     - numerator of L_j = P(d) / (d - t_j) (synthetic division);
+     - denominator of L_j = prod_{k != j} (j - k) = (-1)**(N-j) * j! * (N-j)!
+   so each coefficient is the correctly rounded value of an exact
+   fraction, with O(N**2) operations and no matrix inversion.
+
+   The orders N = 2c and 2c+1 have the same centre c, so the nodes of 2c+1
+   are the nodes of 2c plus t = c+1: lagrange_genCoeff_batch computes the
+   odd orders from the even ones (L_j multiplied by (d - t)) instead of
+   dividing their node polynomial again.
 """
+import math
+
 import numpy as np
-from scipy.special import binom
+
 
 def nchoosek(n, k):
   if k == 0:
@@ -17,6 +34,66 @@ def nchoosek(n, k):
     r = n/k * nchoosek(n-1, k-1)
   return round(r)
 
+
+def _lagrange_int(N):
+  """Integer numerators and denominators of the Lagrange basis polynomials.
+
+  Returns:
+    num: List of N+1 lists, num[j][m] is the numerator of the coefficient
+      of d**m of L_j.
+    den: List of N+1 denominators.
+  """
+  c = N // 2
+  nodes = [k - c for k in range(N + 1)]
+
+  # P(d) = prod_k (d - t_k), coefficients from the highest power
+  P = [1]
+  for t in nodes:
+    P = [a - t * b for a, b in zip(P + [0], [0] + P)]
+
+  num = []
+  den = []
+  fact = [1]
+  for k in range(1, N + 1):
+    fact.append(fact[-1] * k)
+  for j, t in enumerate(nodes):
+    # Synthetic division P(d) / (d - t_j), from the highest power
+    q = [P[0]]
+    for a in P[1:-1]:
+      q.append(a + t * q[-1])
+    num.append(q[::-1])
+    den.append((-1)**(N - j) * fact[j] * fact[N - j])
+  return num, den
+
+
+def _mul_linear(q, t):
+  """Product of the polynomial q (from the lowest power) and (d - t)."""
+  return [b - t * a for a, b in zip(q + [0], [0] + q)]
+
+
+def _lagrange_int_next(num, den, N):
+  """Numerators and denominators of the order N+1 from those of the even order N.
+
+  The nodes of N+1 are the nodes of N plus t = N//2 + 1, so
+  L_j of N+1 is L_j(d) * (d - t) / (t_j - t), and the new basis polynomial
+  is P(d) / P(t), with P(d) = prod_k (d - t_k) of the nodes of N.
+  """
+  c = N // 2
+  t = c + 1
+  num = [_mul_linear(q, t) for q in num] + [_mul_linear(num[0], -c)]
+  den = [d * (j - c - t) for j, d in enumerate(den)]
+  den.append(math.factorial(N + 1))
+  return num, den
+
+
+def _lagrange_float(num, den):
+  """Farrow matrix of exact fractions (int / int is correctly rounded)."""
+  Q = np.empty((len(den), len(den)))
+  for j in range(len(den)):
+    Q[:, j] = [n / den[j] for n in num[j]]
+  return Q
+
+
 def lagrange_genCoeff(num_coeffs):
   """Generates Lagrange coefficients for the modified Farrow structure.
 
@@ -24,44 +101,35 @@ def lagrange_genCoeff(num_coeffs):
     num_coeffs: The number of coefficients in the Farrow structure.
 
   Returns:
-    Q: The matrix of Lagrange coefficients.
+    Q: The matrix of Lagrange coefficients, size (num_coeffs, num_coeffs).
+       Q[m, j] is the coefficient of d**m of the tap j.
   """
 
   N = num_coeffs - 1  # Filter's order
-  M = N + 1  # Number of FIR filters
-
-  # Vandermonde matrix
-  U = np.zeros((N + 1, N + 1))
-  for i in range(0, N+1):
-    for j in range(0, N+1):
-      U[j, i] = j**i
-
-  # Compute the inverse of the Vandermonde matrix
-  Q = np.linalg.inv(U)
-
-  # Modified Farrow structure coefficients
-  T = np.zeros((N + 1, N + 1))
-  for n in range(0, N + 1):
-    for m in range(0, N + 1):
-      if n >= m:
-        #coeff_bin = np.math.factorial(n) // (np.math.factorial(m) * np.math.factorial(n - m))
-        #coeff_bin = nchoosek(n, m)
-        coeff_bin = binom(n, m)
-        # print("(%i,%i)=%i" % (n,m,coeff_bin))
-        T[n, m] = (np.floor(N / 2)**(n - m)) * coeff_bin
-
-  # Transpose the T matrix
-  # Matlab - T = T.'
-  T = T.transpose()
-
-  # Calculate the Lagrange coefficients
-  # Matlab - Q = T / U
-  Q = np.dot(T, np.linalg.inv(U))
-
-  # Delete small values
-  val_tol = 1e-15
-  for n in range(0, N + 1):
-    for m in range(0, N + 1):
-      Q[n,m] = 0 if np.abs(Q[n,m])<val_tol else Q[n,m]
+  num, den = _lagrange_int(N)
+  return _lagrange_float(num, den)
 
-  return Q
+
+def lagrange_genCoeff_batch(num_coeffs_list):
+  """Lagrange coefficients for several numbers of coefficients.
+
+  Each order is computed once; an even order N and the order N+1 share the
+  basis polynomials (_lagrange_int_next).
+
+  Args:
+    num_coeffs_list: Iterable of numbers of coefficients (e.g. range(2, 65)).
+
+  Returns:
+    List of the matrices of lagrange_genCoeff, in the same order.
+  """
+  orders = [int(num_coeffs) - 1 for num_coeffs in num_coeffs_list]
+  order_set = set(orders)
+  Q = {}
+  for N in sorted(order_set):
+    if N in Q:
+      continue
+    num, den = _lagrange_int(N)
+    Q[N] = _lagrange_float(num, den)
+    if N % 2 == 0 and N + 1 in order_set:
+      Q[N + 1] = _lagrange_float(*_lagrange_int_next(num, den, N))
+  return [Q[N] for N in orders]
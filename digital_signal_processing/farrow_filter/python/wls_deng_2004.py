@@ -13,8 +13,8 @@ Description:
 """
 
 import numpy as np
-from scipy.special import factorial
-from scipy.integrate import quad
+
+from wls_integrals import wls_integrals
 
 def wls_deng_2004(M, N, alpha):
     """
@@ -45,82 +45,23 @@ def wls_deng_2004(M, N, alpha):
     K_1i = 10
     K_6i = 10
     delay = 0.5
-    RelTol = 1.e-9  # Used as 'epsabs' or 'epsrel' in scipy.integrate.quad
 
-    # Symbolic variables - using lambda functions to mimic MATLAB's anonymous functions
-    p_e = lambda p: np.power(p, np.arange(0, M + 1, 2)).reshape(-1, 1)
-    p_o = lambda p: np.power(p, np.arange(1, M + 1, 2)).reshape(-1, 1)
+    # Exponents of the even/odd powers of p: p_e(p) = p**exp_e, p_o(p) = p**exp_o
+    exp_e = np.arange(0, M + 1, 2)
+    exp_o = np.arange(1, M + 1, 2)
 
-    c = lambda omega: np.cos(omega * np.arange(0, N + 1)).reshape(-1, 1)
-    s = lambda omega: np.sin(omega * np.arange(1, N + 1)).reshape(-1, 1)
+    # Frequencies of the cosines/sines: c(omega) = cos(omega*nu_c), s(omega) = sin(omega*nu_s)
+    nu_c = np.arange(0, N + 1)
+    nu_s = np.arange(1, N + 1)
 
     print('2. CLOSED-FORM ERROR FUNCTION')
-    W_1 = lambda omega: 1  # Weighting function for the frequency domain
-    W_2 = lambda p: 1      # Weighting function for the time domain
-
-    # Numerical Integrals
-    A_1 = 0
-    for i in range(1, K_1i + 1):
-        # Integrand functions for A_1
-        integrand_A1_t1 = lambda p: W_2(p) * (p**(2*(i-1))) * p_e(p).flatten()
-        integrand_A1_t2 = lambda omega: W_1(omega) * (omega**(2*(i-1))) * c(omega).flatten()
-
-        # Perform integration for A_1_t1
-        integral_A1_t1_val = np.array([quad(lambda p_val: integrand_A1_t1(p_val)[j], 0, delay, epsrel=RelTol)[0] for j in range(p_e(0.1).size)]).reshape(-1, 1)
-
-        # Perform integration for A_1_t2
-        integral_A1_t2_val = np.array([quad(lambda omega_val: integrand_A1_t2(omega_val)[j], 0, alpha * np.pi, epsrel=RelTol)[0] for j in range(c(0.1).size)]).reshape(-1, 1)
-
-        temp = ((-1)**(i-1) / factorial(2*(i-1))) * integral_A1_t1_val @ integral_A1_t2_val.T
-        A_1 += temp
-
-    # A_2 integration
-    integrand_A2_t = lambda p: W_2(p) * (p_e(p) @ p_e(p).T)
-    # A_2 is a matrix, so we need to integrate each element
-    A_2_shape = p_e(0.1).shape[0], p_e(0.1).shape[0]
-    A_2 = np.zeros(A_2_shape)
-    for row in range(A_2_shape[0]):
-        for col in range(A_2_shape[1]):
-            A_2[row, col] = quad(lambda p: integrand_A2_t(p)[row, col], 0, delay, epsrel=RelTol)[0]
-
-    # A_3 integration
-    integrand_A3_t = lambda omega: W_1(omega) * (c(omega) @ c(omega).T)
-    A_3_shape = c(0.1).shape[0], c(0.1).shape[0]
-    A_3 = np.zeros(A_3_shape)
-    for row in range(A_3_shape[0]):
-        for col in range(A_3_shape[1]):
-            A_3[row, col] = quad(lambda omega: integrand_A3_t(omega)[row, col], 0, alpha * np.pi, epsrel=RelTol)[0]
-
-    # A_4 integration
-    integrand_A4_t = lambda p: W_2(p) * (p_o(p) @ p_o(p).T)
-    A_4_shape = p_o(0.1).shape[0], p_o(0.1).shape[0]
-    A_4 = np.zeros(A_4_shape)
-    for row in range(A_4_shape[0]):
-        for col in range(A_4_shape[1]):
-            A_4[row, col] = quad(lambda p: integrand_A4_t(p)[row, col], 0, delay, epsrel=RelTol)[0]
-
-    # A_5 integration
-    integrand_A5_t = lambda omega: W_1(omega) * (s(omega) @ s(omega).T)
-    A_5_shape = s(0.1).shape[0], s(0.1).shape[0]
-    A_5 = np.zeros(A_5_shape)
-    for row in range(A_5_shape[0]):
-        for col in range(A_5_shape[1]):
-            A_5[row, col] = quad(lambda omega: integrand_A5_t(omega)[row, col], 0, alpha * np.pi, epsrel=RelTol)[0]
-
-    A_6 = 0
-    for i in range(1, K_6i + 1):
-        # Integrand functions for A_6
-        integrand_A6_t1 = lambda p: W_2(p) * (p**(2*i-1)) * p_o(p).flatten()
-        integrand_A6_t2 = lambda omega: W_1(omega) * (omega**(2*i-1)) * s(omega).flatten()
-
-        # Perform integration for A_6_t1
-        integral_A6_t1_val = np.array([quad(lambda p_val: integrand_A6_t1(p_val)[j], 0, delay, epsrel=RelTol)[0] for j in range(p_o(0.1).size)]).reshape(-1, 1)
-
-        # Perform integration for A_6_t2
-        integral_A6_t2_val = np.array([quad(lambda omega_val: integrand_A6_t2(omega_val)[j], 0, alpha * np.pi, epsrel=RelTol)[0] for j in range(s(0.1).size)]).reshape(-1, 1)
-
-        temp = ((-1)**(i-1) / factorial(2*i-1)) * integral_A6_t1_val @ integral_A6_t2_val.T
-        A_6 += temp
+    W_1 = None  # Weighting function for the frequency domain (None: W_1 = 1)
+    W_2 = None  # Weighting function for the time domain (None: W_2 = 1)
+
+    # Integrals (Gauss-Legendre rule, all the matrices at once)
+    A_1, A_2, A_3, A_4, A_5, A_6 = wls_integrals(exp_e, exp_o, nu_c, nu_s,
+                                                 alpha, delay, K_1i, K_6i,
+                                                 W_1, W_2)
 
     print('3. OPTIMAL SOLUTION')
 
@@ -19,58 +19,55 @@ Sections:
   3. FD FIR Filter Computation
   4. Frequency Response Analysis
   5. Plotting Results
+
+Usage:
+  python wls_deng_main.py [--wls-type 2007] [--M 4] [--N 4] [--alpha 0.5] [--plot wls.png]
+  The figures are optional (--plot show: interactive, --plot file: saved).
 """
 
+import argparse
+import os
+import sys
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.signal import freqz, group_delay
 # Assuming wls_deng_2004 and wls_deng_2007 are in the same directory or accessible in PYTHONPATH
-from wls_deng_2004 import wls_deng_2004
-from wls_deng_2007 import wls_deng_2007
-
-def main():
+# The cached versions return the stored design when the parameters do not change
+from farrow_cache import wls_deng_2004_cached, wls_deng_2007_cached
+# Batched FD FIR filters and frequency responses for all the delays
+from farrow_freqresp import farrow_fd_filters, fd_freq_response
+# Optional figures (lazy import of matplotlib)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+import fig_out
+
+def wls_design(M=4, N=4, alpha=0.5, WLS_type='2007', nFFT=2**10,
+               plot_mag=1, plot_phase=0, plot_grpDelay=1):
     """
-    This script designs and analyzes Fractional Delay (FD) FIR filters
-    using the WLS algorithm (Farrow structure) approach. It computes the filter
-    coefficients for different fractional delays, evaluates their frequency
-    responses, and visualizes magnitude, phase, and group delay.
+    Designs the WLS Farrow filter and computes the frequency responses of
+    its FD FIR filters.
+
+    Args:
+        M: Number of the FIR filters in the Farrow structure minus one.
+        N: Filter order parameter.
+        alpha: Alpha parameter for WLS design (less than 1).
+        WLS_type: '2004' or '2007'.
+        nFFT: Number of FFT points.
+        plot_mag, plot_phase, plot_grpDelay: 1 to compute the magnitude,
+            phase and group delay responses.
+
+    Returns:
+        Dictionary with H_Farrow, delay_vec, h_mat, w, Hf_mag_db, Hf_ph and
+        Hf_grpDel.
     """
 
-    # 1. Initialization & Parameters
-    print('1. Initialization & Parameters')
-    
-    # Filter order parameter
-    N = 4
-
-    # Number of the FIR filters in the Farrow structure
-    M = 4  # Number of filters minus one (total filters = M+1)
-
-    # Alpha parameter for WLS design
-    # Increase alpha for wider passband, decrease for sharper transition
-    # Typical values: 0.5 for moderate transition, 0.1 for sharper
-    # transition, 0.01 for very sharp transition.
-    # Note: The value of alpha must be less than 1.
-    alpha = 0.5
-
-    # WLS type: '2004' or '2007'
-    WLS_type = '2007'  # Choose between '2004' and '2007'
-
-    # Plotting options
-    plot_mag = 1      # Plot magnitude response
-    plot_phase = 0    # Plot phase response
-    plot_grpDelay = 1 # Plot group delay
-
-    # Frequency response parameters
-    nFFT = 2**10      # Number of FFT points
-
     # 2. Farrow Filter Coefficient Generation
     print('\n2. Farrow Filter Coefficient Generation')
 
     # Generate Farrow filter coefficients based on WLS type
     if WLS_type == '2004':
-        H_Farrow = wls_deng_2004(M, N, alpha)
+        H_Farrow = wls_deng_2004_cached(M, N, alpha)
     elif WLS_type == '2007':
-        H_Farrow = wls_deng_2007(M, N, alpha)
+        H_Farrow = wls_deng_2007_cached(M, N, alpha)
     else:
         raise ValueError('Invalid WLS type. Choose either "2004" or "2007".')
 
@@ -100,48 +97,34 @@ def main():
     delay_max = delay_min + 1 - delay_step
     delay_vec = np.arange(delay_min, delay_max + delay_step/2, delay_step) # Added small offset for float precision
 
-    # Preallocate matrix to store FD FIR filter coefficients
-    h_mat = np.zeros((len(delay_vec), numCoeffs))
-
-    # Compute FD FIR filter coefficients for each fractional delay
-    for i, d_val in enumerate(delay_vec):
-        d_powers = d_val ** np.arange(0, H_Farrow.shape[0])
-        h_mat[i, :] = np.sum(H_Farrow * d_powers[:, np.newaxis], axis=0)
+    # Compute FD FIR filter coefficients for all the fractional delays
+    h_mat = farrow_fd_filters(H_Farrow, delay_vec)
 
     # 4. Frequency Response Analysis
     print('\n4. Frequency Response Analysis')
 
-    # Preallocate matrices for frequency responses
-    Hf_mag_db = np.zeros((nFFT, len(delay_vec))) # Magnitude response in dB
-    Hf_ph = np.zeros((nFFT, len(delay_vec)))     # Phase response
-    Hf_grpDel = np.zeros((nFFT, len(delay_vec))) # Group delay response
-    leg_vec = [f'd = {d:.3f}' for d in delay_vec] # Legend entries for plots
-
-    # Compute frequency responses for each FD FIR filter
-    for i in range(len(delay_vec)):
-        b = h_mat[i, :]
-        a = 1 # Denominator for FIR filter
-
-        # Magnitude Response
-        if plot_mag:
-            w, h = freqz(b, a, nFFT, whole=False)
-            Hf_mag_db[:, i] = 20 * np.log10(np.abs(h))
+    # Compute frequency responses for all the FD FIR filters at once (batched FFT)
+    # Each column of the matrices corresponds to a delay.
+    w, Hf_mag_db, Hf_ph, Hf_grpDel = fd_freq_response(h_mat, nFFT,
+                                                      mag=plot_mag,
+                                                      phase=plot_phase,
+                                                      grp_delay=plot_grpDelay)
+    return {'H_Farrow': H_Farrow, 'delay_vec': delay_vec, 'h_mat': h_mat, 'w': w,
+            'Hf_mag_db': Hf_mag_db, 'Hf_ph': Hf_ph, 'Hf_grpDel': Hf_grpDel}
 
-        # Phase Response
-        if plot_phase:
-            w_ph, ph = freqz(b, a, nFFT, whole=False)
-            Hf_ph[:, i] = np.unwrap(np.angle(ph)) # Unwrapped phase
-
-        # Group Delay Response
-        if plot_grpDelay:
-            w_gd, gd = group_delay((b, a), nFFT, whole=False)
-            Hf_grpDel[:, i] = gd
-
-    # Normalize frequency axis to pi
-    w_normalized = w / np.pi
+def wls_plot(res, alpha, plot, plot_mag=1, plot_phase=0, plot_grpDelay=1):
+    """
+    Plots the responses of wls_design (plot: 'show' or file name).
+    """
 
     # 5. Plotting Results
     print('\n5. Plotting Results')
+    plt = fig_out.pyplot(plot)
+    Hf_mag_db, Hf_ph, Hf_grpDel = res['Hf_mag_db'], res['Hf_ph'], res['Hf_grpDel']
+    leg_vec = [f'd = {d:.3f}' for d in res['delay_vec']] # Legend entries for plots
+
+    # Normalize frequency axis to pi
+    w_normalized = res['w'] / np.pi
 
     # Plot Magnitude Response
     if plot_mag:
@@ -198,7 +181,51 @@ def main():
         plt.title('Phase Response')
         plt.tight_layout()
 
-    plt.show()
+    return fig_out.finish(plt, plot)
+
+def main(argv=None):
+    """
+    This script designs and analyzes Fractional Delay (FD) FIR filters
+    using the WLS algorithm (Farrow structure) approach. It computes the filter
+    coefficients for different fractional delays, evaluates their frequency
+    responses, and visualizes magnitude, phase, and group delay.
+    """
+
+    # 1. Initialization & Parameters
+    print('1. Initialization & Parameters')
+    parser = argparse.ArgumentParser(description='WLS Farrow filter design.')
+
+    # Filter order parameter
+    parser.add_argument('--N', type=int, default=4)
+
+    # Number of the FIR filters in the Farrow structure
+    # Number of filters minus one (total filters = M+1)
+    parser.add_argument('--M', type=int, default=4)
+
+    # Alpha parameter for WLS design
+    # Increase alpha for wider passband, decrease for sharper transition
+    # Typical values: 0.5 for moderate transition, 0.1 for sharper
+    # transition, 0.01 for very sharp transition.
+    # Note: The value of alpha must be less than 1.
+    parser.add_argument('--alpha', type=float, default=0.5)
+
+    # WLS type: '2004' or '2007'
+    parser.add_argument('--wls-type', choices=('2004', '2007'), default='2007')
+
+    # Frequency response parameters
+    parser.add_argument('--nfft', type=int, default=2**10)  # Number of FFT points
+
+    # Plotting options (magnitude and group delay by default)
+    parser.add_argument('--phase', action='store_true', help='plot the phase response')
+    parser.add_argument('--plot', default=None, help="'show' or file name of the figures")
+    args = parser.parse_args(argv)
+
+    plot_mag, plot_phase, plot_grpDelay = 1, int(args.phase), 1
+    res = wls_design(args.M, args.N, args.alpha, args.wls_type, args.nfft,
+                     plot_mag, plot_phase, plot_grpDelay)
+    if args.plot is not None:
+        wls_plot(res, args.alpha, args.plot, plot_mag, plot_phase, plot_grpDelay)
+    return 0
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
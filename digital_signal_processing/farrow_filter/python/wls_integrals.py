@@ -0,0 +1,111 @@
+"""
+wls_integrals.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Computes the matrices A_1, ..., A_6 of the closed-form error function used
+  by wls_deng_2004 and wls_deng_2007.
+
+  Each integrand is a product of powers of p, powers of omega, cosines and
+  sines, so a Gauss-Legendre rule with enough nodes gives the integrals at
+  machine precision. The integrands are sampled once on the nodes of the
+  two domains ([0, delay] for p and [0, alpha*pi] for omega) and all the
+  matrices are obtained with a few matrix products.
+"""
+
+import math
+
+import numpy as np
+
+
+def factorial(k):
+  """Factorials of an array of non-negative integers, float64 (inf above 170!)."""
+  return np.array([float(math.factorial(int(i))) if i <= 170 else np.inf
+                   for i in np.ravel(k)], dtype=np.float64).reshape(np.shape(k))
+
+
+def gauss_legendre(a, b, num_nodes):
+  """Returns the nodes and the weights of the Gauss-Legendre rule on [a, b]."""
+  x, w = np.polynomial.legendre.leggauss(num_nodes)
+  return 0.5*(b - a)*x + 0.5*(b + a), 0.5*(b - a)*w
+
+
+def wls_integrals(exp_e, exp_o, nu_c, nu_s, alpha, delay, K_1i, K_6i,
+                  W_1=None, W_2=None):
+  """Computes the matrices of the WLS error function.
+
+  With p_e(p) = p**exp_e, p_o(p) = p**exp_o, c(omega) = cos(omega*nu_c) and
+  s(omega) = sin(omega*nu_s) (column vectors):
+
+    A_1 = sum_{i=1}^{K_1i} (-1)**(i-1)/(2*(i-1))! *
+          int_0^delay W_2 p**(2*(i-1)) p_e dp * (int_0^(alpha*pi) W_1 omega**(2*(i-1)) c domega).T
+    A_2 = int_0^delay W_2 p_e p_e.T dp
+    A_3 = int_0^(alpha*pi) W_1 c c.T domega
+    A_4 = int_0^delay W_2 p_o p_o.T dp
+    A_5 = int_0^(alpha*pi) W_1 s s.T domega
+    A_6 = sum_{i=1}^{K_6i} (-1)**(i-1)/(2*i-1)! *
+          int_0^delay W_2 p**(2*i-1) p_o dp * (int_0^(alpha*pi) W_1 omega**(2*i-1) s domega).T
+
+  Args:
+    exp_e: Exponents of the even powers of p.
+    exp_o: Exponents of the odd powers of p.
+    nu_c: Frequencies of the cosines.
+    nu_s: Frequencies of the sines.
+    alpha: Passband edge normalized to pi.
+    delay: Upper limit of the fractional delay.
+    K_1i: Number of Taylor terms of A_1.
+    K_6i: Number of Taylor terms of A_6.
+    W_1: Weighting function of omega (vectorized). None for W_1 = 1.
+    W_2: Weighting function of p (vectorized). None for W_2 = 1.
+
+  Returns:
+    A_1, A_2, A_3, A_4, A_5, A_6
+  """
+  exp_e = np.asarray(exp_e, dtype=np.float64)
+  exp_o = np.asarray(exp_o, dtype=np.float64)
+  nu_c = np.asarray(nu_c, dtype=np.float64)
+  nu_s = np.asarray(nu_s, dtype=np.float64)
+  omega_max = alpha * np.pi
+
+  # Number of nodes
+  # p: polynomials of degree up to 2*max(exp) + 2*K, exact with this rule.
+  # omega: enough nodes to resolve the highest frequency and power.
+  exp_max = np.max(np.concatenate((exp_e, exp_o, [0])))
+  nu_max = np.max(np.concatenate((np.abs(nu_c), np.abs(nu_s), [0])))
+  K = max(K_1i, K_6i)
+  num_nodes_p = int(exp_max) + K + 16
+  num_nodes_w = int(np.ceil(2*nu_max*omega_max)) + K + 32
+
+  p, w_p = gauss_legendre(0, delay, num_nodes_p)
+  omega, w_w = gauss_legendre(0, omega_max, num_nodes_w)
+  if W_2 is not None:
+    w_p = w_p * W_2(p)
+  if W_1 is not None:
+    w_w = w_w * W_1(omega)
+
+  # Integrands sampled on the nodes (nodes x elements)
+  P_e = p[:, np.newaxis] ** exp_e
+  P_o = p[:, np.newaxis] ** exp_o
+  C = np.cos(omega[:, np.newaxis] * nu_c)
+  S = np.sin(omega[:, np.newaxis] * nu_s)
+
+  A_2 = P_e.T @ (w_p[:, np.newaxis] * P_e)
+  A_3 = C.T @ (w_w[:, np.newaxis] * C)
+  A_4 = P_o.T @ (w_p[:, np.newaxis] * P_o)
+  A_5 = S.T @ (w_w[:, np.newaxis] * S)
+
+  # Taylor terms of A_1 (even powers) and A_6 (odd powers)
+  k_1 = 2*np.arange(K_1i)
+  coef_1 = (-1.0)**np.arange(K_1i) / factorial(k_1)
+  T1_p = P_e.T @ (w_p[:, np.newaxis] * p[:, np.newaxis]**k_1)
+  T1_w = C.T @ (w_w[:, np.newaxis] * omega[:, np.newaxis]**k_1)
+  A_1 = (T1_p * coef_1) @ T1_w.T
+
+  k_6 = 2*np.arange(1, K_6i + 1) - 1
+  coef_6 = (-1.0)**np.arange(K_6i) / factorial(k_6)
+  T6_p = P_o.T @ (w_p[:, np.newaxis] * p[:, np.newaxis]**k_6)
+  T6_w = S.T @ (w_w[:, np.newaxis] * omega[:, np.newaxis]**k_6)
+  A_6 = (T6_p * coef_6) @ T6_w.T
+
+  return A_1, A_2, A_3, A_4, A_5, A_6
@@ -0,0 +1,178 @@
+"""
+fir_filter_model.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Bit-true model of fir_filter.vhd (architecture rtl_noSym).
+
+  In the systolic structure each multAdd block computes
+    sum(i) = resize(delayChain(i) * coeff(i), Width_sum) + sum(i-1)
+  with Width_sum-bit two's-complement arithmetic. The additions are modulo
+  2**Width_sum, so the output of the cascade is the convolution of the
+  input and the coefficients wrapped to Width_sum bits. The int64 arithmetic
+  of NumPy is modulo 2**64, so the model is exact for Width_sum up to 64.
+
+  The sum is then rounded to nearest to Width_out + Clip_bits bits and
+  saturated to Width_out bits (round_and_clip_slv).
+
+  All the registers are enabled by 'enb and valid_in', so the latency is
+  counted in valid input samples: the output of the input sample k is
+  written after FIR_FILTER_LATENCY(Coeffs_len) valid inputs. The model
+  returns one output for each input sample, aligned with the input; the
+  testbench writes the first samples of this sequence (the last ones are
+  still in the pipeline when the input ends).
+
+  fir_filter_folded_model is the reference of a pre-adder architecture of
+  the linear-phase filters (folded coefficients, half the multipliers):
+  each multAdd block multiplies the Width_pre-bit sum (difference if
+  antisymmetric) of the two samples of its coefficient. With
+  Width_pre = Width_in + 1 the pre-adder does not overflow and the output
+  is the one of rtl_noSym; a narrower Width_pre wraps as the RTL would. The
+  latency of such an architecture depends on its pipeline, use
+  vec_align.py to measure it.
+
+  Usage (with the parameters and files of fir_filter_tb.vhd, any folder):
+    python fir_filter_model.py
+  writes ../testbench/data_out_model.txt.
+    python fir_filter_model.py --folded
+  uses the folded coefficients (coeffs_..._fold.txt of genFIRCoeffs.py, or
+  the folding of the coefficient file).
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_bin import fxp_wrap
+from fxp_coeffs import fold_coeffs, folded_file_names, read_folded_coeffs
+from fxp_fir import fxp_convolve, fxp_convolve_folded
+from fxp_io import CHUNK_SPS, read_fxp_txt, write_fxp_txt
+from fxp_round import round_and_clip_slv, round_and_clip_latency
+
+
+def fir_filter_latency(Coeffs_len, Width_sum=40, Clip_bits=5, Width_out=18):
+  """Valid input samples between an input sample and its output.
+
+  delay_slv (1) + multAdd cascade (Coeffs_len + 1) + round_and_clip_slv.
+  """
+  return Coeffs_len + 2 + round_and_clip_latency(Width_sum, Width_out, Clip_bits)
+
+
+def fir_filter_sum(x, coeffs, Width_in=16, Width_coeffs=18, Width_sum=40,
+                   chunk_sps=CHUNK_SPS):
+  """Output of the multAdd cascade (Width_sum-bit sum) for each input sample.
+
+  Args:
+    x: Input samples (Width_in-bit signed numbers).
+    coeffs: Coefficients (Width_coeffs-bit signed numbers), Coeffs_len values.
+    Width_in, Width_coeffs, Width_sum: Generics of fir_filter.vhd.
+    chunk_sps: Number of samples of each convolution block.
+
+  Returns:
+    int64 array with len(x) samples.
+  """
+  if Width_sum > 64 or Width_in + Width_coeffs > 64:
+    raise ValueError("The model supports Width_sum and Width_in+Width_coeffs up to 64 bits.")
+  x = fxp_wrap(x, Width_in)
+  coeffs = fxp_wrap(coeffs, Width_coeffs)
+  y = fxp_convolve(x, coeffs, chunk_sps)
+  return fxp_wrap(y, Width_sum)
+
+
+def fir_filter_model(x, coeffs, Width_in=16, Width_coeffs=18, Width_sum=40,
+                     Clip_bits=5, Width_out=18, chunk_sps=CHUNK_SPS):
+  """Bit-true output of fir_filter.vhd for each input sample.
+
+  Args:
+    x: Input samples (Width_in-bit signed numbers).
+    coeffs: Coefficients (Width_coeffs-bit signed numbers).
+    Width_in, Width_coeffs, Width_sum, Clip_bits, Width_out: Generics of
+      fir_filter.vhd.
+    chunk_sps: Number of samples of each convolution block.
+
+  Returns:
+    int64 array with len(x) samples (Width_out-bit signed numbers).
+  """
+  y = fir_filter_sum(x, coeffs, Width_in, Width_coeffs, Width_sum, chunk_sps)
+  return round_and_clip_slv(y, Width_sum, Width_out, Clip_bits)
+
+
+def fir_filter_folded_model(x, coeffs_fold, Coeffs_len, symmetry='symmetric', Width_in=16,
+                            Width_coeffs=18, Width_sum=40, Clip_bits=5, Width_out=18,
+                            Width_pre=None, chunk_sps=CHUNK_SPS):
+  """Bit-true output of the pre-adder architecture for each input sample.
+
+  Args:
+    x: Input samples (Width_in-bit signed numbers).
+    coeffs_fold: Folded coefficients (Width_coeffs-bit signed numbers).
+    Coeffs_len: Number of taps of the filter.
+    symmetry: 'symmetric' or 'antisymmetric'.
+    Width_in, Width_coeffs, Width_sum, Clip_bits, Width_out: Generics of
+      fir_filter.vhd.
+    Width_pre: Width of the pre-adders (None: Width_in + 1).
+    chunk_sps: Number of samples of each convolution block.
+
+  Returns:
+    int64 array with len(x) samples (Width_out-bit signed numbers).
+  """
+  if Width_pre is None:
+    Width_pre = Width_in + 1
+  if Width_sum > 64 or Width_pre + Width_coeffs > 64:
+    raise ValueError("The model supports Width_sum and Width_pre+Width_coeffs up to 64 bits.")
+  x = fxp_wrap(x, Width_in)
+  coeffs_fold = fxp_wrap(coeffs_fold, Width_coeffs)
+  y = fxp_convolve_folded(x, coeffs_fold, Coeffs_len, symmetry, Width_pre, chunk_sps)
+  return round_and_clip_slv(fxp_wrap(y, Width_sum), Width_sum, Width_out, Clip_bits)
+
+
+def main(argv=None):
+  # Defaults: parameters and files of fir_filter_tb.vhd
+  tb = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../testbench")
+  parser = argparse.ArgumentParser(description='Bit-true model of fir_filter.vhd.')
+  parser.add_argument('--data-in', default=os.path.join(tb, 'data_in.txt'))
+  parser.add_argument('--coeffs', default=os.path.join(tb, 'coeffs_len64_Wl18.txt'))
+  parser.add_argument('--data-out', default=os.path.join(tb, 'data_out_model.txt'))
+  parser.add_argument('--width-in', type=int, default=16)
+  parser.add_argument('--width-coeffs', type=int, default=18)
+  parser.add_argument('--width-sum', type=int, default=40)
+  parser.add_argument('--clip-bits', type=int, default=5)
+  parser.add_argument('--width-out', type=int, default=18)
+  parser.add_argument('--folded', action='store_true', help='pre-adder architecture')
+  parser.add_argument('--width-pre', type=int, default=None, help='default: width-in + 1')
+  args = parser.parse_args(argv)
+
+  x = read_fxp_txt(args.data_in, args.width_in)
+  if not args.folded:
+    coeffs = read_fxp_txt(args.coeffs, args.width_coeffs)
+    y = fir_filter_model(x, coeffs, args.width_in, args.width_coeffs, args.width_sum,
+                         args.clip_bits, args.width_out)
+    latency = fir_filter_latency(np.size(coeffs), args.width_sum, args.clip_bits, args.width_out)
+    print("Latency = %i valid samples" % latency)
+  else:
+    # Folded file of genFIRCoeffs.py, or folding of the coefficient file
+    if args.coeffs.endswith('_fold.txt'):
+      foldName = args.coeffs
+    else:
+      foldName = folded_file_names(args.coeffs)[0]
+    if os.path.exists(foldName):
+      coeffs_fold, meta = read_folded_coeffs(foldName)
+      Coeffs_len, symmetry = meta['num_taps'], meta['symmetry']
+    else:
+      coeffs = read_fxp_txt(args.coeffs, args.width_coeffs)
+      coeffs_fold, symmetry = fold_coeffs(coeffs)
+      Coeffs_len = np.size(coeffs)
+    y = fir_filter_folded_model(x, coeffs_fold, Coeffs_len, symmetry, args.width_in,
+                                args.width_coeffs, args.width_sum, args.clip_bits,
+                                args.width_out, args.width_pre)
+    print("%s, %i multipliers for %i taps" % (symmetry, np.size(coeffs_fold), Coeffs_len))
+  write_fxp_txt(args.data_out, y, args.width_out)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -1,99 +1,147 @@
-
 """
 Author: Daniele Giardino
 Date: 2024.03.08
 
 Descritpion
 The script generates a text file used in the testbench.
+
+Usage:
+  python genFIRCoeffs.py [--wl 18] [--optimize-wl] [--no-fold] [--out-dir .] [--plot fir.png]
+The figure is optional (--plot show: interactive, --plot file: saved).
+Symmetric and antisymmetric coefficients are also written folded (half
+length, coeffs_..._fold.txt and .json metadata, see fxp_coeffs.py).
 """
 
 # Import libraries
+import argparse
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-
-# Import the submodule signal of scipy to use the correlation funciton
-from scipy import signal
-
-# Parameters
-Wl = 18     # Bit length
-
-# FIR Filter
-Fs  = 100e6
-fc  = Fs/16
-fir_ord = 63
-fir_len = fir_ord+1
-Wn = fc / (Fs/2)
-x = signal.firwin(numtaps=fir_len,
-                  cutoff=Wn,
-                  window='nuttall')
-print("fc = %f MHz" % (fc/1e6))
-print("Fs = %f MHz" % (Fs/1e6))
-
-# Energy normalization
-x = x / np.sum(x)
-
-# FLP to FXP
-# The amplitude of the signal x is between 1 and -1,
-# so simply multiply by 2**(Wl-1)-1
-print("max x = %f" % (np.max(np.abs(x))))
-A = 2**(Wl-1)-1
-x_flp = A * x
-x_fxp = np.round(x_flp)
-
-# Figure
-nFFT = 2**12
-w, Xf_flp = signal.freqz(b=x_flp, a=A,
-                         worN=nFFT,
-                         whole=False)
-w, Xf_fxp = signal.freqz(b=x_fxp, a=A,
-                         worN=nFFT,
-                         whole=False)
-Xf_flp = 20*np.log10(np.abs(Xf_flp))
-Xf_fxp = 20*np.log10(np.abs(Xf_fxp))
-
-# Frequency normalization
-w = w/np.pi*(Fs/2e6)
-plt.figure()
-plt.plot(w, Xf_flp, '-', label='H_{FLP}')
-plt.plot(w, Xf_fxp, '-', label='H_{FXP}')
-plt.grid()
-plt.legend(loc='upper right')
-plt.xlabel('Frequency [MHz]')
-plt.ylabel('Amplitude [dB]')
-plt.show()
-
-# Filename
-fileName = "coeffs_len%i_Wl%i.txt" % (fir_len,Wl)
-
-# Loop
-with open(fileName, "w") as file:
-  for i in range(0,np.size(x_fxp)):
-    # int32 conversion
-    x_tmp = int(x_fxp[i])     
-    
-    # Typecast negative number int to uint
-    if x_tmp<0:
-      x_tmp += 2**32
-    
-    # String binary representation
-    bin_str = bin(x_tmp)
-    
-    # Delete "0b" chars inserted by 'bin' function
-    if bin_str[0:2] == "0b":
-      bin_str = bin_str[2:]
-    
-    # Take the last 'Wl' bits because there can be 32 bits for negative numbers
-    if len(bin_str)>Wl:
-      bin_str = bin_str[-Wl:]
-    
-    # Resize bits (like VHDL)
-    # Positive numbers must be preceded by zeros
-    while len(bin_str)<Wl:
-      bin_str = "0" + bin_str
-    
-    # Write the binary number in the file
-    file.write(bin_str)
-
-    # If x_tmp is not the last, newline "\n" is written
-    if i<np.size(x_fxp)-1:
-      file.write("\n")
+
+# Shared functions to write the FXP text files
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_io import write_fxp_txt
+from fxp_coeffs import (coeffs_symmetry, firwin_lowpass, freqz_batch, min_coeff_width,
+                        write_folded_coeffs)
+import fig_out
+
+
+def gen_fir_coeffs(Wl=18, Fs=100e6, fc=100e6/16, fir_ord=63, window='nuttall',
+                   optimize_Wl=0, ripple_db=0.5, atten_db=90, fold=1, out_dir='.',
+                   plot=None):
+  """Generates the coefficient file of fir_filter_tb.vhd.
+
+  Args:
+    Wl: Bit length.
+    Fs, fc: Sampling and cutoff frequencies.
+    fir_ord: Order of the FIR filter.
+    window: Window of the design (see fxp_coeffs.WINDOWS).
+    optimize_Wl: 1 replaces Wl with the minimum bit length that meets the
+      specification (see packages/python/fxp_coeffs.py).
+    ripple_db: Maximum passband ripple [dB].
+    atten_db: Minimum stopband attenuation [dB].
+    fold: 1 also writes the folded coefficients if they are symmetric or
+      antisymmetric.
+    out_dir: Folder of the coefficient file.
+    plot: None, 'show' or file name of the figure (see fig_out.py).
+
+  Returns:
+    Tuple (fileName, x_fxp, Wl).
+  """
+  # FIR Filter
+  fir_len = fir_ord+1
+  Wn = fc / (Fs/2)
+  x = firwin_lowpass(numtaps=fir_len,
+                     cutoff=Wn,
+                     window=window)
+  print("fc = %f MHz" % (fc/1e6))
+  print("Fs = %f MHz" % (Fs/1e6))
+
+  # Energy normalization
+  x = x / np.sum(x)
+
+  # Minimum bit length (passband and stopband edges: fc/2 and 2*fc)
+  if optimize_Wl:
+    f_pass = 0.5 * fc / (Fs/2)
+    f_stop = 2 * fc / (Fs/2)
+    res = min_coeff_width(x, f_pass, f_stop, ripple_db, atten_db)
+    if res['Width_coeffs'] is None:
+      raise ValueError("No bit length meets the specification (J_flp = %f)." % res['J_flp'])
+    Wl = res['Width_coeffs']
+    print("Wl = %i (%s, J = %f)" % (Wl, res['method'], res['J']))
+
+  # FLP to FXP
+  # The amplitude of the signal x is between 1 and -1,
+  # so simply multiply by 2**(Wl-1)-1
+  print("max x = %f" % (np.max(np.abs(x))))
+  A = 2**(Wl-1)-1
+  x_flp = A * x
+  x_fxp = res['coeffs'] if optimize_Wl else np.round(x_flp)
+
+  # Figure
+  if plot is not None:
+    plot_coeffs_response(x_flp, x_fxp, A, Fs, plot)
+
+  # Filename (the folder is created if it does not exist)
+  os.makedirs(out_dir, exist_ok=True)
+  fileName = os.path.join(out_dir, "coeffs_len%i_Wl%i.txt" % (fir_len,Wl))
+
+  # Write the binary numbers in the file
+  write_fxp_txt(fileName, x_fxp, Wl)
+
+  # Folded coefficients (pre-adder architecture)
+  symmetry = coeffs_symmetry(x_fxp)
+  print("Symmetry: %s" % symmetry)
+  if fold and symmetry is not None:
+    foldName, _ = write_folded_coeffs(fileName, x_fxp, Wl, symmetry)
+    print(foldName)
+  return fileName, x_fxp, Wl
+
+
+def plot_coeffs_response(x_flp, x_fxp, A, Fs, plot):
+  """Frequency responses of the FLP and FXP coefficients (Fs: frequency axis)."""
+  plt = fig_out.pyplot(plot)
+  nFFT = 2**12
+  Xf = freqz_batch(np.stack((x_flp, x_fxp)) / A, nFFT)
+  Xf_flp = 20*np.log10(np.abs(Xf[0]))
+  Xf_fxp = 20*np.log10(np.abs(Xf[1]))
+
+  # Frequency normalization
+  w = np.arange(nFFT) / nFFT * (Fs/2e6)
+  plt.figure()
+  plt.plot(w, Xf_flp, '-', label='H_{FLP}')
+  plt.plot(w, Xf_fxp, '-', label='H_{FXP}')
+  plt.grid()
+  plt.legend(loc='upper right')
+  plt.xlabel('Frequency [MHz]')
+  plt.ylabel('Amplitude [dB]')
+  return fig_out.finish(plt, plot)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Coefficients of fir_filter_tb.vhd.')
+  parser.add_argument('--wl', type=int, default=18, help='bit length')
+  parser.add_argument('--fs', type=float, default=100e6)
+  parser.add_argument('--fc', type=float, default=None, help='default: Fs/16')
+  parser.add_argument('--fir-ord', type=int, default=63)
+  parser.add_argument('--window', default='nuttall')
+  parser.add_argument('--optimize-wl', action='store_true',
+                      help='minimum bit length that meets the specification')
+  parser.add_argument('--ripple-db', type=float, default=0.5)
+  parser.add_argument('--atten-db', type=float, default=90)
+  parser.add_argument('--no-fold', action='store_true', help='no folded coefficient file')
+  parser.add_argument('--out-dir', default='.')
+  parser.add_argument('--plot', default=None, help="'show' or file name of the figure")
+  args = parser.parse_args(argv)
+
+  fc = args.fs/16 if args.fc is None else args.fc
+  fileName, _, _ = gen_fir_coeffs(args.wl, args.fs, fc, args.fir_ord, args.window,
+                                  int(args.optimize_wl), args.ripple_db, args.atten_db,
+                                  int(not args.no_fold), args.out_dir, args.plot)
+  print(fileName)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -1,86 +1,115 @@
-
 """
 Author: Daniele Giardino
 Date: 2024.03.08
 
 Descritpion
 The script generates a text file used in the testbench.
+
+Usage:
+  python genSignal.py [--num-sps 2048] [--seed 1] [--file data_in.txt] [--plot x.png]
+The figure is optional (--plot show: interactive, --plot file: saved).
 """
 
 # Import libraries
+import argparse
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import signal
-
-# Parameters
-numSps = 2048 # Length
-Wl = 16     # Bit length
-
-# Data
-Fs  = 100e6
-fc0 = Fs/64.0
-fc1 = Fs/8.0
-n = np.arange(start=0, stop=numSps, step=1)
-x  = 0.25*np.cos(2*np.pi*fc0/Fs*n)
-x += 0.25*np.cos(2*np.pi*fc1/Fs*n)
-x += np.random.normal(0, 1e-1, size=(numSps))
-
-# FLP to FXP
-# The amplitude of the signal x is between 1 and -1,
-# so simply multiply by 2**(Wl-1)-1
-A = 2**(Wl-1)-1
-x = A * x
-
-# FFT
-Fs = 100e6
-nFFT = 2**8
-w, Xf = signal.freqz(b=x, a=2**15 * np.size(x),
-                      worN=nFFT,
-                      whole=False)
-Xf = 20*np.log10(np.abs(Xf))
-w = w/np.pi * Fs/2e6
-
-plt.figure()
-plt.plot(w, Xf, '-', label='Xf')
-plt.grid()
-plt.legend(loc='upper right')
-plt.xlabel('Frequency [MHz]')
-plt.ylabel('Amplitude [dB]')
-
-plt.show()
-
-# Filename
-fileName = "data_in.txt"
-
-# Loop
-with open(fileName, "w") as file:
-  for i in range(0,np.size(x)):
-    # int32 conversion
-    x_tmp = int(x[i])     
-    
-    # Typecast negative number int to uint
-    if x_tmp<0:
-      x_tmp += 2**32
-    
-    # String binary representation
-    bin_str = bin(x_tmp)
-    
-    # Delete "0b" chars inserted by 'bin' function
-    if bin_str[0:2] == "0b":
-      bin_str = bin_str[2:]
-    
-    # Take the last 'Wl' bits because there can be 32 bits for negative numbers
-    if len(bin_str)>Wl:
-      bin_str = bin_str[-Wl:]
-    
-    # Resize bits (like VHDL)
-    # Positive numbers must be preceded by zeros
-    while len(bin_str)<Wl:
-      bin_str = "0" + bin_str
-    
-    # Write the binary number in the file
-    file.write(bin_str)
-
-    # If x_tmp is not the last, newline "\n" is written
-    if i<np.size(x)-1:
-      file.write("\n")
+
+# Shared functions to generate and write the FXP signals
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_io import write_fxp_txt, write_fxp_txt_chunks
+from sig_gen import tone_noise_blocks, fxp_blocks
+import fig_out
+
+
+def gen_signal(numSps=2048, Wl=16, streaming=0, blockSps=2**16, seed=None,
+               fileName="data_in.txt", plot=None):
+  """Generates the input file of fir_filter_tb.vhd.
+
+  Args:
+    numSps: Length.
+    Wl: Bit length.
+    streaming: 1: the signal is generated, quantized and written block by
+      block, so the memory usage does not depend on numSps (no figure).
+      Use it for very long signals.
+      0: the whole signal is generated, plotted and written.
+    blockSps: Samples of each block.
+    seed: Seed of the random generator.
+    fileName: Output file.
+    plot: None, 'show' or file name of the figure (see fig_out.py).
+
+  Returns:
+    fileName.
+  """
+  # Data
+  Fs  = 100e6
+  fc0 = Fs/64.0
+  fc1 = Fs/8.0
+  blocks = tone_noise_blocks(numSps, Fs,
+                             tones=[(0.25, fc0), (0.25, fc1)],
+                             noise_std=1e-1,
+                             block_sps=blockSps,
+                             seed=seed)
+
+  if streaming:
+    # FLP to FXP and write each block
+    write_fxp_txt_chunks(fileName, fxp_blocks(blocks, Wl), Wl)
+
+  else:
+    x = np.concatenate(list(blocks))
+
+    # FLP to FXP
+    # The amplitude of the signal x is between 1 and -1,
+    # so simply multiply by 2**(Wl-1)-1
+    A = 2**(Wl-1)-1
+    x = A * x
+
+    if plot is not None:
+      plot_signal(x, Fs, plot)
+
+    # Write the binary numbers in the file
+    write_fxp_txt(fileName, x, Wl)
+  return fileName
+
+
+def plot_signal(x, Fs, plot):
+  """Spectrum of the signal."""
+  from fxp_coeffs import freqz_batch
+  plt = fig_out.pyplot(plot)
+
+  # FFT
+  nFFT = 2**8
+  Xf = freqz_batch(x / (2**15 * np.size(x)), nFFT)[0]
+  Xf = 20*np.log10(np.abs(Xf))
+  w = np.arange(nFFT) / nFFT * Fs/2e6
+
+  plt.figure()
+  plt.plot(w, Xf, '-', label='Xf')
+  plt.grid()
+  plt.legend(loc='upper right')
+  plt.xlabel('Frequency [MHz]')
+  plt.ylabel('Amplitude [dB]')
+  return fig_out.finish(plt, plot)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Input signal of fir_filter_tb.vhd.')
+  parser.add_argument('--num-sps', type=int, default=2048)
+  parser.add_argument('--wl', type=int, default=16, help='bit length')
+  parser.add_argument('--streaming', action='store_true',
+                      help='generate and write block by block (no figure)')
+  parser.add_argument('--block-sps', type=int, default=2**16)
+  parser.add_argument('--seed', type=int, default=None)
+  parser.add_argument('--file', default="data_in.txt")
+  parser.add_argument('--plot', default=None, help="'show' or file name of the figure")
+  args = parser.parse_args(argv)
+
+  gen_signal(args.num_sps, args.wl, int(args.streaming), args.block_sps, args.seed,
+             args.file, args.plot)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -1,68 +1,92 @@
-
 """
 Author: Daniele Giardino
 Date: 2024.03.08
 
 Descritpion
 The script generates a text file used in the testbench.
+
+Usage:
+  python readSignal.py [--file ../testbench/data_out.txt] [--plot y.png]
+The figure is optional (--plot show: interactive, --plot file: saved).
 """
 
 # Import libraries
+import argparse
+import os
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import signal
-
-# FXP parameters
-Wl = 18
-A  = 2**(Wl-1) - 1
-K  = 2**(Wl) 
-
-# Program to read the entire file using read() function
-x = np.array([])
-file = open("../testbench/data_out.txt", "r")
-while True:
-	# Read bin string
-	content=file.readline()
-	if not content:
-		break
-		
-  # Convert bin string to int number
-	x_tmp = int(content[0:Wl], base=2)
-	if x_tmp>A:
-		x_tmp = x_tmp - K
-	
-	x = np.append(x, x_tmp)
-	
-file.close()
-
-# Int to Q notation
-x = x / 2**15
-
-# FFT
-Fs = 100e6
-nFFT = 2**8
-w, Xf = signal.freqz(b=x, a=np.size(x),
-                      worN=nFFT,
-                      whole=False)
-Xf = 20*np.log10(np.abs(Xf))
-w = w/np.pi * Fs/2e6
-
-# Figure
-plt.figure()
-
-plt.subplot(2,1,1)
-plt.plot(x, '-', label='x')
-plt.grid()
-plt.legend(loc='upper right')
-plt.xlabel('Samples')
-plt.ylabel('Amplitude')
-
-plt.subplot(2,1,2)
-plt.plot(w, Xf, '-', label='Xf')
-plt.grid()
-plt.legend(loc='upper right')
-plt.xlabel('Frequency [MHz]')
-plt.ylabel('Amplitude [dB]')
-
-plt.show()
 
+# Shared functions to read the FXP text files
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_io import read_fxp_txt
+from fxp_coeffs import freqz_batch
+import fig_out
+
+# Output file of the testbench
+DATA_OUT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "../testbench/data_out.txt")
+
+
+def read_signal(fileName=DATA_OUT, Wl=18, plot=None):
+  """Reads the output file of fir_filter_tb.vhd and computes its spectrum.
+
+  Args:
+    fileName: Output file of the testbench.
+    Wl: Bit length.
+    plot: None, 'show' or file name of the figure (see fig_out.py).
+
+  Returns:
+    Tuple (x, w, Xf): samples (Q notation), frequencies [MHz] and
+    amplitude [dB] of the spectrum.
+  """
+  # Read the entire file (vectorized decoding of the binary strings)
+  x = read_fxp_txt(fileName, Wl).astype(np.float64)
+
+  # Int to Q notation
+  x = x / 2**15
+
+  # FFT
+  Fs = 100e6
+  nFFT = 2**8
+  Xf = freqz_batch(x / np.size(x), nFFT)[0]
+  Xf = 20*np.log10(np.abs(Xf))
+  w = np.arange(nFFT) / nFFT * Fs/2e6
+
+  # Figure
+  if plot is not None:
+    plt = fig_out.pyplot(plot)
+    plt.figure()
+
+    plt.subplot(2,1,1)
+    plt.plot(x, '-', label='x')
+    plt.grid()
+    plt.legend(loc='upper right')
+    plt.xlabel('Samples')
+    plt.ylabel('Amplitude')
+
+    plt.subplot(2,1,2)
+    plt.plot(w, Xf, '-', label='Xf')
+    plt.grid()
+    plt.legend(loc='upper right')
+    plt.xlabel('Frequency [MHz]')
+    plt.ylabel('Amplitude [dB]')
+
+    fig_out.finish(plt, plot)
+  return x, w, Xf
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Output signal of fir_filter_tb.vhd.')
+  parser.add_argument('--file', default=DATA_OUT)
+  parser.add_argument('--wl', type=int, default=18, help='bit length')
+  parser.add_argument('--plot', default=None, help="'show' or file name of the figure")
+  args = parser.parse_args(argv)
+
+  x, w, Xf = read_signal(args.file, args.wl, args.plot)
+  print("%i samples, max |x| = %f, peak at %f MHz" % (np.size(x), np.max(np.abs(x)), w[np.argmax(Xf)]))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
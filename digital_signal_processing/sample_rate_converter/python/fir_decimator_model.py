@@ -0,0 +1,165 @@
+"""
+fir_decimator_model.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Bit-true polyphase model of fir_decimator.vhd (architecture rtl_polyphase).
+
+  The RTL is a direct-form FIR filter decimated by DecimFactor:
+    y[j] = sum_t h[t] * x[(j+1)*DecimFactor - t]
+  (with x[n] = 0 for n < 0, registers reset to 0). The coefficients are
+  split in DecimFactor phases of numDSP coefficients h[i*DecimFactor + r];
+  in each clock cycle the multAdd cascade computes one phase and acc_N_sps
+  accumulates the DecimFactor phases of an output. The model filters each
+  input sub-sequence with its phase at the output rate, so only the kept
+  outputs are computed (Coeffs_len/DecimFactor multiplications for each
+  input sample).
+
+  Bit widths:
+    - the output of the multAdd cascade (one value for each phase) is a
+      Width_sum-bit sum;
+    - acc_N_sps accumulates the DecimFactor values with Width_acc bits;
+    - round_and_clip_slv rounds to Width_out + Clip_bits bits and saturates
+      to Width_out bits.
+
+  The output j is written fir_decimator_latency valid input samples after
+  the input sample (j+1)*DecimFactor. The testbench writes the first samples
+  of this sequence (the last ones are still in the pipeline when the input
+  ends).
+
+  Usage (with the parameters and files of fir_decimator_tb.vhd, any folder):
+    python fir_decimator_model.py
+  writes ../testbench/data_out_model.txt.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_bin import fxp_wrap
+from fxp_fir import fxp_convolve
+from fxp_io import CHUNK_SPS, read_fxp_txt, write_fxp_txt
+from fxp_round import round_and_clip_slv, round_and_clip_latency
+
+
+def polyphase_coeffs(coeffs, DecimFactor):
+  """Polyphase matrix of fir_decimator.vhd.
+
+  Returns:
+    int64 matrix, size (DecimFactor, numDSP). The row r contains the
+    coefficients h[i*DecimFactor + r], applied to the input samples
+    x[(j+1)*DecimFactor - r - i*DecimFactor].
+  """
+  coeffs = np.asarray(coeffs, dtype=np.int64).reshape(-1)
+  numDSP = -(-np.size(coeffs) // DecimFactor)
+
+  # Zero padding to numDSP*DecimFactor coefficients
+  h = np.zeros(numDSP * DecimFactor, dtype=np.int64)
+  h[:np.size(coeffs)] = coeffs
+  return h.reshape(numDSP, DecimFactor).T
+
+
+def fir_decimator_latency(Coeffs_len, DecimFactor=4, Width_acc=40, Clip_bits=4,
+                          Width_out=18):
+  """Valid input samples between the input sample (j+1)*DecimFactor and the output j.
+
+  delay_slv and multAdd registers (4) + multAdd cascade (numDSP) +
+  round_and_clip_slv (one accumulated output for each register).
+  """
+  numDSP = -(-Coeffs_len // DecimFactor)
+  return numDSP + 4 + DecimFactor * round_and_clip_latency(Width_acc, Width_out, Clip_bits)
+
+
+def fir_decimator_acc(x, coeffs, DecimFactor=4, Width_in=16, Width_coeffs=18,
+                      Width_sum=38, Width_acc=40, chunk_sps=CHUNK_SPS):
+  """Output of acc_N_sps (Width_acc-bit accumulation) for each output sample.
+
+  Args:
+    x: Input samples (Width_in-bit signed numbers).
+    coeffs: Coefficients (Width_coeffs-bit signed numbers), Coeffs_len values.
+    DecimFactor, Width_in, Width_coeffs, Width_sum, Width_acc: Generics of
+      fir_decimator.vhd.
+    chunk_sps: Number of output samples of each convolution block.
+
+  Returns:
+    int64 array with len(x)//DecimFactor samples.
+  """
+  if Width_acc > 64 or Width_in + Width_coeffs > 64:
+    raise ValueError("The model supports Width_acc and Width_in+Width_coeffs up to 64 bits.")
+  if Width_acc < Width_sum:
+    raise ValueError("Width_acc must not be lower than Width_sum.")
+  x = fxp_wrap(x, Width_in)
+  h_poly = polyphase_coeffs(fxp_wrap(coeffs, Width_coeffs), DecimFactor)
+
+  # Phase r: input samples x[m*DecimFactor - r], m = j+1, j, ... (0 after
+  # the last one); the phase 0 starts one output earlier (x[0])
+  num_out = np.size(x) // DecimFactor
+  x = np.concatenate((x, np.zeros(DecimFactor, dtype=np.int64)))
+  acc = np.zeros(num_out, dtype=np.int64)
+  with np.errstate(over='ignore'):
+    for r in range(DecimFactor):
+      if r == 0:
+        x_r = x[0::DecimFactor][:num_out+1]
+        y_r = fxp_convolve(x_r, h_poly[r, :], chunk_sps)[1:]
+      else:
+        x_r = x[DecimFactor-r::DecimFactor][:num_out]
+        y_r = fxp_convolve(x_r, h_poly[r, :], chunk_sps)
+      acc += fxp_wrap(y_r, Width_sum)
+  return fxp_wrap(acc, Width_acc)
+
+
+def fir_decimator_model(x, coeffs, DecimFactor=4, Width_in=16, Width_coeffs=18,
+                        Width_sum=38, Width_acc=40, Clip_bits=4, Width_out=18,
+                        chunk_sps=CHUNK_SPS):
+  """Bit-true output of fir_decimator.vhd.
+
+  Args:
+    x: Input samples (Width_in-bit signed numbers).
+    coeffs: Coefficients (Width_coeffs-bit signed numbers).
+    DecimFactor, Width_in, Width_coeffs, Width_sum, Width_acc, Clip_bits,
+      Width_out: Generics of fir_decimator.vhd.
+    chunk_sps: Number of output samples of each convolution block.
+
+  Returns:
+    int64 array with len(x)//DecimFactor samples (Width_out-bit signed numbers).
+  """
+  y = fir_decimator_acc(x, coeffs, DecimFactor, Width_in, Width_coeffs,
+                        Width_sum, Width_acc, chunk_sps)
+  return round_and_clip_slv(y, Width_acc, Width_out, Clip_bits)
+
+
+def main(argv=None):
+  # Defaults: parameters and files of fir_decimator_tb.vhd
+  tb = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../testbench")
+  parser = argparse.ArgumentParser(description='Bit-true model of fir_decimator.vhd.')
+  parser.add_argument('--data-in', default=os.path.join(tb, 'data_in.txt'))
+  parser.add_argument('--coeffs', default=os.path.join(tb, 'coeffs_len128_Wl18_M8.txt'))
+  parser.add_argument('--data-out', default=os.path.join(tb, 'data_out_model.txt'))
+  parser.add_argument('--decim-factor', type=int, default=3)
+  parser.add_argument('--width-in', type=int, default=16)
+  parser.add_argument('--width-coeffs', type=int, default=18)
+  parser.add_argument('--width-sum', type=int, default=40)
+  parser.add_argument('--width-acc', type=int, default=42)
+  parser.add_argument('--clip-bits', type=int, default=9)
+  parser.add_argument('--width-out', type=int, default=18)
+  args = parser.parse_args(argv)
+
+  x = read_fxp_txt(args.data_in, args.width_in)
+  coeffs = read_fxp_txt(args.coeffs, args.width_coeffs)
+  y = fir_decimator_model(x, coeffs, args.decim_factor, args.width_in, args.width_coeffs,
+                          args.width_sum, args.width_acc, args.clip_bits, args.width_out)
+
+  latency = fir_decimator_latency(np.size(coeffs), args.decim_factor, args.width_acc,
+                                  args.clip_bits, args.width_out)
+  print("Latency = %i valid input samples" % latency)
+  write_fxp_txt(args.data_out, y, args.width_out)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+fir_interpolator_model.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Bit-true polyphase model of fir_interpolator.vhd (architecture
+  rtl_polyphase).
+
+  The output is the input upsampled by InterpFactor (zero stuffing) and
+  filtered with the coefficients. The model does not multiply the stuffed
+  zeros: the output phase p is the input filtered with the coefficients
+    h[i*InterpFactor + p],  i = 0, ..., numDSP-1
+  so each input sample needs Coeffs_len multiplications for InterpFactor
+  outputs.
+
+  Bit widths:
+    - the output of the multAdd cascade is a Width_sum-bit sum;
+    - round_and_clip_slv rounds to Width_out + Clip_bits bits and saturates
+      to Width_out bits.
+
+  The output n*InterpFactor + p is aligned with the input sample n: the
+  output n*InterpFactor is written fir_interpolator_latency clock cycles
+  (output samples) after the valid input sample n. The testbench writes the
+  first fir_interpolator_num_out samples of this sequence (the last ones
+  are still in the pipeline when the input ends).
+
+  Usage (with the parameters and files of fir_interpolator_tb.vhd, any folder):
+    python fir_interpolator_model.py
+  writes ../testbench/data_out_model.txt.
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_bin import fxp_wrap
+from fxp_fir import fxp_convolve
+from fxp_io import CHUNK_SPS, read_fxp_txt, write_fxp_txt
+from fxp_round import round_and_clip_slv, round_and_clip_latency
+
+
+def polyphase_coeffs(coeffs, InterpFactor):
+  """Polyphase matrix of fir_interpolator.vhd.
+
+  Returns:
+    int64 matrix, size (InterpFactor, numDSP). The row p contains the
+    coefficients of the output phase p.
+  """
+  coeffs = np.asarray(coeffs, dtype=np.int64).reshape(-1)
+  numDSP = -(-np.size(coeffs) // InterpFactor)
+
+  # Zero padding to numDSP*InterpFactor coefficients
+  h = np.zeros(numDSP * InterpFactor, dtype=np.int64)
+  h[:np.size(coeffs)] = coeffs
+  return h.reshape(numDSP, InterpFactor).T
+
+
+def fir_interpolator_latency(Coeffs_len, InterpFactor=8, Width_sum=38, Clip_bits=4,
+                             Width_out=18):
+  """Output samples between the valid input sample n and the output n*InterpFactor.
+
+  delay_slv, input and multAdd registers (5) + multAdd cascade (numDSP) +
+  round_and_clip_slv.
+  """
+  numDSP = -(-Coeffs_len // InterpFactor)
+  return numDSP + 5 + round_and_clip_latency(Width_sum, Width_out, Clip_bits)
+
+
+def fir_interpolator_num_out(num_in, Coeffs_len, InterpFactor=8, Width_sum=38, Clip_bits=4,
+                             Width_out=18):
+  """Output samples written by fir_interpolator_tb.vhd for num_in input samples.
+
+  The pipeline of rtl_polyphase is enabled only in the state COUNT (enbDSP),
+  i.e. InterpFactor clock cycles for each valid input sample of the
+  testbench (one every InterpFactor cycles), and it stops when the input
+  file ends: the last outputs stay in the pipeline. valid_out needs the
+  numDSP+3 valid chain (validOut_inst) and round_and_clip_slv filled by
+  enbDSP, so the first numDSP + 3 + round_and_clip_latency of the
+  num_in*InterpFactor enabled cycles give no output. This is latency - 2:
+  the input register (reg_data_in) and the IDLE -> COUNT transition are
+  before the first enbDSP cycle. The simulation (1e6 clock cycles) must be
+  longer than num_in*InterpFactor cycles.
+  """
+  numDSP = -(-Coeffs_len // InterpFactor)
+  fill = numDSP + 3 + round_and_clip_latency(Width_sum, Width_out, Clip_bits)
+  return max(num_in * InterpFactor - fill, 0)
+
+
+def fir_interpolator_sum(x, coeffs, InterpFactor=8, Width_in=16, Width_coeffs=18,
+                         Width_sum=38, chunk_sps=CHUNK_SPS):
+  """Output of the multAdd cascade (Width_sum-bit sum) for each output sample.
+
+  Args:
+    x: Input samples (Width_in-bit signed numbers).
+    coeffs: Coefficients (Width_coeffs-bit signed numbers), Coeffs_len values.
+    InterpFactor, Width_in, Width_coeffs, Width_sum: Generics of
+      fir_interpolator.vhd.
+    chunk_sps: Number of input samples of each convolution block.
+
+  Returns:
+    int64 array with len(x)*InterpFactor samples.
+  """
+  if Width_sum > 64 or Width_in + Width_coeffs > 64:
+    raise ValueError("The model supports Width_sum and Width_in+Width_coeffs up to 64 bits.")
+  x = fxp_wrap(x, Width_in)
+  h_poly = polyphase_coeffs(fxp_wrap(coeffs, Width_coeffs), InterpFactor)
+
+  # Rows: input samples, columns: output phases
+  y = np.empty((np.size(x), InterpFactor), dtype=np.int64)
+  for p in range(InterpFactor):
+    y[:, p] = fxp_convolve(x, h_poly[p, :], chunk_sps)
+  return fxp_wrap(y.reshape(-1), Width_sum)
+
+
+def fir_interpolator_model(x, coeffs, InterpFactor=8, Width_in=16, Width_coeffs=18,
+                           Width_sum=38, Clip_bits=4, Width_out=18,
+                           chunk_sps=CHUNK_SPS):
+  """Bit-true output of fir_interpolator.vhd.
+
+  Args:
+    x: Input samples (Width_in-bit signed numbers).
+    coeffs: Coefficients (Width_coeffs-bit signed numbers).
+    InterpFactor, Width_in, Width_coeffs, Width_sum, Clip_bits, Width_out:
+      Generics of fir_interpolator.vhd.
+    chunk_sps: Number of input samples of each convolution block.
+
+  Returns:
+    int64 array with len(x)*InterpFactor samples (Width_out-bit signed numbers).
+  """
+  y = fir_interpolator_sum(x, coeffs, InterpFactor, Width_in, Width_coeffs,
+                           Width_sum, chunk_sps)
+  return round_and_clip_slv(y, Width_sum, Width_out, Clip_bits)
+
+
+def main(argv=None):
+  # Defaults: parameters and files of fir_interpolator_tb.vhd
+  tb = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../testbench")
+  parser = argparse.ArgumentParser(description='Bit-true model of fir_interpolator.vhd.')
+  parser.add_argument('--data-in', default=os.path.join(tb, 'data_in.txt'))
+  parser.add_argument('--coeffs', default=os.path.join(tb, 'coeffs_len128_Wl18_L8.txt'))
+  parser.add_argument('--data-out', default=os.path.join(tb, 'data_out_model.txt'))
+  parser.add_argument('--interp-factor', type=int, default=8)
+  parser.add_argument('--width-in', type=int, default=16)
+  parser.add_argument('--width-coeffs', type=int, default=18)
+  parser.add_argument('--width-sum', type=int, default=40)
+  parser.add_argument('--clip-bits', type=int, default=7)
+  parser.add_argument('--width-out', type=int, default=18)
+  args = parser.parse_args(argv)
+
+  x = read_fxp_txt(args.data_in, args.width_in)
+  coeffs = read_fxp_txt(args.coeffs, args.width_coeffs)
+  y = fir_interpolator_model(x, coeffs, args.interp_factor, args.width_in, args.width_coeffs,
+                             args.width_sum, args.clip_bits, args.width_out)
+
+  latency = fir_interpolator_latency(np.size(coeffs), args.interp_factor, args.width_sum,
+                                     args.clip_bits, args.width_out)
+  print("Latency = %i output samples" % latency)
+  print("Output samples written by the testbench = %i"
+        % fir_interpolator_num_out(np.size(x), np.size(coeffs), args.interp_factor,
+                                   args.width_sum, args.clip_bits, args.width_out))
+  write_fxp_txt(args.data_out, y, args.width_out)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
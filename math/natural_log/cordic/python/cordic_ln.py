@@ -0,0 +1,188 @@
+"""
+cordic_ln.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Batched bit-true model of ../c/lib_cordic_ln.c and exhaustive error sweep
+  of ../c/main.c.
+
+  The input s is an unsigned UQ1.(Wl-1) number. The CORDIC algorithm
+  (pre-normalization with countZeros to u in [1, 2), hyperbolic vectoring
+  iterations with the repetitions i = 4, 13, 40, ... and the atanh_lut
+  table, post-processing ln(s) = 2*z - n*ln(2)) is applied to whole int64
+  arrays of inputs.
+
+  The sweep splits the input range in chunks computed by a process pool and
+  merges the error statistics (maximum, mean, histogram, number of errors
+  greater than the threshold) of the chunks; no per-sample file is written.
+
+  Error (as in main.c, in percent):
+    (ln(s/2**(Wl-1)) - res/2**(Wl-1)) / ln(s/2**(Wl-1)) * 100
+  The reference and the errors are computed in double precision. The error
+  of s = 2**(Wl-1) (ln(1) = 0) is not defined and is counted in 'num_nan'.
+
+  Usage:
+    python cordic_ln.py --wl 30            # all the inputs in [1, 2**30-1]
+    python cordic_ln.py --wl 24 --end 1e6
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../../packages/python"))
+from cordic_hyp import cordic_hyp_vectoring, hyperbolic_iterations
+from err_stats import ErrorStats, sweep_range
+
+# Inputs of each chunk of the sweep
+CHUNK_SPS = 2**20
+
+# Size of the atanh table of main.c
+ATANH_LUT_LEN = 72
+
+
+def _round_c(x):
+  """round() of C: halfway cases away from zero."""
+  r = math.floor(abs(x))
+  r += (abs(x) - r) >= 0.5
+  return int(math.copysign(r, x))
+
+
+def init_atanh_lut(Wl, N_iter=ATANH_LUT_LEN):
+  """Mirror of init_atanh_lut: round(2**(Wl-1) * atanh(2**-i)), i = 1, ..., N_iter."""
+  return np.array([_round_c(2.0**(Wl-1) * math.atanh(2.0**(-i)))
+                   for i in range(1, N_iter + 1)], dtype=np.int64)
+
+
+def ln_2_fxp(Wl):
+  """ln(2) with Wl-1 fractional bits, as in main.c."""
+  return _round_c(math.log(2) * 2.0**(Wl-1))
+
+
+def count_zeros(s, Wl):
+  """Mirror of countZeros: leading zeros of the Wl-bit inputs (0 for s = 0)."""
+  s = np.asarray(s, dtype=np.int64)
+  n = Wl - np.frexp(s.astype(np.float64))[1]
+  return np.where(s == 0, 0, n).astype(np.int64)
+
+
+def cordic_ln(s, Wl, N_iter=None, atanh_lut=None, ln_2=None):
+  """Mirror of cordicAlgorithm on an array of inputs.
+
+  Args:
+    s: Array of inputs (UQ1.(Wl-1), 1 <= s < 2**Wl).
+    Wl: Word length (up to 52).
+    N_iter: Number of iterations (default: Wl).
+    atanh_lut: Table of the atanh values (default: init_atanh_lut(Wl)).
+    ln_2: ln(2) with Wl-1 fractional bits (default: ln_2_fxp(Wl)).
+
+  Returns:
+    int64 array res. The natural logarithm is res / 2**(Wl-1).
+  """
+  if N_iter is None:
+    N_iter = Wl
+  if atanh_lut is None:
+    atanh_lut = init_atanh_lut(Wl)
+  if ln_2 is None:
+    ln_2 = ln_2_fxp(Wl)
+  s = np.asarray(s, dtype=np.int64)
+
+  # Pre-normalization to u in [1, 2)
+  n = count_zeros(s, Wl)
+  u = s << n
+
+  # Initialization: x = u + 1, y = u - 1, z = 0
+  k_1 = np.int64(1) << (Wl - 1)
+  x = u + k_1
+  y = u - k_1
+  z = np.zeros(np.shape(s), dtype=np.int64)
+
+  # CORDIC kernel
+  cordic_hyp_vectoring(x, y, hyperbolic_iterations(N_iter), z, atanh_lut)
+
+  # Post processing
+  return (z << 1) - n * np.int64(ln_2)
+
+
+def cordic_ln_stats(s_start, s_stop, Wl, N_iter=None, hist_edges=None, threshold=0.1):
+  """Error statistics of the inputs [s_start, s_stop) (see the module description)."""
+  s = np.arange(s_start, s_stop, dtype=np.int64)
+  res = cordic_ln(s, Wl, N_iter)
+
+  x_ref = np.log(s / 2.0**(Wl-1))
+  with np.errstate(divide='ignore', invalid='ignore'):
+    err = (x_ref - res / 2.0**(Wl-1)) / x_ref * 100
+  err[x_ref == 0] = np.nan
+
+  stats = ErrorStats(hist_edges, threshold)
+  stats.update(err, s)
+  return stats
+
+
+def cordic_ln_sweep(Wl, s_start=1, s_end=None, N_iter=None, hist_edges=None,
+                    threshold=0.1, jobs=None, chunk_sps=CHUNK_SPS):
+  """Error statistics of the inputs [s_start, s_end], as the loop of main.c.
+
+  Args:
+    Wl: Word length.
+    s_start: First input (greater than 0).
+    s_end: Last input, included (default: 2**Wl - 1).
+    N_iter: Number of iterations (default: Wl).
+    hist_edges: Edges of the histogram of the errors [%].
+    threshold: Errors [%] counted in 'num_above' (0.1 % in main.c).
+    jobs: Number of worker processes (None: number of CPUs, 1: no pool).
+    chunk_sps: Number of inputs of each chunk.
+
+  Returns:
+    ErrorStats.
+  """
+  if s_start < 1:
+    raise ValueError("s_start must be greater than 0!")
+  if s_end is None:
+    s_end = 2**Wl - 1
+  if s_end < s_start:
+    raise ValueError("Empty input range [%i, %i]!" % (s_start, s_end))
+  return sweep_range(cordic_ln_stats, s_start, s_end + 1,
+                     (Wl, N_iter, hist_edges, threshold), chunk_sps, jobs)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Error sweep of the CORDIC natural logarithm.')
+  parser.add_argument('--wl', type=int, default=30, help='word length')
+  parser.add_argument('--n-iter', type=int, default=None, help='iterations (default: Wl)')
+  parser.add_argument('--start', type=float, default=1, help='first input')
+  parser.add_argument('--end', type=float, default=None, help='last input, included (default: 2**Wl-1)')
+  parser.add_argument('--threshold', type=float, default=0.1, help='error threshold [%%]')
+  parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: number of CPUs)')
+  parser.add_argument('--chunk-sps', type=int, default=CHUNK_SPS)
+  args = parser.parse_args(argv)
+
+  s_end = None if args.end is None else int(args.end)
+  print("Word Length - Wl=%i\nFractional Length - Fl=%i\n" % (args.wl, args.wl - 1))
+
+  t_start = time.perf_counter()
+  try:
+    stats = cordic_ln_sweep(args.wl, int(args.start), s_end, args.n_iter, None,
+                            args.threshold, args.jobs, args.chunk_sps)
+  except ValueError as err:
+    print(err)
+    return 1
+  t_elapsed = time.perf_counter() - t_start
+
+  print("Number of inputs = %i (%i without error, ln(1) = 0)" % (stats.num_sps, stats.num_nan))
+  print("Number of errors = %i (|err| > %g %%)" % (stats.num_above, args.threshold))
+  print("Max Error = %f %% (s = %s)" % (stats.max_abs, stats.arg_max_abs))
+  print("Mean Error = %e %% | Mean Abs Error = %e %% | RMS Error = %e %%"
+        % (stats.mean, stats.mean_abs, stats.rms))
+  print("Time taken by program is %.2f s" % t_elapsed)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
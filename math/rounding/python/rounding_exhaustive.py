@@ -0,0 +1,207 @@
+"""
+rounding_exhaustive.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Exhaustive verification of the blocks of math/rounding.
+
+  All the 2**WIDTH_IN input values (from -2**(WIDTH_IN-1) to
+  2**(WIDTH_IN-1)-1) are split in chunks and the expected outputs are
+  computed by the bit-true models of packages/python/fxp_round.py in a
+  process pool. The script writes:
+    - the input vectors (one value for each input code),
+    - the expected output vectors (same order as the inputs),
+  and compares the expected outputs with the outputs of a simulation, if
+  they are available. The files are text files (one binary string per line,
+  as read/written by the testbenches) or binary files if the extension is
+  '.fxb' (see packages/python/fxp_bin.py).
+
+  The output file of the simulation must contain one output for each input,
+  without the latency samples (see rounding_latency in fxp_round.py).
+
+  Usage:
+    python rounding_exhaustive.py --block axi_round_and_clip_slv \\
+      --width-in 24 --width-out 16 --clip-bits 3 \\
+      --data-in data_in.fxb --expected data_out_expected.fxb
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_bin import FXP_BIN_EXT, fxp_bin_dtype, read_fxp_bin, write_fxp_bin_chunks
+from fxp_io import CHUNK_SPS, iter_fxp_txt, write_fxp_txt_chunks
+from fxp_round import ROUNDING_BLOCKS, rounding_block
+
+# Maximum input width of the exhaustive mode
+WIDTH_IN_MAX = 32
+
+
+def exhaustive_inputs(WIDTH_IN, start, stop):
+  """Input values of the codes [start, stop) (code 0 is -2**(WIDTH_IN-1))."""
+  return np.arange(start, stop, dtype=np.int64) - (1 << (WIDTH_IN - 1))
+
+
+def _run_chunk(args):
+  """Expected outputs of one chunk of inputs (executed by the workers)."""
+  block, WIDTH_IN, WIDTH_OUT, CLIP_BITS, ROUND_TYPE, start, stop = args
+  x = exhaustive_inputs(WIDTH_IN, start, stop)
+  y = rounding_block(block, x, WIDTH_IN, WIDTH_OUT, CLIP_BITS, ROUND_TYPE)
+  return y.astype(fxp_bin_dtype(WIDTH_OUT))
+
+
+def _map_bounded(pool, func, items, window):
+  """pool.map(func, items) with at most 'window' chunks in flight.
+
+  The results are yielded in order and the next item is submitted only
+  when the consumer has processed the oldest result, so the finished
+  chunks do not pile up in memory when the consumer (file writer,
+  comparison) is slower than the workers.
+  """
+  items = iter(items)
+  futures = deque(pool.submit(func, item) for _, item in zip(range(window), items))
+  while futures:
+    yield futures.popleft().result()
+    item = next(items, None)
+    if item is not None:
+      futures.append(pool.submit(func, item))
+
+
+def _write_vectors(fileName, chunks, Wl):
+  """Writes chunks of samples in a text or binary (.fxb) file."""
+  if fileName.endswith(FXP_BIN_EXT):
+    return write_fxp_bin_chunks(fileName, chunks, Wl)
+  return write_fxp_txt_chunks(fileName, chunks, Wl)
+
+
+def _iter_vectors(fileName, Wl, chunk_sps):
+  """Yields chunks of samples of a text or binary (.fxb) file."""
+  if fileName.endswith(FXP_BIN_EXT):
+    x, _ = read_fxp_bin(fileName)
+    for i in range(0, np.size(x), chunk_sps):
+      yield np.asarray(x[i:i+chunk_sps], dtype=np.int64)
+  else:
+    yield from iter_fxp_txt(fileName, Wl, chunk_sps=chunk_sps)
+
+
+def _consume(chunks, fileName, Wl):
+  """Writes the chunks in a file, or just iterates them if fileName is None."""
+  if fileName is not None:
+    _write_vectors(fileName, chunks, Wl)
+  else:
+    for _ in chunks:
+      pass
+
+
+def rounding_exhaustive(block, WIDTH_IN, WIDTH_OUT, CLIP_BITS=0, ROUND_TYPE=0,
+                        fileIn=None, fileExpected=None, fileDut=None,
+                        jobs=None, chunk_sps=CHUNK_SPS):
+  """Computes the outputs of a rounding block for all the input values.
+
+  Args:
+    block: Name of the block (see ROUNDING_BLOCKS in fxp_round.py).
+    WIDTH_IN, WIDTH_OUT, CLIP_BITS, ROUND_TYPE: Generics of the block.
+    fileIn: Output file of the input vectors (None: not written).
+    fileExpected: Output file of the expected outputs (None: not written).
+    fileDut: Outputs of the simulation to verify (None: no comparison).
+    jobs: Number of worker processes (None: number of CPUs, 1: no pool).
+    chunk_sps: Number of inputs of each chunk.
+
+  Returns:
+    Dictionary with the keys:
+      'num_sps': number of input values,
+      'num_checked': number of outputs of the simulation compared,
+      'num_errors': number of outputs different from the expected ones,
+      'first_error': (input value, expected, simulation) of the first error,
+        or None.
+  """
+  if block not in ROUNDING_BLOCKS:
+    raise ValueError('Invalid block. Choose one of %s.' % ', '.join(ROUNDING_BLOCKS))
+  if WIDTH_IN > WIDTH_IN_MAX:
+    raise ValueError('WIDTH_IN must not be greater than %i.' % WIDTH_IN_MAX)
+  if WIDTH_OUT > WIDTH_IN:
+    raise ValueError('WIDTH_OUT must not be greater than WIDTH_IN.')
+
+  num_sps = 1 << WIDTH_IN
+  bounds = [(start, min(start + chunk_sps, num_sps))
+            for start in range(0, num_sps, chunk_sps)]
+
+  if fileIn is not None:
+    _write_vectors(fileIn, (exhaustive_inputs(WIDTH_IN, start, stop)
+                            for start, stop in bounds), WIDTH_IN)
+
+  summary = {'num_sps': num_sps, 'num_checked': 0, 'num_errors': 0,
+             'first_error': None}
+
+  def check(expected_chunks):
+    """Compares the expected outputs with the simulation, chunk by chunk."""
+    dut_chunks = _iter_vectors(fileDut, WIDTH_OUT, chunk_sps) if fileDut else iter(())
+    for (start, stop), y in zip(bounds, expected_chunks):
+      y_dut = next(dut_chunks, None)
+      if y_dut is not None:
+        num = min(np.size(y_dut), np.size(y))
+        err = np.flatnonzero(y_dut[:num] != y[:num])
+        summary['num_checked'] += num
+        summary['num_errors'] += np.size(err)
+        if np.size(err) and summary['first_error'] is None:
+          i = err[0]
+          x_err = int(exhaustive_inputs(WIDTH_IN, start + i, start + i + 1)[0])
+          summary['first_error'] = (x_err, int(y[i]), int(y_dut[i]))
+      yield y
+
+  points = [(block, WIDTH_IN, WIDTH_OUT, CLIP_BITS, ROUND_TYPE, start, stop)
+            for start, stop in bounds]
+  if jobs == 1:
+    expected_chunks = map(_run_chunk, points)
+    _consume(check(expected_chunks), fileExpected, WIDTH_OUT)
+  else:
+    num_workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+      expected_chunks = _map_bounded(pool, _run_chunk, points, 2 * num_workers)
+      _consume(check(expected_chunks), fileExpected, WIDTH_OUT)
+  return summary
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Exhaustive verification of the blocks of math/rounding.')
+  parser.add_argument('--block', choices=ROUNDING_BLOCKS, default='round_and_clip_slv')
+  parser.add_argument('--width-in', type=int, default=24)
+  parser.add_argument('--width-out', type=int, default=16)
+  parser.add_argument('--clip-bits', type=int, default=3, help='round_and_clip blocks')
+  parser.add_argument('--round-type', type=int, default=0, help='round blocks')
+  parser.add_argument('--data-in', default=None, help='input vectors (.txt or .fxb)')
+  parser.add_argument('--expected', default=None, help='expected output vectors (.txt or .fxb)')
+  parser.add_argument('--dut-out', default=None, help='outputs of the simulation to verify')
+  parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: number of CPUs)')
+  parser.add_argument('--chunk-sps', type=int, default=CHUNK_SPS)
+  args = parser.parse_args(argv)
+
+  t_start = time.perf_counter()
+  summary = rounding_exhaustive(args.block, args.width_in, args.width_out,
+                                args.clip_bits, args.round_type,
+                                args.data_in, args.expected, args.dut_out,
+                                args.jobs, args.chunk_sps)
+  t_elapsed = time.perf_counter() - t_start
+
+  print('%s: %i input values in %.2f s' % (args.block, summary['num_sps'], t_elapsed))
+  if args.dut_out:
+    print('Checked %i outputs, %i errors' % (summary['num_checked'], summary['num_errors']))
+    if summary['first_error'] is not None:
+      print('First error: input %i, expected %i, simulation %i' % summary['first_error'])
+    if summary['num_checked'] != summary['num_sps']:
+      print('Warning: the simulation has %i outputs, %i expected'
+            % (summary['num_checked'], summary['num_sps']))
+    return int(summary['num_errors'] > 0 or summary['num_checked'] != summary['num_sps'])
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+cordic_sqrt.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Batched bit-true model of ../c/lib_cordicSqrt.c and exhaustive error sweep
+  of ../c/main.c.
+
+  The CORDIC algorithm (pre-normalization with countZeros, hyperbolic
+  iterations with the repetitions i = 4, 13, 40, ..., gain compensation) is
+  applied to whole int64 arrays of inputs, so each iteration is a few NumPy
+  operations on a block of inputs instead of a scalar loop.
+
+  The sweep splits the input range in chunks computed by a process pool and
+  merges the error statistics (maximum, mean, histogram, number of errors
+  greater than the threshold) of the chunks; no per-sample file is written.
+
+  Error (as in main.c, in percent):
+    - 'flp': (sqrt(s) - x_cor/2**Wl) / sqrt(s) * 100
+    - 'int': (floor(sqrt(s)) - (x_cor >> Wl)) / floor(sqrt(s)) * 100
+  The reference and the errors are computed in double precision.
+
+  Usage:
+    python cordic_sqrt.py --wl 32            # all the inputs in [1, 2**32-1)
+    python cordic_sqrt.py --wl 24 --end 1e6
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../../packages/python"))
+from cordic_hyp import cordic_hyp_vectoring, hyperbolic_iterations
+from err_stats import ErrorStats, sweep_range
+
+# Inputs of each chunk of the sweep
+CHUNK_SPS = 2**20
+
+
+def cordic_sqrt_gain(N_iter):
+  """Mirror of cordicSqrtGain (the C function uses float variables)."""
+  An = np.float32(1)
+  for i in hyperbolic_iterations(N_iter):
+    An = np.float32(float(An) * math.sqrt(1.0 - 2.0**(-2*i)))
+  return np.float32(1.0 / float(An))
+
+
+def count_zeros(s, Wl):
+  """Mirror of countZeros: even number of shifts of the pre-normalization.
+
+  Args:
+    s: int64 array of inputs (1 <= s < 2**Wl, Wl <= 52).
+    Wl: Word length.
+  """
+  # Leading zeros of the Wl-bit numbers (exact for Wl <= 52)
+  n = Wl - np.frexp(s.astype(np.float64))[1]
+
+  # 'n' must be even
+  n = np.where((n > 1) & (n % 2 == 1), n - 1, n)
+  n = np.where(n == 1, 2, n)
+  return n.astype(np.int64)
+
+
+def cordic_sqrt(s, Wl, N_iter=None, cordicGain=None):
+  """Mirror of cordicAlgorithm on an array of inputs.
+
+  Args:
+    s: Array of inputs (1 <= s < 2**Wl).
+    Wl: Word length (even, up to 40).
+    N_iter: Number of iterations (default: Wl).
+    cordicGain: CORDIC gain (default: cordic_sqrt_gain(N_iter)).
+
+  Returns:
+    int64 array x_cor. The square root is x_cor / 2**Wl.
+  """
+  if N_iter is None:
+    N_iter = Wl
+  if cordicGain is None:
+    cordicGain = cordic_sqrt_gain(N_iter)
+  s = np.asarray(s, dtype=np.int64)
+
+  # Pre-normalization
+  n = count_zeros(s, Wl)
+  u = s << n
+
+  # Initialization: x = u + 0.25, y = u - 0.25
+  k_025 = np.int64(0.25 * 2**Wl)
+  x = u + k_025
+  y = u - k_025
+
+  # CORDIC kernel
+  cordic_hyp_vectoring(x, y, hyperbolic_iterations(N_iter))
+
+  # Shift of n/2 to compensate the pre-normalization
+  x >>= n // 2
+
+  # Gain compensation (scaling by 2**(Wl/2))
+  cordicGain_int = np.int64(math.ceil(float(cordicGain) * 2.0**(Wl // 2)))
+  return x * cordicGain_int
+
+
+def cordic_sqrt_stats(s_start, s_stop, Wl, N_iter=None, err_type='flp',
+                      hist_edges=None, threshold=1.0):
+  """Error statistics of the inputs [s_start, s_stop) (see the module description)."""
+  if N_iter is None:
+    N_iter = Wl
+  s = np.arange(s_start, s_stop, dtype=np.int64)
+  x_cor = cordic_sqrt(s, Wl, N_iter)
+
+  if err_type == 'flp':
+    x_ref = np.sqrt(s.astype(np.float64))
+    err = (x_ref - x_cor / 2.0**Wl) / x_ref * 100
+  elif err_type == 'int':
+    x_ref = np.floor(np.sqrt(s.astype(np.float64)))
+    err = (x_ref - (x_cor >> Wl)) / x_ref * 100
+  else:
+    raise ValueError("Invalid err_type. Choose 'flp' or 'int'.")
+
+  stats = ErrorStats(hist_edges, threshold)
+  stats.update(err, s)
+  return stats
+
+
+def cordic_sqrt_sweep(Wl, s_start=1, s_end=None, N_iter=None, err_type='flp',
+                      hist_edges=None, threshold=1.0, jobs=None, chunk_sps=CHUNK_SPS):
+  """Error statistics of the inputs [s_start, s_end), as the loop of main.c.
+
+  Args:
+    Wl: Word length (even).
+    s_start: First input (greater than 0).
+    s_end: Last input, excluded (default: 2**Wl - 1).
+    N_iter: Number of iterations (default: Wl).
+    err_type: 'flp' or 'int' (see the module description).
+    hist_edges: Edges of the histogram of the errors [%].
+    threshold: Errors [%] counted in 'num_above' (1 % in main.c).
+    jobs: Number of worker processes (None: number of CPUs, 1: no pool).
+    chunk_sps: Number of inputs of each chunk.
+
+  Returns:
+    ErrorStats.
+  """
+  if Wl % 2 == 1:
+    raise ValueError("Word length must be even!")
+  if s_start < 1:
+    raise ValueError("s_start must be greater than 0!")
+  if s_end is None:
+    s_end = 2**Wl - 1
+  if s_end <= s_start:
+    raise ValueError("Empty input range [%i, %i)!" % (s_start, s_end))
+  return sweep_range(cordic_sqrt_stats, s_start, s_end,
+                     (Wl, N_iter, err_type, hist_edges, threshold),
+                     chunk_sps, jobs)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Error sweep of the CORDIC square root.')
+  parser.add_argument('--wl', type=int, default=32, help='word length (even)')
+  parser.add_argument('--n-iter', type=int, default=None, help='iterations (default: Wl)')
+  parser.add_argument('--start', type=float, default=1, help='first input')
+  parser.add_argument('--end', type=float, default=None, help='last input, excluded (default: 2**Wl-1)')
+  parser.add_argument('--err-type', choices=('flp', 'int'), default='flp')
+  parser.add_argument('--threshold', type=float, default=1.0, help='error threshold [%%]')
+  parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: number of CPUs)')
+  parser.add_argument('--chunk-sps', type=int, default=CHUNK_SPS)
+  args = parser.parse_args(argv)
+
+  N_iter = args.wl if args.n_iter is None else args.n_iter
+  s_end = None if args.end is None else int(args.end)
+  print("cordicGain=%f" % cordic_sqrt_gain(N_iter))
+
+  t_start = time.perf_counter()
+  try:
+    stats = cordic_sqrt_sweep(args.wl, int(args.start), s_end, N_iter, args.err_type,
+                              None, args.threshold, args.jobs, args.chunk_sps)
+  except ValueError as err:
+    print(err)
+    return 1
+  t_elapsed = time.perf_counter() - t_start
+
+  print("Number of inputs = %i" % stats.num_sps)
+  print("Number of errors = %i (|err| > %g %%)" % (stats.num_above, args.threshold))
+  print("Max Error = %f %% (s = %s)" % (stats.max_abs, stats.arg_max_abs))
+  print("Mean Error = %e %% | Mean Abs Error = %e %% | RMS Error = %e %%"
+        % (stats.mean, stats.mean_abs, stats.rms))
+  print("Time taken by program is %.2f s" % t_elapsed)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
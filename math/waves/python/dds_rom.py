@@ -0,0 +1,322 @@
+"""
+dds_rom.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  ROM images of dds_sin.vhd, dds_cos.vhd and dds_c_wave.vhd, with
+  symmetric (compressed) versions, and SFDR/SNR of the quantized tables.
+
+  The ROM of the VHDL blocks ('no_symmetry') contains
+    round(f(Wn*n) * (2**(bitLength-1) - 1)),  n = n_start, ..., n_end
+  with f = sin or cos and ROUND of math_real (halfway away from zero).
+
+  If Wn = 2*pi*k/N (N integer, k integer) the sample n is the phase
+  m = k*n mod N of a period of N points, and the ROM can be compressed:
+    - 'half_wave': N/2 words, f(m) = -f(m - N/2) for m >= N/2 (N even);
+    - 'quarter_wave': N/4 words of sin(2*pi*m/N), m = 0, ..., N/4-1; the
+      other phases are obtained by mirroring the address and negating the
+      output, the peak (m = N/4) is the constant 2**(bitLength-1)-1 and the
+      cosine uses the address m + N/4 (N multiple of 4). dds_c_wave can
+      read sin and cos from the same table (dual-port ROM).
+  The output of a compressed ROM is compared with the 'no_symmetry' table
+  ('num_diff' different words). They can differ by 1 LSB where f*Ampl is
+  a halfway case (e.g. sin(pi/6)*127 = 63.5): the sin of the floating-point
+  phases is not exactly symmetric, so the VHDL table is not symmetric
+  either. The SFDR and SNR are computed on the output of each structure.
+
+  The SFDR and SNR of the tables of all the bitLength values are computed
+  with one FFT of a (num_bitLength, lutSize) matrix. The output of the DDS
+  repeats the table, so the FFT over lutSize samples is exact (no window).
+
+  Usage:
+    python dds_rom.py --wave c_wave --period 64 --sfdr 90
+    python dds_rom.py --wave sin --period 1024 --bit-length 16 \\
+      --struct quarter_wave --out rom_sin_q.txt
+"""
+
+import argparse
+import math
+import os
+import sys
+from fractions import Fraction
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_io import write_fxp_txt
+
+DDS_WAVES = ('sin', 'cos', 'c_wave')
+DDS_STRUCTS = ('no_symmetry', 'half_wave', 'quarter_wave')
+
+# Aspect ratios (depth, width) of a 18Kb block RAM (Xilinx 7-series/UltraScale)
+BRAM18_ASPECTS = ((16384, 1), (8192, 2), (4096, 4), (2048, 9), (1024, 18), (512, 36))
+
+# Words of a distributed ROM in a LUT6
+LUT_DEPTH = 64
+
+
+def _round_vhdl(x):
+  """ROUND of math_real: halfway cases away from zero."""
+  return np.copysign(np.floor(np.abs(x) + 0.5), x)
+
+
+def dds_ampl(bitLength):
+  """Amplitude of the tables, 2**(bitLength-1) - 1 (array-like bitLength)."""
+  return 2.0**(np.asarray(bitLength, dtype=np.float64) - 1) - 1
+
+
+def dds_n(n_start, n_end):
+  """Indexes n of the table, as the loops of f_sin/f_cos."""
+  step = 1 if n_start <= n_end else -1
+  return np.arange(n_start, n_end + step, step, dtype=np.int64)
+
+
+def dds_table(wave, Wn, n_start, n_end, bitLength):
+  """Mirror of f_sin/f_cos.
+
+  Args:
+    wave: 'sin' or 'cos'.
+    Wn, n_start, n_end: Generics of the block.
+    bitLength: Word length, scalar or 1-D array.
+
+  Returns:
+    int64 array (lutSize,), or matrix (len(bitLength), lutSize).
+  """
+  func = {'sin': np.sin, 'cos': np.cos}[wave]
+  f = func(Wn * dds_n(n_start, n_end).astype(np.float64))
+  ampl = np.expand_dims(dds_ampl(bitLength), -1)
+  return _round_vhdl(f * ampl).astype(np.int64)
+
+
+def dds_phase_grid(Wn, n_start, n_end, max_period=2**24):
+  """Phases of the table on a grid of N points, if Wn = 2*pi*k/N.
+
+  Returns:
+    Tuple (N, m), where m is the int64 array of the phases k*n mod N, or
+    None if Wn is not a rational multiple of 2*pi (up to max_period points).
+  """
+  x = Wn / (2 * math.pi)
+  frac = Fraction(x).limit_denominator(max_period)
+  if abs(float(frac) - x) > 1e-12 * max(1.0, abs(x)):
+    return None
+  N, k = frac.denominator, frac.numerator
+  return N, (k * dds_n(n_start, n_end)) % N
+
+
+def _rom_half(wave, N, bitLength):
+  return dds_table(wave, 2 * math.pi / N, 0, N // 2 - 1, bitLength)
+
+
+def _rom_quarter(N, bitLength):
+  return dds_table('sin', 2 * math.pi / N, 0, N // 4 - 1, bitLength)
+
+
+def dds_rom(wave, struct, Wn, n_start, n_end, bitLength):
+  """ROM image of a block.
+
+  Args:
+    wave: 'sin' or 'cos' (the waves of dds_c_wave are computed separately).
+    struct: 'no_symmetry', 'half_wave' or 'quarter_wave'.
+    Wn, n_start, n_end: Generics of the block.
+    bitLength: Word length, scalar or 1-D array.
+
+  Returns:
+    Dictionary with:
+      'rom': ROM words (last axis), int64;
+      'addr': ROM address of each sample of the table;
+      'neg': True if the ROM word is negated;
+      'peak': True if the output is the peak constant (quarter_wave);
+      'N': points of a period (None for 'no_symmetry').
+  """
+  if struct not in DDS_STRUCTS:
+    raise ValueError("Invalid struct. Choose one of %s." % ', '.join(DDS_STRUCTS))
+  lutSize = abs(n_end - n_start) + 1
+  if struct == 'no_symmetry':
+    return {'rom': dds_table(wave, Wn, n_start, n_end, bitLength),
+            'addr': np.arange(lutSize), 'neg': np.zeros(lutSize, dtype=bool),
+            'peak': np.zeros(lutSize, dtype=bool), 'N': None}
+
+  grid = dds_phase_grid(Wn, n_start, n_end)
+  if grid is None:
+    raise ValueError("Wn must be 2*pi*k/N for the symmetric structures.")
+  N, m = grid
+  if struct == 'half_wave':
+    if N % 2:
+      raise ValueError("N = %i must be even for 'half_wave'." % N)
+    return {'rom': _rom_half(wave, N, bitLength), 'addr': m % (N // 2),
+            'neg': m >= N // 2, 'peak': np.zeros(lutSize, dtype=bool), 'N': N}
+
+  if N % 4:
+    raise ValueError("N = %i must be a multiple of 4 for 'quarter_wave'." % N)
+  if wave == 'cos':
+    m = (m + N // 4) % N
+  m_half = m % (N // 2)
+  return {'rom': _rom_quarter(N, bitLength),
+          'addr': np.where(m_half <= N // 4, m_half, N // 2 - m_half) % (N // 4),
+          'neg': m >= N // 2, 'peak': m_half == N // 4, 'N': N}
+
+
+def dds_rom_output(rom, bitLength):
+  """Output of the DDS (one table period) read from a ROM image of dds_rom."""
+  y = rom['rom'][..., rom['addr']]
+  peak = np.expand_dims(dds_ampl(bitLength), -1).astype(np.int64)
+  y = np.where(rom['peak'], peak, y)
+  return np.where(rom['neg'], -y, y)
+
+
+def rom_footprint(depth, width):
+  """Approximate resources of a ROM.
+
+  Returns:
+    Dictionary with 'bits', 'bram18' (number of 18Kb block RAMs, best
+    aspect ratio) and 'lut' (LUT6 of a distributed ROM, without the output
+    multiplexers).
+  """
+  bram18 = min(-(-depth // d) * -(-width // w) for d, w in BRAM18_ASPECTS)
+  return {'bits': depth * width, 'bram18': bram18,
+          'lut': -(-depth // LUT_DEPTH) * width}
+
+
+def dds_spectrum_metrics(y):
+  """SFDR and SNR of periodic signals (one period in each row).
+
+  The carrier is the bin with the maximum power; the spurs include the DC
+  and, for complex signals, the negative frequencies.
+
+  Returns:
+    Tuple (sfdr, snr) of arrays in dB, one value for each row.
+  """
+  y = np.atleast_2d(y)
+  if np.iscomplexobj(y):
+    Y = np.abs(np.fft.fft(y, axis=-1))**2
+  else:
+    Y = np.abs(np.fft.rfft(y, axis=-1))**2
+    # One-sided power (the DC and the Nyquist bins are not doubled)
+    Y[:, 1:(np.shape(y)[-1] + 1) // 2] *= 2
+  carrier = np.argmax(Y, axis=-1)
+  rows = np.arange(np.shape(Y)[0])
+  P_carrier = Y[rows, carrier]
+  Y_spurs = Y.copy()
+  Y_spurs[rows, carrier] = 0
+  tiny = np.finfo(np.float64).tiny
+  sfdr = 10 * np.log10(P_carrier / np.maximum(np.max(Y_spurs, axis=-1), tiny))
+  snr = 10 * np.log10(P_carrier / np.maximum(np.sum(Y_spurs, axis=-1), tiny))
+  return sfdr, snr
+
+
+def dds_sweep(wave, Wn, n_start, n_end, bitLengths, structs=DDS_STRUCTS, skipped=None):
+  """SFDR, SNR and ROM footprint of each bitLength and structure.
+
+  Args:
+    wave: 'sin', 'cos' or 'c_wave'.
+    Wn, n_start, n_end: Generics of the block.
+    bitLengths: Word lengths (2 to 32).
+    structs: Structures; the symmetric ones are skipped if Wn is not
+      compatible.
+    skipped: If a list, (struct, reason) of each skipped structure is
+      appended to it.
+
+  Returns:
+    List of dictionaries (one for each structure and bitLength) with the
+    keys 'struct', 'bitLength', 'sfdr', 'snr', 'num_diff', 'depth', 'bits',
+    'bram18', 'lut'.
+  """
+  if wave not in DDS_WAVES:
+    raise ValueError("Invalid wave. Choose one of %s." % ', '.join(DDS_WAVES))
+  bitLengths = np.asarray(bitLengths, dtype=np.int64).reshape(-1)
+  if np.any(bitLengths < 2) or np.any(bitLengths > 32):
+    raise ValueError("bitLength must be between 2 and 32.")
+  waves = ('cos', 'sin') if wave == 'c_wave' else (wave,)
+
+  results = []
+  for struct in structs:
+    try:
+      roms = [dds_rom(w, struct, Wn, n_start, n_end, bitLengths) for w in waves]
+    except ValueError as err:
+      if skipped is not None:
+        skipped.append((struct, str(err)))
+      continue
+    y = [dds_rom_output(rom, bitLengths) for rom in roms]
+    y_ref = [dds_table(w, Wn, n_start, n_end, bitLengths) for w in waves]
+    num_diff = sum(np.count_nonzero(a != b, axis=-1) for a, b in zip(y, y_ref))
+    y = y[0] + 1j * y[1] if wave == 'c_wave' else y[0].astype(np.float64)
+    sfdr, snr = dds_spectrum_metrics(y)
+
+    # dds_c_wave: the symmetric structures share one table (dual-port ROM)
+    num_roms = 2 if wave == 'c_wave' and struct == 'no_symmetry' else 1
+    depth = np.shape(roms[0]['rom'])[-1]
+    for i, b in enumerate(bitLengths):
+      fp = rom_footprint(depth, int(b))
+      results.append({'struct': struct, 'bitLength': int(b),
+                      'sfdr': float(sfdr[i]), 'snr': float(snr[i]),
+                      'num_diff': int(num_diff[i]), 'depth': depth,
+                      'bits': num_roms * fp['bits'], 'bram18': num_roms * fp['bram18'],
+                      'lut': num_roms * fp['lut']})
+  return results
+
+
+def dds_select(results, sfdr_min, cost='bits'):
+  """Smallest ROM (by 'bits', 'bram18' or 'lut') with SFDR >= sfdr_min, or None."""
+  valid = [r for r in results if r['sfdr'] >= sfdr_min]
+  if not valid:
+    return None
+  return min(valid, key=lambda r: (r[cost], r['bits'], r['bitLength']))
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='ROM images and SFDR of the DDS blocks.')
+  parser.add_argument('--wave', choices=DDS_WAVES, default='sin')
+  parser.add_argument('--period', type=int, default=64, help='N, Wn = 2*pi*k/N')
+  parser.add_argument('--cycles', type=int, default=1, help='k, Wn = 2*pi*k/N')
+  parser.add_argument('--n-start', type=int, default=0)
+  parser.add_argument('--n-end', type=int, default=None, help='default: N-1')
+  parser.add_argument('--bit-length', type=int, nargs='+', default=list(range(4, 33)))
+  parser.add_argument('--struct', choices=DDS_STRUCTS, nargs='+', default=list(DDS_STRUCTS))
+  parser.add_argument('--sfdr', type=float, default=None,
+                      help='SFDR budget [dBc] (exit status 1 if no table meets it)')
+  parser.add_argument('--cost', choices=('bits', 'bram18', 'lut'), default='bits')
+  parser.add_argument('--out', default=None,
+                      help='ROM image of the first compatible structure and bitLength '
+                           '(c_wave: the sine table)')
+  args = parser.parse_args(argv)
+
+  Wn = 2 * math.pi * args.cycles / args.period
+  n_end = args.period - 1 if args.n_end is None else args.n_end
+  skipped = []
+  results = dds_sweep(args.wave, Wn, args.n_start, n_end, args.bit_length, args.struct, skipped)
+  for struct, reason in skipped:
+    print("Skipped %s: %s" % (struct, reason))
+  if not results:
+    print("No structure is compatible with Wn = 2*pi*%i/%i" % (args.cycles, args.period))
+    return 1
+
+  print("%-13s %9s %9s %9s %8s %9s %9s %7s %7s" % ('struct', 'bitLength', 'SFDR[dB]', 'SNR[dB]',
+        'depth', 'num_diff', 'bits', 'bram18', 'lut'))
+  for r in results:
+    print("%-13s %9i %9.2f %9.2f %8i %9i %9i %7i %7i" % (r['struct'], r['bitLength'], r['sfdr'],
+          r['snr'], r['depth'], r['num_diff'], r['bits'], r['bram18'], r['lut']))
+
+  status = 0
+  if args.sfdr is not None:
+    best = dds_select(results, args.sfdr, args.cost)
+    if best is None:
+      print("No table meets SFDR >= %.2f dB" % args.sfdr)
+      status = 1
+    else:
+      print("Smallest ROM with SFDR >= %.2f dB (%s): %s, bitLength=%i, depth=%i (%.2f dB)"
+            % (args.sfdr, args.cost, best['struct'], best['bitLength'], best['depth'], best['sfdr']))
+
+  if args.out is not None:
+    wave = 'sin' if args.wave == 'c_wave' else args.wave
+    struct, bitLength = results[0]['struct'], args.bit_length[0]
+    rom = dds_rom(wave, struct, Wn, args.n_start, n_end, bitLength)
+    write_fxp_txt(args.out, rom['rom'], bitLength)
+    print("ROM image (%s, %s, bitLength=%i, %i words): %s"
+          % (wave, struct, bitLength, np.size(rom['rom']), args.out))
+  return status
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -1,69 +1,74 @@
-
 """
 Author: Daniele Giardino
 Date: 2024.03.05
 
 Descritpion
 The script generates a text file used in the testbench.
+
+Usage:
+  python genCounter.py [--data-type signed] [--num-sps 64] [--wl 16] [--out-dir .]
 """
 
 # Import libraries
+import argparse
+import os
+import sys
 import numpy as np
 
-# Parameters
-dataType = "signed"
-numSps = 64 # Length
-Wl = 16     # Bit length
-
-
-if dataType=="signed":
-  # Data
-  n = np.arange(start=-numSps/2, stop=numSps/2, step=1)
-  
-  # Filename
-  fileName = "data_signed.txt"
-
-elif dataType=="unsigned":
-  # Data
-  n = np.arange(start=0, stop=numSps, step=1)
-  
-  # Filename
-  fileName = "data_unsigned.txt"
-
-else:
-  print("You must select \"signed\" or \"unsigned\".")
-
-print(n)
-
-# Loop
-with open(fileName, "w") as file:
-  for i in range(0,np.size(n)):
-    # int32 conversion
-    n_tmp = int(n[i])     
-    
-    # Typecast negative number int to uint
-    if n_tmp<0:
-      n_tmp += 2**32
-    
-    # String binary representation
-    bin_str = bin(n_tmp)
-    
-    # Delete "0b" chars inserted by 'bin' function
-    if bin_str[0:2] == "0b":
-      bin_str = bin_str[2:]
-    
-    # Take the last 'Wl' bits because there can be 32 bits for negative numbers
-    if len(bin_str)>Wl:
-      bin_str = bin_str[-Wl:]
-    
-    # Resize bits (like VHDL)
-    # Positive numbers must be preceded by zeros
-    while len(bin_str)<Wl:
-      bin_str = "0" + bin_str
-    
-    # Write the binary number in the file
-    file.write(bin_str)
-
-    # If n_tmp is not the last, newline "\n" is written
-    if i<np.size(n)-1:
-      file.write("\n")
+# Shared functions to write the FXP text files
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../../packages/python"))
+from fxp_io import write_fxp_txt
+
+
+def gen_counter(dataType="signed", numSps=64, Wl=16, out_dir='.'):
+  """Writes a counter (data_signed.txt or data_unsigned.txt).
+
+  Args:
+    dataType: "signed" (-numSps/2, ..., numSps/2-1) or "unsigned"
+      (0, ..., numSps-1).
+    numSps: Length.
+    Wl: Bit length.
+    out_dir: Folder of the file.
+
+  Returns:
+    Tuple (fileName, n).
+  """
+  if dataType=="signed":
+    # Data
+    n = np.arange(start=-numSps/2, stop=numSps/2, step=1)
+
+    # Filename
+    fileName = "data_signed.txt"
+
+  elif dataType=="unsigned":
+    # Data
+    n = np.arange(start=0, stop=numSps, step=1)
+
+    # Filename
+    fileName = "data_unsigned.txt"
+
+  else:
+    raise ValueError("You must select \"signed\" or \"unsigned\".")
+
+  # Write the binary numbers in the file
+  fileName = os.path.join(out_dir, fileName)
+  write_fxp_txt(fileName, n, Wl)
+  return fileName, n
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Counter of the ROM testbench.')
+  parser.add_argument('--data-type', choices=('signed', 'unsigned'), default='signed')
+  parser.add_argument('--num-sps', type=int, default=64)
+  parser.add_argument('--wl', type=int, default=16, help='bit length')
+  parser.add_argument('--out-dir', default='.')
+  args = parser.parse_args(argv)
+
+  fileName, n = gen_counter(args.data_type, args.num_sps, args.wl, args.out_dir)
+  print(n)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+bench.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Benchmark suite of the Python code of the toolbox: time and peak memory
+  of the coefficient designs, of the frequency responses of the Farrow
+  scripts, of the vector file I/O and of the bit-true models.
+
+  Groups of cases:
+    - 'design': lagrange_genCoeff, wls_deng_2004 and wls_deng_2007 at
+      increasing orders;
+    - 'freqresp': FD FIR filters and frequency responses of the
+      lagrange_main.py / wls_deng_main.py flows;
+    - 'io': write/read of the text and binary vector files;
+    - 'models': fir_filter, fir_decimator and fir_interpolator models.
+
+  Each case is timed in up to 'repeat' samples (at most TIME_BUDGET
+  seconds), the minimum and the median times are kept; the peak memory is
+  measured in one more run with tracemalloc (Python and NumPy
+  allocations). The results are saved as JSON and compared with a baseline
+  (a results file of a previous run): a case is a regression if its median
+  time or its peak memory exceeds the baseline by more than the tolerance.
+  The run-to-run noise of the times can reach x1.8 on a shared machine
+  (file I/O), so the default time tolerance is x2; use a smaller --time-tol
+  on a quiet machine. A case of the baseline missing from the run (renamed
+  or dropped) is reported and is an error, unless --allow-missing (e.g. a
+  run of a subset of the groups).
+
+  Usage:
+    python bench.py --out bench.json
+    python bench.py --groups io --io-sizes 10000 1000000 100000000
+    python bench.py --baseline bench.json --out new.json
+  The exit status is 1 if a case is a regression or is missing.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import toolbox
+
+BENCH_GROUPS = ('design', 'freqresp', 'io', 'models')
+
+# Default sizes (samples) of the I/O and model cases
+IO_SIZES = (10**4, 10**5, 10**6)
+MODEL_SIZES = (10**5, 10**6)
+
+# Timing samples of each case and time budget of the samples [s]
+REPEAT = 5
+TIME_BUDGET = 2.0
+
+# Sizes (samples) of the round-trip check of the vector files
+CHECK_SIZES = (0, 1, 2, 3, 1000)
+
+# Relative tolerances of the comparison with the baseline (median time, peak memory)
+TIME_TOL = 1.0
+MEM_TOL = 0.25
+
+
+def case_key(name, params):
+  """Key of a case, e.g. 'read_fxp_txt[num_sps=10000]'."""
+  return "%s[%s]" % (name, ','.join("%s=%s" % kv for kv in sorted(params.items())))
+
+
+def measure(func, repeat=REPEAT, memory=True):
+  """Minimum and median time of func() and its peak memory.
+
+  As timeit, short cases are called several times in each timing sample
+  (samples of at least 0.2 s), so the times of the fast cases are stable.
+
+  Returns:
+    Tuple (time_min, time_median, num_calls, peak_mem): times of one call
+    [s], total number of timed calls, peak_mem in bytes (None if memory is
+    False).
+  """
+  timer = timeit.Timer(func)
+  number, t_sample = timer.autorange()
+  times = [t_sample / number]
+  while len(times) < repeat and sum(times) * number < TIME_BUDGET:
+    times.append(timer.timeit(number) / number)
+
+  peak_mem = None
+  if memory:
+    tracemalloc.start()
+    try:
+      func()
+      peak_mem = tracemalloc.get_traced_memory()[1]
+    finally:
+      tracemalloc.stop()
+  return min(times), float(np.median(times)), len(times) * number, peak_mem
+
+
+def _quiet(func, *args):
+  """Calls func without its prints (the designs print their steps)."""
+  with contextlib.redirect_stdout(io.StringIO()):
+    return func(*args)
+
+
+def iter_cases(groups, io_sizes, model_sizes, tmp_dir):
+  """Yields the cases (name, params, items, func) of the groups.
+
+  'items' is the number of processed items (coefficients, response points
+  or samples) used for the throughput.
+  """
+  if 'design' in groups:
+    toolbox.load_command('wls')
+    from lagrange_genCoeff import lagrange_genCoeff
+    from wls_deng_2004 import wls_deng_2004
+    from wls_deng_2007 import wls_deng_2007
+    for num_coeffs in (8, 32, 128):
+      yield ('lagrange_genCoeff', {'num_coeffs': num_coeffs}, num_coeffs**2,
+             lambda n=num_coeffs: lagrange_genCoeff(n))
+    for M, N in ((2, 4), (4, 8), (8, 16), (16, 64)):
+      for name, func in (('wls_deng_2004', wls_deng_2004), ('wls_deng_2007', wls_deng_2007)):
+        yield (name, {'M': M, 'N': N}, (M + 1) * (N + 1),
+               lambda f=func, M=M, N=N: _quiet(f, M, N, 0.5))
+
+  if 'freqresp' in groups:
+    lagrange_main = toolbox.load_command('lagrange')
+    wls_deng_main = toolbox.load_command('wls')
+    from farrow_freqresp import farrow_fd_filters, fd_freq_response
+    from lagrange_genCoeff import lagrange_genCoeff
+    for num_delays, nFFT in ((8, 2**10), (64, 2**10), (64, 2**14)):
+      H = lagrange_genCoeff(8)
+      delay_vec = np.arange(num_delays) / num_delays
+      yield ('fd_freq_response', {'num_delays': num_delays, 'nFFT': nFFT}, num_delays * nFFT,
+             lambda H=H, d=delay_vec, n=nFFT: fd_freq_response(farrow_fd_filters(H, d), n))
+    yield ('lagrange_design', {'numCoeffs': 5}, 8 * 2**10,
+           lambda: _quiet(lagrange_main.lagrange_design, 5))
+    yield ('wls_design', {'M': 4, 'N': 4}, 8 * 2**10,
+           lambda: _quiet(wls_deng_main.wls_design, 4, 4))
+
+  if 'io' in groups:
+    from fxp_bin import read_fxp_bin, write_fxp_bin
+    from fxp_io import read_fxp_txt, write_fxp_txt
+    Wl = 16
+    for num_sps in io_sizes:
+      x = np.random.default_rng(0).integers(-2**(Wl-1), 2**(Wl-1), num_sps)
+      txtName = os.path.join(tmp_dir, 'bench.txt')
+      binName = os.path.join(tmp_dir, 'bench.fxb')
+      params = {'num_sps': num_sps}
+      yield ('write_fxp_txt', params, num_sps,
+             lambda x=x: write_fxp_txt(txtName, x, Wl))
+      yield ('read_fxp_txt', params, num_sps,
+             lambda: read_fxp_txt(txtName, Wl))
+      yield ('write_fxp_bin', params, num_sps,
+             lambda x=x: write_fxp_bin(binName, x, Wl))
+      yield ('read_fxp_bin', params, num_sps,
+             lambda: read_fxp_bin(binName, mmap=False))
+      del x
+      os.remove(txtName)
+      os.remove(binName)
+
+  if 'models' in groups:
+    fir_model = toolbox.load_command('fir-model').fir_filter_model
+    decim_model = toolbox.load_command('decim-model').fir_decimator_model
+    interp_model = toolbox.load_command('interp-model').fir_interpolator_model
+    rng = np.random.default_rng(0)
+    h64 = rng.integers(-2**17, 2**17, 64)
+    h128 = rng.integers(-2**17, 2**17, 128)
+    for num_sps in model_sizes:
+      x = rng.integers(-2**15, 2**15, num_sps)
+      params = {'num_sps': num_sps}
+      yield ('fir_filter_model', params, num_sps,
+             lambda x=x: fir_model(x, h64, 16, 18, 40, 5, 18))
+      yield ('fir_decimator_model', params, num_sps,
+             lambda x=x: decim_model(x, h128, 8, 16, 18, 40, 43, 9, 18))
+      yield ('fir_interpolator_model', params, num_sps,
+             lambda x=x: interp_model(x, h128, 8, 16, 18, 40, 7, 18))
+
+
+def check_io_roundtrip(tmp_dir, sizes=CHECK_SIZES, widths=(1, 8, 16, 64)):
+  """Writes and reads back the text and binary vector files.
+
+  Raises:
+    ValueError: if the samples read are not the samples written.
+  """
+  from fxp_bin import read_fxp_bin, write_fxp_bin
+  from fxp_io import read_fxp_txt, write_fxp_txt
+  rng = np.random.default_rng(0)
+  txtName = os.path.join(tmp_dir, 'check.txt')
+  binName = os.path.join(tmp_dir, 'check.fxb')
+  for Wl in widths:
+    for num_sps in sizes:
+      x = rng.integers(-2**(Wl-1), 2**(Wl-1) - 1, num_sps, endpoint=True)
+      write_fxp_txt(txtName, x, Wl)
+      write_fxp_bin(binName, x, Wl)
+      for name, y in (('text', read_fxp_txt(txtName, Wl)),
+                      ('binary', read_fxp_bin(binName, mmap=False)[0])):
+        if not np.array_equal(x, y):
+          raise ValueError("Round trip of the %s file failed (Wl = %i, %i samples)."
+                           % (name, Wl, num_sps))
+  os.remove(txtName)
+  os.remove(binName)
+
+
+def run_bench(groups=BENCH_GROUPS, io_sizes=IO_SIZES, model_sizes=MODEL_SIZES,
+              repeat=REPEAT, memory=True, verbose=True):
+  """Runs the cases of the groups.
+
+  Returns:
+    List of dictionaries (one for each case) with key, name, params,
+    time_s (minimum), time_median_s, calls, items, items_per_s and
+    peak_mem_bytes.
+  """
+  results = []
+  tmp_dir = tempfile.mkdtemp(prefix='vtb_bench_')
+  try:
+    if 'io' in groups:
+      check_io_roundtrip(tmp_dir)
+    for name, params, items, func in iter_cases(groups, io_sizes, model_sizes, tmp_dir):
+      t_min, t_med, calls, peak_mem = measure(func, repeat, memory)
+      res = {'key': case_key(name, params), 'name': name, 'params': params,
+             'time_s': t_min, 'time_median_s': t_med, 'calls': calls,
+             'items': items, 'items_per_s': items / t_min if t_min > 0 else None,
+             'peak_mem_bytes': peak_mem}
+      results.append(res)
+      if verbose:
+        print(format_result(res))
+  finally:
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+  return results
+
+
+def format_result(res, ratios=None):
+  """One line of the report (ratios: (time ratio, memory ratio, status))."""
+  mem = '-' if res['peak_mem_bytes'] is None else "%.1f MB" % (res['peak_mem_bytes'] / 2**20)
+  line = "%-44s %10.3f ms %12.3g items/s %10s" % (res['key'], 1e3 * res['time_s'],
+                                                 res['items_per_s'] or 0, mem)
+  if ratios is not None:
+    t_ratio, m_ratio, status = ratios
+    line += "  x%.2f %s %s" % (t_ratio, '' if m_ratio is None else "mem x%.2f" % m_ratio, status)
+  return line
+
+
+def bench_meta():
+  """Description of the machine and of the versions of the run."""
+  return {'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+          'python': platform.python_version(), 'numpy': np.__version__,
+          'platform': platform.platform(), 'machine': platform.machine(),
+          'cpu_count': os.cpu_count()}
+
+
+def save_results(fileName, results):
+  """Writes the results (and bench_meta) as JSON."""
+  with open(fileName, 'w') as f:
+    json.dump({'meta': bench_meta(), 'results': results}, f, indent=1)
+
+
+def load_results(fileName):
+  """Reads a results file. Returns a dictionary {key: result}."""
+  with open(fileName) as f:
+    return {res['key']: res for res in json.load(f)['results']}
+
+
+def compare(results, baseline, time_tol=TIME_TOL, mem_tol=MEM_TOL):
+  """Compares the results with a baseline.
+
+  Args:
+    results: List of results of run_bench.
+    baseline: Dictionary {key: result} of load_results.
+    time_tol, mem_tol: Relative tolerances of the time and of the peak memory.
+
+  Returns:
+    Dictionary {key: (time ratio, memory ratio, status)}, status is 'ok',
+    'REGRESSION', 'faster' (time ratio below 1/(1+time_tol)), 'new' (not
+    in the baseline) or 'MISSING' (case of the baseline not in the results,
+    ratios None). The time ratio is the ratio of the median times.
+  """
+  ratios = {}
+  for res in results:
+    base = baseline.get(res['key'])
+    if base is None:
+      ratios[res['key']] = (1.0, None, 'new')
+      continue
+    # Baselines without the median (older files): minimum time
+    t_ratio = res['time_median_s'] / base.get('time_median_s', base['time_s'])
+    m_ratio = None
+    if res['peak_mem_bytes'] is not None and base.get('peak_mem_bytes'):
+      m_ratio = res['peak_mem_bytes'] / base['peak_mem_bytes']
+    if t_ratio > 1 + time_tol or (m_ratio is not None and m_ratio > 1 + mem_tol):
+      status = 'REGRESSION'
+    elif t_ratio < 1 / (1 + time_tol):
+      status = 'faster'
+    else:
+      status = 'ok'
+    ratios[res['key']] = (t_ratio, m_ratio, status)
+  for key in baseline:
+    if key not in ratios:
+      ratios[key] = (None, None, 'MISSING')
+  return ratios
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Benchmark suite of the Python code.')
+  parser.add_argument('--groups', choices=BENCH_GROUPS, nargs='+', default=list(BENCH_GROUPS))
+  parser.add_argument('--io-sizes', type=int, nargs='+', default=list(IO_SIZES))
+  parser.add_argument('--model-sizes', type=int, nargs='+', default=list(MODEL_SIZES))
+  parser.add_argument('--repeat', type=int, default=REPEAT)
+  parser.add_argument('--no-memory', action='store_true', help='do not measure the peak memory')
+  parser.add_argument('--out', default=None, help='JSON file of the results')
+  parser.add_argument('--baseline', default=None, help='JSON file of a previous run')
+  parser.add_argument('--time-tol', type=float, default=TIME_TOL)
+  parser.add_argument('--mem-tol', type=float, default=MEM_TOL)
+  parser.add_argument('--allow-missing', action='store_true',
+                      help='baseline cases missing from the run are not an error')
+  args = parser.parse_args(argv)
+
+  results = run_bench(args.groups, args.io_sizes, args.model_sizes, args.repeat,
+                      not args.no_memory, verbose=args.baseline is None)
+  if args.out is not None:
+    save_results(args.out, results)
+
+  if args.baseline is None:
+    return 0
+  ratios = compare(results, load_results(args.baseline), args.time_tol, args.mem_tol)
+  for res in results:
+    print(format_result(res, ratios[res['key']]))
+  missing = [key for key, (_, _, status) in ratios.items() if status == 'MISSING']
+  for key in missing:
+    print("%-44s MISSING (in the baseline, not in this run)" % key)
+  num_reg = sum(status == 'REGRESSION' for _, _, status in ratios.values())
+  print("%i cases, %i regressions, %i missing" % (len(results), num_reg, len(missing)))
+  return int(num_reg > 0 or (len(missing) > 0 and not args.allow_missing))
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+cordic_hyp.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Hyperbolic vectoring kernel shared by the batched CORDIC models
+  (math/square_root/cordic/python/cordic_sqrt.py and
+  math/natural_log/cordic/python/cordic_ln.py).
+
+  The iterations are applied in place to int64 arrays, block by block, with
+  the same shifts and additions of the C code, so the models are bit-exact.
+"""
+
+import numpy as np
+
+# Inputs of each block of the CORDIC kernel (the arrays fit in the cache)
+BLOCK_SPS = 2**14
+
+
+def hyperbolic_iterations(N_iter):
+  """Indexes of the iterations, with the repetitions i = 4, 13, 40, ..."""
+  seq = []
+  i = 1
+  i_rep = 3*i + 1
+  while i <= N_iter:
+    seq.append(i)
+    if i == i_rep:
+      i_rep = 3*i + 1
+    else:
+      i += 1
+  return seq
+
+
+def _vectoring_block(x, y, z, iterations, atanh_lut):
+  """Hyperbolic vectoring iterations, in place on x, y (and z).
+
+  The conditional negation uses the sign mask of y (m = -1 if y < 0,
+  0 otherwise): (v ^ m) - m = -v if y < 0, v otherwise.
+  """
+  m = np.empty_like(x)
+  x_tmp = np.empty_like(x)
+  y_tmp = np.empty_like(y)
+  for i in iterations:
+    np.right_shift(y, 63, out=m)
+    np.right_shift(x, i, out=x_tmp)
+    np.right_shift(y, i, out=y_tmp)
+    if z is not None:
+      z += (atanh_lut[i-1] ^ m) - m
+    np.bitwise_xor(y_tmp, m, out=y_tmp)
+    y_tmp -= m
+    x -= y_tmp
+    np.bitwise_xor(x_tmp, m, out=x_tmp)
+    x_tmp -= m
+    y -= x_tmp
+
+
+def cordic_hyp_vectoring(x, y, iterations, z=None, atanh_lut=None):
+  """Hyperbolic vectoring on int64 arrays, in place.
+
+  Args:
+    x, y: int64 arrays of the same shape, updated in place.
+    iterations: Indexes of the iterations (hyperbolic_iterations).
+    z: None, or int64 array updated in place with the sum of
+      +-atanh_lut[i-1] (sign of y).
+    atanh_lut: Table of the atanh values (required if z is given).
+  """
+  x, y = x.reshape(-1), y.reshape(-1)
+  if z is not None:
+    z = z.reshape(-1)
+  for i in range(0, np.size(x), BLOCK_SPS):
+    _vectoring_block(x[i:i+BLOCK_SPS], y[i:i+BLOCK_SPS],
+                     None if z is None else z[i:i+BLOCK_SPS], iterations, atanh_lut)
@@ -0,0 +1,150 @@
+"""
+err_stats.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Streaming statistics of the error of a FXP algorithm over a range of
+  input values, and sweep of the range in a process pool.
+
+  The range is split in chunks, each worker returns the statistics of its
+  chunk and the main process merges them as they arrive, so no sample is
+  stored or written to file.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from fxp_io import CHUNK_SPS
+
+
+class ErrorStats:
+  """Mergeable statistics of an error signal.
+
+  Attributes:
+    hist_edges: Edges of the histogram bins (default: 40 bins in [-1, 1]).
+      The values outside the edges are counted in the first/last bin.
+    threshold: The errors with absolute value greater than 'threshold' are
+      counted in 'num_above' (None: not counted).
+    num_sps: Number of errors (NaN values excluded).
+    num_nan: Number of NaN errors (e.g. relative errors with reference 0).
+    max_abs: Maximum absolute error.
+    arg_max_abs: Input value of the maximum absolute error.
+    num_above: Number of errors with absolute value greater than 'threshold'.
+    hist: Histogram counts.
+  """
+
+  def __init__(self, hist_edges=None, threshold=None):
+    if hist_edges is None:
+      hist_edges = np.linspace(-1, 1, 41)
+    self.hist_edges = np.asarray(hist_edges, dtype=np.float64)
+    self.threshold = threshold
+    self.num_sps = 0
+    self.num_nan = 0
+    self.sum = 0.0
+    self.sum_abs = 0.0
+    self.sum_sq = 0.0
+    self.max_abs = 0.0
+    self.arg_max_abs = None
+    self.num_above = 0
+    self.hist = np.zeros(np.size(self.hist_edges) - 1, dtype=np.int64)
+
+  def update(self, err, inputs=None):
+    """Adds a block of errors.
+
+    Args:
+      err: Array of errors.
+      inputs: Array of the input values of the errors (used for arg_max_abs).
+    """
+    err = np.asarray(err, dtype=np.float64).reshape(-1)
+    valid = ~np.isnan(err)
+    if not np.all(valid):
+      self.num_nan += int(np.size(err) - np.count_nonzero(valid))
+      err = err[valid]
+      if inputs is not None:
+        inputs = np.asarray(inputs).reshape(-1)[valid]
+    if np.size(err) == 0:
+      return
+
+    err_abs = np.abs(err)
+    i_max = int(np.argmax(err_abs))
+    if self.num_sps == 0 or err_abs[i_max] > self.max_abs:
+      self.max_abs = float(err_abs[i_max])
+      self.arg_max_abs = None if inputs is None else int(np.asarray(inputs).reshape(-1)[i_max])
+
+    self.num_sps += np.size(err)
+    self.sum += float(np.sum(err))
+    self.sum_abs += float(np.sum(err_abs))
+    self.sum_sq += float(np.dot(err, err))
+    if self.threshold is not None:
+      self.num_above += int(np.count_nonzero(err_abs > self.threshold))
+
+    # Values outside the edges in the first/last bin
+    err_clip = np.clip(err, self.hist_edges[0], self.hist_edges[-1])
+    self.hist += np.histogram(err_clip, bins=self.hist_edges)[0]
+
+  def merge(self, other):
+    """Adds the statistics of another ErrorStats with the same bins."""
+    if not np.array_equal(self.hist_edges, other.hist_edges):
+      raise ValueError("The histograms must have the same edges.")
+    if other.num_sps and (self.num_sps == 0 or other.max_abs > self.max_abs):
+      self.max_abs = other.max_abs
+      self.arg_max_abs = other.arg_max_abs
+    self.num_sps += other.num_sps
+    self.num_nan += other.num_nan
+    self.sum += other.sum
+    self.sum_abs += other.sum_abs
+    self.sum_sq += other.sum_sq
+    self.num_above += other.num_above
+    self.hist += other.hist
+    return self
+
+  @property
+  def mean(self):
+    return self.sum / self.num_sps if self.num_sps else float('nan')
+
+  @property
+  def mean_abs(self):
+    return self.sum_abs / self.num_sps if self.num_sps else float('nan')
+
+  @property
+  def rms(self):
+    return np.sqrt(self.sum_sq / self.num_sps) if self.num_sps else float('nan')
+
+  def summary(self):
+    """Returns the statistics as a dictionary."""
+    return {'num_sps': self.num_sps, 'num_nan': self.num_nan,
+            'max_abs': self.max_abs, 'arg_max_abs': self.arg_max_abs,
+            'mean': self.mean, 'mean_abs': self.mean_abs, 'rms': self.rms,
+            'num_above': self.num_above, 'threshold': self.threshold}
+
+
+def sweep_range(func, start, stop, args=(), chunk_sps=CHUNK_SPS, jobs=None):
+  """Merges the statistics of func over the input range [start, stop).
+
+  Args:
+    func: Function func(start, stop, *args) returning the ErrorStats of the
+      inputs [start, stop). It must be picklable (module-level function).
+    start, stop: Input range.
+    args: Other parameters of func.
+    chunk_sps: Number of inputs of each chunk.
+    jobs: Number of worker processes (None: number of CPUs, 1: no pool).
+
+  Returns:
+    ErrorStats of the whole range.
+  """
+  bounds = [(i, min(i + chunk_sps, stop)) for i in range(start, stop, chunk_sps)]
+  stats = None
+  if jobs == 1:
+    for i_start, i_stop in bounds:
+      chunk_stats = func(i_start, i_stop, *args)
+      stats = chunk_stats if stats is None else stats.merge(chunk_stats)
+  else:
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+      futures = [pool.submit(func, i_start, i_stop, *args) for i_start, i_stop in bounds]
+      for future in as_completed(futures):
+        chunk_stats = future.result()
+        stats = chunk_stats if stats is None else stats.merge(chunk_stats)
+  return stats
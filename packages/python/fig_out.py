@@ -0,0 +1,54 @@
+"""
+fig_out.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Optional figures of the scripts. matplotlib is imported only when a
+  figure is requested, so the scripts start fast and run on headless
+  machines.
+
+  The 'plot' argument of the scripts is:
+    - None: no figure (matplotlib is not imported);
+    - 'show': interactive figures (plt.show());
+    - a file name (e.g. 'fir.png'): the figures are saved with the Agg
+      backend. With several figures the label of each figure is appended
+      to the name (e.g. 'fir_Magnitude.png').
+"""
+
+import os
+
+
+def pyplot(plot):
+  """matplotlib.pyplot, with the Agg backend if the figures are saved."""
+  import matplotlib
+  if plot != 'show':
+    matplotlib.use('Agg')
+  import matplotlib.pyplot as plt
+  return plt
+
+
+def finish(plt, plot):
+  """Shows or saves the open figures and closes them.
+
+  Returns:
+    List of the written files.
+  """
+  if plot == 'show':
+    plt.show()
+    return []
+
+  root, ext = os.path.splitext(plot)
+  nums = plt.get_fignums()
+  files = []
+  for num in nums:
+    fig = plt.figure(num)
+    if len(nums) == 1:
+      fileName = plot
+    else:
+      label = (fig.get_label() or str(num)).replace(' ', '_')
+      fileName = "%s_%s%s" % (root, label, ext or '.png')
+    fig.savefig(fileName)
+    files.append(fileName)
+  plt.close('all')
+  return files
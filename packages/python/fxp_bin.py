@@ -0,0 +1,190 @@
+"""
+fxp_bin.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Compact binary format for the fixed-point (FXP) vectors of the
+  testbenches. The text files (one binary string per line) are only needed
+  by the simulator; the Python tools can work on the binary files, which are
+  memory-mapped without copies.
+
+  File layout (little-endian):
+    Header, 32 bytes
+      magic     4 bytes   b'FXPB'
+      version   uint8     1
+      Wl        uint8     word length in bits
+      signed    uint8     1 for two's-complement numbers, 0 for unsigned
+      itemsize  uint8     bytes of each sample (1, 2, 4 or 8)
+      Fl        int16     fractional length (Q format), value = int / 2**Fl
+      reserved  6 bytes
+      num_sps   uint64    number of samples
+      reserved  8 bytes
+    Data
+      num_sps samples, fixed-width little-endian integers
+"""
+
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+from fxp_io import CHUNK_SPS, fxp_to_int, iter_fxp_txt, write_fxp_txt_chunks
+
+FXP_BIN_MAGIC = b'FXPB'
+FXP_BIN_VERSION = 1
+FXP_BIN_EXT = '.fxb'
+
+# magic, version, Wl, signed, itemsize, Fl, num_sps
+_HEADER = struct.Struct('<4sBBBBh6xQ8x')
+
+FxpBinInfo = namedtuple('FxpBinInfo', ['Wl', 'signed', 'Fl', 'num_sps'])
+
+
+def fxp_bin_dtype(Wl, signed=True):
+  """Returns the smallest little-endian integer dtype that holds 'Wl' bits."""
+  if Wl < 1 or Wl > 64:
+    raise ValueError("Wl must be between 1 and 64.")
+  itemsize = 1
+  while 8*itemsize < Wl:
+    itemsize *= 2
+  return np.dtype('<%s%i' % ('i' if signed else 'u', itemsize))
+
+
+def fxp_wrap(x, Wl, signed=True):
+  """Keeps the 'Wl' LSBs of each sample, like the text files.
+
+  Args:
+    x: Array-like of samples (see 'fxp_to_int').
+    Wl: Word length in bits.
+    signed: True for two's-complement numbers, False for unsigned numbers.
+
+  Returns:
+    int64 array with values in the range of a 'Wl'-bit number.
+  """
+  x = fxp_to_int(x)
+  if Wl == 64:
+    return x
+  x = x & ((1 << Wl) - 1)
+  if signed:
+    x = (x ^ (1 << (Wl-1))) - (1 << (Wl-1))
+  return x
+
+
+def _write_header(file, Wl, signed, Fl, num_sps):
+  file.write(_HEADER.pack(FXP_BIN_MAGIC, FXP_BIN_VERSION, Wl, int(signed),
+                          fxp_bin_dtype(Wl, signed).itemsize, Fl, num_sps))
+
+
+def read_fxp_bin_info(fileName):
+  """Reads the header of a binary FXP file.
+
+  Returns:
+    FxpBinInfo(Wl, signed, Fl, num_sps).
+  """
+  with open(fileName, "rb") as file:
+    header = file.read(_HEADER.size)
+  if len(header) < _HEADER.size:
+    raise ValueError("'%s' is not a binary FXP file." % fileName)
+
+  magic, version, Wl, signed, itemsize, Fl, num_sps = _HEADER.unpack(header)
+  if magic != FXP_BIN_MAGIC:
+    raise ValueError("'%s' is not a binary FXP file." % fileName)
+  if version != FXP_BIN_VERSION:
+    raise ValueError("Version %i of '%s' is not supported." % (version, fileName))
+  if itemsize != fxp_bin_dtype(Wl, signed).itemsize:
+    raise ValueError("Header of '%s' is not valid." % fileName)
+  return FxpBinInfo(Wl, bool(signed), Fl, num_sps)
+
+
+def write_fxp_bin(fileName, x, Wl, signed=True, Fl=0):
+  """Writes FXP samples in a binary file.
+
+  Only the 'Wl' LSBs of each sample are kept (see 'fxp_wrap').
+
+  Args:
+    fileName: Name of the output file.
+    x: Array-like of samples (see 'fxp_to_int').
+    Wl: Word length in bits.
+    signed: True for two's-complement numbers, False for unsigned numbers.
+    Fl: Fractional length of the Q format.
+  """
+  write_fxp_bin_chunks(fileName, [x], Wl, signed, Fl)
+
+
+def write_fxp_bin_chunks(fileName, chunks, Wl, signed=True, Fl=0):
+  """Writes chunks of FXP samples in a binary file.
+
+  The number of samples in the header is written at the end.
+
+  Args:
+    fileName: Name of the output file.
+    chunks: Iterable of array-like chunks of samples.
+    Wl: Word length in bits.
+    signed: True for two's-complement numbers, False for unsigned numbers.
+    Fl: Fractional length of the Q format.
+
+  Returns:
+    The number of samples written in the file.
+  """
+  dtype = fxp_bin_dtype(Wl, signed)
+  num_sps = 0
+  with open(fileName, "wb") as file:
+    _write_header(file, Wl, signed, Fl, 0)
+    for x_chunk in chunks:
+      x_chunk = fxp_wrap(x_chunk, Wl, signed)
+      file.write(x_chunk.astype(dtype).tobytes())
+      num_sps += np.size(x_chunk)
+
+    # Update the header
+    file.seek(0)
+    _write_header(file, Wl, signed, Fl, num_sps)
+  return num_sps
+
+
+def read_fxp_bin(fileName, mmap=True):
+  """Reads a binary FXP file.
+
+  Args:
+    fileName: Name of the input file.
+    mmap: If True, the samples are a read-only memory map of the file,
+      otherwise they are loaded in memory.
+
+  Returns:
+    x: 1-D array of samples (dtype given by 'fxp_bin_dtype').
+    info: FxpBinInfo(Wl, signed, Fl, num_sps). The real values are x / 2**Fl.
+  """
+  info = read_fxp_bin_info(fileName)
+  dtype = fxp_bin_dtype(info.Wl, info.signed)
+  if info.num_sps == 0:
+    return np.zeros(0, dtype=dtype), info
+  if mmap:
+    x = np.memmap(fileName, dtype=dtype, mode='r',
+                  offset=_HEADER.size, shape=(info.num_sps,))
+  else:
+    x = np.fromfile(fileName, dtype=dtype, count=info.num_sps,
+                    offset=_HEADER.size)
+  return x, info
+
+
+def txt_to_bin(txtName, binName, Wl, signed=True, Fl=0, chunk_sps=CHUNK_SPS):
+  """Converts an FXP text file to a binary file.
+
+  Returns:
+    The number of samples.
+  """
+  return write_fxp_bin_chunks(binName,
+                              iter_fxp_txt(txtName, Wl, signed, chunk_sps),
+                              Wl, signed, Fl)
+
+
+def bin_to_txt(binName, txtName, chunk_sps=CHUNK_SPS):
+  """Converts a binary FXP file to the text file read by the testbenches.
+
+  Returns:
+    The number of samples.
+  """
+  x, info = read_fxp_bin(binName)
+  return write_fxp_txt_chunks(txtName,
+                              (x[i:i+chunk_sps] for i in range(0, info.num_sps, chunk_sps)),
+                              info.Wl)
@@ -0,0 +1,347 @@
+"""
+fxp_coeffs.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Quantization of FIR coefficients with the minimum word length that meets
+  a frequency specification.
+
+  The coefficients are quantized as in the genFIRCoeffs scripts:
+    h_fxp = Q(h * (2**(Wl-1) - 1))
+  and the response is H_fxp / (2**(Wl-1) - 1). The specification is
+  checked on the response normalized by the DC gain of the floating-point
+  filter:
+    - passband [0, f_pass]: max ||H|/g - 1| <= delta_p, with
+      20*log10(1 + delta_p) = ripple_db;
+    - stopband [f_stop, 1]: max |H/g| <= delta_s, with
+      20*log10(delta_s) = -atten_db.
+  The frequencies are normalized to the Nyquist frequency (as the cutoff
+  of 'signal.firwin'). The cost of a filter is
+    J = max(passband error / delta_p, stopband error / delta_s)
+  and the specification is met if J <= 1.
+
+  Quantization methods:
+    - 'round': np.round;
+    - 'search': local search from the rounded coefficients. At each step
+      all the moves of one LSB of one coefficient (of a symmetric pair, if
+      the filter has linear phase) are evaluated in one batch and the move
+      that decreases J the most is applied.
+
+  The responses are computed in batches (one rFFT of a matrix of filters),
+  e.g. all the candidate word lengths at once.
+
+  firwin_lowpass is the window method of 'signal.firwin' (lowpass) with
+  NumPy only, so the scripts do not import scipy.signal.
+
+  Folding: the coefficients of a linear-phase filter are symmetric
+  (h[k] = h[N-1-k]) or antisymmetric (h[k] = -h[N-1-k]), so a pre-adder
+  architecture needs only the first ceil(N/2) (floor(N/2) if antisymmetric,
+  the center coefficient is 0) coefficients, i.e. half the multipliers.
+  The folded file (coeffs_..._fold.txt) contains these coefficients and its
+  metadata (coeffs_..._fold.json) the length and the symmetry of the filter.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from fxp_io import read_fxp_txt, write_fxp_txt
+
+# Default number of frequency points in [0, pi) (as 'worN' of 'freqz')
+NFFT = 2**12
+
+# Maximum number of moves of the local search
+SEARCH_MAX_ITER = 500
+
+# Generalized cosine windows (coefficients of 'signal.windows.general_cosine')
+WINDOWS = {'hann': [0.5, 0.5],
+           'hamming': [0.54, 0.46],
+           'blackman': [0.42, 0.50, 0.08],
+           'nuttall': [0.3635819, 0.4891775, 0.1365995, 0.0106411],
+           'blackmanharris': [0.35875, 0.48829, 0.14128, 0.01168]}
+
+
+def firwin_lowpass(numtaps, cutoff, window='nuttall'):
+  """Lowpass FIR filter with the window method (as 'signal.firwin').
+
+  Args:
+    numtaps: Number of coefficients.
+    cutoff: Cutoff frequency (1 = Nyquist frequency).
+    window: Name of a window of WINDOWS (symmetric).
+
+  Returns:
+    Coefficients normalized to unit DC gain.
+  """
+  if window not in WINDOWS:
+    raise ValueError("Invalid window. Choose one of %s." % ', '.join(WINDOWS))
+  m = np.arange(numtaps) - 0.5 * (numtaps - 1)
+  h = cutoff * np.sinc(cutoff * m)
+
+  fac = np.linspace(-np.pi, np.pi, numtaps)
+  win = np.zeros(numtaps)
+  for k, a in enumerate(WINDOWS[window]):
+    win += a * np.cos(k * fac)
+  h = h * win
+  return h / np.sum(h)
+
+
+def freqz_batch(h, nFFT=NFFT):
+  """Frequency responses of a matrix of FIR filters.
+
+  Args:
+    h: Matrix of coefficients (num_filters, num_taps), or 1-D array.
+    nFFT: Number of frequency points, w = pi*k/nFFT (k = 0, ..., nFFT-1).
+
+  Returns:
+    Complex matrix (num_filters, nFFT), as 'signal.freqz(h, worN=nFFT)'.
+  """
+  h = np.atleast_2d(np.asarray(h, dtype=np.float64))
+  size = 2 * nFFT * -(-np.shape(h)[1] // (2 * nFFT))
+  return np.fft.rfft(h, n=size, axis=-1)[:, :size//2:size//(2*nFFT)]
+
+
+def fir_spec_bands(f_pass, f_stop, nFFT=NFFT):
+  """Masks of the passband and stopband frequency points."""
+  f = np.arange(nFFT) / nFFT
+  return f <= f_pass, f >= f_stop
+
+
+def fir_spec_cost(H, g, passband, stopband, ripple_db, atten_db):
+  """Cost J of each response (see the module description).
+
+  Args:
+    H: Matrix of responses (num_filters, nFFT).
+    g: DC gain of the floating-point filter.
+    passband, stopband: Masks of fir_spec_bands.
+    ripple_db: Maximum passband ripple [dB].
+    atten_db: Minimum stopband attenuation [dB].
+
+  Returns:
+    Tuple (J, err_pass, err_stop) of arrays, one value for each filter.
+  """
+  delta_p = 10**(ripple_db / 20) - 1
+  delta_s = 10**(-atten_db / 20)
+  Hn = np.abs(np.atleast_2d(H)) / g
+  err_pass = np.max(np.abs(Hn[:, passband] - 1), axis=-1)
+  err_stop = np.max(Hn[:, stopband], axis=-1)
+  return np.maximum(err_pass / delta_p, err_stop / delta_s), err_pass, err_stop
+
+
+def is_symmetric(h, tol=1e-12):
+  """True if the coefficients are symmetric (linear phase)."""
+  h = np.asarray(h, dtype=np.float64)
+  return bool(np.all(np.abs(h - h[::-1]) <= tol * np.max(np.abs(h))))
+
+
+def coeffs_symmetry(h, tol=0):
+  """'symmetric', 'antisymmetric' or None (no symmetry, or all zeros).
+
+  Args:
+    h: Coefficients.
+    tol: Tolerance relative to max |h| (0: exact, quantized coefficients).
+  """
+  h = np.asarray(h, dtype=np.float64)
+  if not np.any(h):
+    return None
+  lim = tol * np.max(np.abs(h))
+  if np.all(np.abs(h - h[::-1]) <= lim):
+    return 'symmetric'
+  if np.all(np.abs(h + h[::-1]) <= lim):
+    return 'antisymmetric'
+  return None
+
+
+def folded_len(num_taps, symmetry):
+  """Number of coefficients (multipliers) of the folded filter."""
+  if symmetry == 'symmetric':
+    return (num_taps + 1) // 2
+  if symmetry == 'antisymmetric':
+    return num_taps // 2
+  raise ValueError("Invalid symmetry '%s'." % symmetry)
+
+
+def fold_coeffs(h, symmetry=None):
+  """Folded coefficients of a symmetric or antisymmetric filter.
+
+  Args:
+    h: Coefficients.
+    symmetry: 'symmetric', 'antisymmetric' or None (detected, exact).
+
+  Returns:
+    Tuple (h_fold, symmetry).
+  """
+  if symmetry is None:
+    symmetry = coeffs_symmetry(h)
+    if symmetry is None:
+      raise ValueError("The coefficients are neither symmetric nor antisymmetric.")
+  return np.asarray(h)[:folded_len(np.size(h), symmetry)], symmetry
+
+
+def unfold_coeffs(h_fold, num_taps, symmetry):
+  """Coefficients of the filter from its folded coefficients."""
+  h_fold = np.asarray(h_fold)
+  if np.size(h_fold) != folded_len(num_taps, symmetry):
+    raise ValueError("%i folded coefficients for %i %s taps." % (np.size(h_fold), num_taps, symmetry))
+  sign = 1 if symmetry == 'symmetric' else -1
+  h = np.zeros(num_taps, dtype=h_fold.dtype)
+  h[:np.size(h_fold)] = h_fold
+  h[num_taps - np.size(h_fold):] = sign * h_fold[::-1]
+  return h
+
+
+def folded_file_names(fileName):
+  """Names of the folded coefficient file and of its metadata."""
+  base = os.path.splitext(fileName)[0] + '_fold'
+  return base + '.txt', base + '.json'
+
+
+def write_folded_coeffs(fileName, h_fxp, Wl, symmetry=None):
+  """Writes the folded coefficients of the coefficient file fileName.
+
+  Args:
+    fileName: Name of the file of all the coefficients.
+    h_fxp: Integer coefficients.
+    Wl: Word length.
+    symmetry: 'symmetric', 'antisymmetric' or None (detected).
+
+  Returns:
+    Names of the folded file and of its metadata.
+  """
+  h_fold, symmetry = fold_coeffs(h_fxp, symmetry)
+  foldName, metaName = folded_file_names(fileName)
+  write_fxp_txt(foldName, h_fold, Wl)
+  meta = {'coeffs_file': os.path.basename(fileName), 'num_taps': int(np.size(h_fxp)),
+          'num_folded': int(np.size(h_fold)), 'symmetry': symmetry, 'Wl': int(Wl),
+          'center_tap': bool(symmetry == 'symmetric' and np.size(h_fxp) % 2)}
+  with open(metaName, 'w') as f:
+    json.dump(meta, f, indent=1)
+  return foldName, metaName
+
+
+def read_folded_coeffs(foldName):
+  """Folded coefficients and metadata (see write_folded_coeffs).
+
+  Returns:
+    Tuple (h_fold, meta): int64 coefficients and metadata dictionary.
+  """
+  with open(os.path.splitext(foldName)[0] + '.json') as f:
+    meta = json.load(f)
+  h_fold = read_fxp_txt(foldName, meta['Wl'])
+  if np.size(h_fold) != folded_len(meta['num_taps'], meta['symmetry']):
+    raise ValueError("'%s' does not match its metadata." % foldName)
+  return h_fold, meta
+
+
+def quantize_round(h, Wl):
+  """Rounded coefficients, int64 (h * (2**(Wl-1) - 1))."""
+  return np.round(np.asarray(h, dtype=np.float64) * (2**(Wl-1) - 1)).astype(np.int64)
+
+
+def quantize_search(h, Wl, f_pass, f_stop, ripple_db, atten_db, nFFT=NFFT,
+                    max_iter=SEARCH_MAX_ITER):
+  """Coefficients quantized with the local search (see the module description).
+
+  Args:
+    h: Floating-point coefficients.
+    Wl: Word length.
+    f_pass, f_stop, ripple_db, atten_db: Specification.
+    nFFT: Number of frequency points.
+    max_iter: Maximum number of moves.
+
+  Returns:
+    Tuple (h_fxp, J): int64 coefficients and their cost.
+  """
+  h = np.asarray(h, dtype=np.float64)
+  A = 2**(Wl-1) - 1
+  g = np.abs(np.sum(h))
+  passband, stopband = fir_spec_bands(f_pass, f_stop, nFFT)
+  num_taps = np.size(h)
+
+  # Moves: +-1 LSB of a coefficient, or of a symmetric pair
+  if is_symmetric(h):
+    groups = [sorted({k, num_taps-1-k}) for k in range((num_taps + 1) // 2)]
+  else:
+    groups = [[k] for k in range(num_taps)]
+  moves = np.zeros((len(groups), num_taps))
+  for i, group in enumerate(groups):
+    moves[i, group] = 1
+  moves = np.concatenate((moves, -moves))
+  E_moves = freqz_batch(moves / A, nFFT)
+
+  h_fxp = quantize_round(h, Wl)
+  H = freqz_batch(h_fxp / A, nFFT)[0]
+  J = fir_spec_cost(H, g, passband, stopband, ripple_db, atten_db)[0][0]
+  for _ in range(max_iter):
+    J_moves = fir_spec_cost(H + E_moves, g, passband, stopband, ripple_db, atten_db)[0]
+
+    # Coefficients must stay in [-2**(Wl-1), 2**(Wl-1)-1]
+    h_moves = h_fxp + moves.astype(np.int64)
+    J_moves[np.any((h_moves < -A-1) | (h_moves > A), axis=-1)] = np.inf
+    i = int(np.argmin(J_moves))
+    if J_moves[i] >= J:
+      break
+    h_fxp, H, J = h_moves[i], H + E_moves[i], J_moves[i]
+  return h_fxp, float(J)
+
+
+def min_coeff_width(h, f_pass, f_stop, ripple_db, atten_db, widths=range(6, 33),
+                    methods=('round', 'search'), nFFT=NFFT):
+  """Minimum word length of the coefficients that meets the specification.
+
+  All the widths are quantized with 'round' and evaluated in one batch.
+  The 'search' method is tried on the widths smaller than the best 'round'
+  width, from the largest one, until it fails.
+
+  Args:
+    h: Floating-point coefficients (max |h| <= 1).
+    f_pass, f_stop: Passband and stopband edges (1 = Nyquist frequency).
+    ripple_db: Maximum passband ripple [dB].
+    atten_db: Minimum stopband attenuation [dB].
+    widths: Candidate word lengths (Width_coeffs).
+    methods: Quantization methods ('round', 'search').
+    nFFT: Number of frequency points.
+
+  Returns:
+    Dictionary with:
+      'Width_coeffs': minimum word length (None if no width meets the spec);
+      'method': method of the solution;
+      'coeffs': int64 coefficients of the solution;
+      'J': cost of the solution;
+      'J_flp': cost of the floating-point filter (> 1: the spec can not
+        be met by any word length);
+      'table': list of (Width_coeffs, method, J) of the evaluated candidates.
+  """
+  h = np.asarray(h, dtype=np.float64)
+  widths = sorted(int(Wl) for Wl in widths)
+  g = np.abs(np.sum(h))
+  passband, stopband = fir_spec_bands(f_pass, f_stop, nFFT)
+  J_flp = fir_spec_cost(freqz_batch(h, nFFT), g, passband, stopband,
+                        ripple_db, atten_db)[0][0]
+  result = {'Width_coeffs': None, 'method': None, 'coeffs': None, 'J': None,
+            'J_flp': float(J_flp), 'table': []}
+
+  best = len(widths)
+  if 'round' in methods:
+    h_round = np.stack([quantize_round(h, Wl) / (2**(Wl-1) - 1) for Wl in widths])
+    J_round = fir_spec_cost(freqz_batch(h_round, nFFT), g, passband, stopband,
+                            ripple_db, atten_db)[0]
+    result['table'] += [(Wl, 'round', float(J)) for Wl, J in zip(widths, J_round)]
+    valid = np.flatnonzero(J_round <= 1)
+    if np.size(valid):
+      best = int(valid[0])
+      Wl = widths[best]
+      result.update({'Width_coeffs': Wl, 'method': 'round',
+                     'coeffs': quantize_round(h, Wl), 'J': float(J_round[best])})
+
+  # The search starts from the rounded coefficients, skip it if the
+  # floating-point filter does not meet the specification either
+  if 'search' in methods and (result['Width_coeffs'] is not None or J_flp <= 1):
+    for Wl in widths[best-1::-1] if best > 0 else []:
+      h_fxp, J = quantize_search(h, Wl, f_pass, f_stop, ripple_db, atten_db, nFFT)
+      result['table'].append((Wl, 'search', J))
+      if J > 1:
+        break
+      result.update({'Width_coeffs': Wl, 'method': 'search', 'coeffs': h_fxp, 'J': J})
+  return result
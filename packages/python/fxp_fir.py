@@ -0,0 +1,98 @@
+"""
+fxp_fir.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Integer convolution used by the bit-true models of the FIR filters.
+  The int64 arithmetic of NumPy is modulo 2**64, so wrapping the result to
+  the width of the adders of the RTL gives the exact two's-complement sum.
+
+  fxp_convolve_folded is the pre-adder architecture of the linear-phase
+  filters (folded coefficients, see fxp_coeffs.py).
+"""
+
+import numpy as np
+
+from fxp_bin import fxp_wrap
+from fxp_coeffs import folded_len
+from fxp_io import CHUNK_SPS
+
+
+def fxp_convolve(x, coeffs, chunk_sps=CHUNK_SPS):
+  """Causal convolution of integer samples, one output for each input sample.
+
+  y[n] = sum_k coeffs[k] * x[n-k], with x[n] = 0 for n < 0 (registers reset
+  to 0). The input is processed in blocks of chunk_sps samples, keeping the
+  last len(coeffs)-1 samples of the previous block.
+
+  Args:
+    x: Input samples (integers).
+    coeffs: Coefficients (integers).
+    chunk_sps: Number of samples of each block.
+
+  Returns:
+    int64 array with len(x) samples (modulo 2**64).
+  """
+  x = np.asarray(x, dtype=np.int64).reshape(-1)
+  coeffs = np.asarray(coeffs, dtype=np.int64).reshape(-1)
+  num_hist = np.size(coeffs) - 1
+
+  y = np.empty(np.size(x), dtype=np.int64)
+  x_hist = np.zeros(num_hist, dtype=np.int64)
+  with np.errstate(over='ignore'):
+    for i in range(0, np.size(x), chunk_sps):
+      x_blk = np.concatenate((x_hist, x[i:i+chunk_sps]))
+      y[i:i+chunk_sps] = np.convolve(x_blk, coeffs, mode='valid')
+      x_hist = x_blk[np.size(x_blk) - num_hist:]
+  return y
+
+
+def fxp_convolve_folded(x, h_fold, num_taps, symmetry='symmetric', Width_pre=None,
+                        chunk_sps=CHUNK_SPS):
+  """Causal convolution with the folded coefficients of a linear-phase filter.
+
+  The two samples of each coefficient are added (subtracted if
+  antisymmetric) before the multiplication:
+    y[n] = sum_k h_fold[k] * (x[n-k] +- x[n-(N-1-k)])
+  The center tap of a symmetric filter with odd N has no pre-adder. The
+  result is the one of fxp_convolve with the unfolded coefficients if the
+  pre-adder does not overflow (Width_pre >= Width_in + 1).
+
+  Args:
+    x: Input samples (integers).
+    h_fold: Folded coefficients (integers), folded_len(num_taps) values.
+    num_taps: Number of taps N of the filter.
+    symmetry: 'symmetric' or 'antisymmetric'.
+    Width_pre: Width of the pre-adder outputs (two's-complement wrap),
+      None: no wrap.
+    chunk_sps: Number of samples of each block.
+
+  Returns:
+    int64 array with len(x) samples (modulo 2**64).
+  """
+  x = np.asarray(x, dtype=np.int64).reshape(-1)
+  h_fold = np.asarray(h_fold, dtype=np.int64).reshape(-1)
+  if np.size(h_fold) != folded_len(num_taps, symmetry):
+    raise ValueError("%i folded coefficients for %i %s taps." % (np.size(h_fold), num_taps, symmetry))
+  sign = 1 if symmetry == 'symmetric' else -1
+  num_hist = num_taps - 1
+
+  y = np.empty(np.size(x), dtype=np.int64)
+  x_hist = np.zeros(num_hist, dtype=np.int64)
+  with np.errstate(over='ignore'):
+    for i in range(0, np.size(x), chunk_sps):
+      x_blk = np.concatenate((x_hist, x[i:i+chunk_sps]))
+      L = np.size(x_blk) - num_hist
+      acc = np.zeros(L, dtype=np.int64)
+      # x_blk[m + num_hist - k] = x[i + m - k]
+      for k, c in enumerate(h_fold):
+        pre = x_blk[num_hist-k:num_hist-k+L]
+        if k != num_hist - k:
+          pre = pre + sign * x_blk[k:k+L]
+        if Width_pre is not None:
+          pre = fxp_wrap(pre, Width_pre)
+        acc += c * pre
+      y[i:i+L] = acc
+      x_hist = x_blk[np.size(x_blk) - num_hist:]
+  return y
@@ -0,0 +1,208 @@
+"""
+fxp_growth.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Bit growth of the FIR blocks (fir_filter, fir_decimator,
+  fir_interpolator) and recommended Width_sum, Width_acc and Clip_bits.
+
+  Accumulators (coefficients h of the accumulated products):
+    - fir_filter: Width_sum, all the coefficients;
+    - fir_decimator: Width_sum, each phase h[r::DecimFactor] (the phase sums
+      are sign-extended to Width_acc, so they must not wrap), and
+      Width_acc, all the coefficients;
+    - fir_interpolator: Width_sum, each phase h[p::InterpFactor].
+  Ranges of an accumulator with Width_in-bit inputs:
+    - 'worst': exact worst case, sum over the coefficients of h*x with x at
+      the full-scale value of the sign of h (L1 norm);
+    - 'gaussian': +-crest * x_rms * ||h||_2 (white Gaussian input with the
+      given rms value). Without x_rms and data file, x_rms is the rms of a
+      full-scale uniform input: a uniform sample is sub-Gaussian, so
+      P(|y| > crest * sigma) <= 2 * exp(-crest**2 / 2) (5.4e-7 at 5.5,
+      instead of 3.8e-8 for a Gaussian input);
+    - 'measured': minimum and maximum of the filter outputs of a data file.
+  The 'gaussian' and 'measured' ranges are capped at the worst case.
+
+  round_and_clip_slv keeps the bits Width - Clip_bits - 1 downto
+  Width - Clip_bits - Width_out of the last accumulator, so the output
+  does not saturate if Clip_bits <= Width - (bits of the range). The
+  recommended Width_sum and Width_acc use the worst case (the accumulators
+  never wrap); Clip_bits is given for each range.
+
+  Usage:
+    python fxp_growth.py --block fir_filter \\
+      --coeffs ../../digital_signal_processing/filters/testbench/coeffs_len64_Wl18.txt \\
+      --data-in ../../digital_signal_processing/filters/testbench/data_in.txt
+"""
+
+import argparse
+import math
+import sys
+
+import numpy as np
+
+from fxp_fir import fxp_convolve
+from fxp_io import read_fxp_txt
+
+FIR_BLOCKS = ('fir_filter', 'fir_decimator', 'fir_interpolator')
+RANGE_TYPES = ('worst', 'gaussian', 'measured')
+
+# Crest factor of the Gaussian range (P(|y| > 5.5 sigma) = 3.8e-8 for a
+# Gaussian input, <= 5.4e-7 for a uniform input)
+CREST_FACTOR = 5.5
+
+
+def signed_bits(y_min, y_max):
+  """Bits of the smallest signed number with range [y_min, y_max]."""
+  bits = 1
+  while y_min < -(1 << (bits - 1)) or y_max > (1 << (bits - 1)) - 1:
+    bits += 1
+  return bits
+
+
+def worst_case_range(coeffs, Width_in):
+  """Exact range of sum(h*x), x in [-2**(Width_in-1), 2**(Width_in-1)-1].
+
+  Returns:
+    Tuple (y_min, y_max) of Python integers.
+  """
+  h = [int(c) for c in np.asarray(coeffs).reshape(-1)]
+  x_min, x_max = -(1 << (Width_in - 1)), (1 << (Width_in - 1)) - 1
+  pos = sum(c for c in h if c > 0)
+  neg = sum(c for c in h if c < 0)
+  return pos * x_min + neg * x_max, pos * x_max + neg * x_min
+
+
+def gaussian_range(coeffs, x_rms, crest=CREST_FACTOR):
+  """Range +-crest * x_rms * ||h||_2 (rounded up to integers)."""
+  y = math.ceil(crest * x_rms * float(np.linalg.norm(np.asarray(coeffs, dtype=np.float64))))
+  return -y, y
+
+
+def measured_range(coeffs, x):
+  """Minimum and maximum of the output of the filter on the samples x."""
+  y = fxp_convolve(x, coeffs)
+  return int(np.min(y)), int(np.max(y))
+
+
+def fir_accumulators(block, coeffs, Factor=1):
+  """Coefficient sets of the accumulators of a block.
+
+  Returns:
+    List of (generic, phase, coefficients, sub-sampling of the input),
+    e.g. ('Width_sum', r, h[r::DecimFactor], DecimFactor).
+  """
+  h = np.asarray(coeffs, dtype=np.int64).reshape(-1)
+  if block == 'fir_filter':
+    return [('Width_sum', None, h, 1)]
+  if block == 'fir_decimator':
+    return ([('Width_sum', r, h[r::Factor], Factor) for r in range(Factor)]
+            + [('Width_acc', None, h, 1)])
+  if block == 'fir_interpolator':
+    return [('Width_sum', p, h[p::Factor], 1) for p in range(Factor)]
+  raise ValueError("Invalid block. Choose one of %s." % ', '.join(FIR_BLOCKS))
+
+
+def fir_growth(block, coeffs, Width_in=16, Width_out=18, Factor=1, x=None,
+               x_rms=None, crest=CREST_FACTOR):
+  """Ranges of the accumulators and recommended generics of a block.
+
+  Args:
+    block: 'fir_filter', 'fir_decimator' or 'fir_interpolator'.
+    coeffs: Integer coefficients (Width_coeffs-bit signed numbers).
+    Width_in, Width_out: Generics of the block.
+    Factor: DecimFactor or InterpFactor.
+    x: Input samples for the 'measured' ranges (None: not computed).
+    x_rms: rms of the input for the 'gaussian' ranges (None: rms of x, if
+      available, else the rms of a full-scale uniform input, see the
+      module description).
+    crest: Crest factor of the 'gaussian' ranges.
+
+  Returns:
+    Dictionary with:
+      'ranges': {generic: {range type: (y_min, y_max, bits)}}, for each
+        generic the widest phase;
+      'Width_sum', 'Width_acc' (fir_decimator): worst-case widths;
+      'Width_sum_rule': Width_in + Width_coeffs + ceil(log2(Coeffs_len))
+        of the generics comments (Width_coeffs of the coefficients);
+      'Clip_bits': {range type: Clip_bits}.
+  """
+  h = np.asarray(coeffs, dtype=np.int64).reshape(-1)
+  if x is not None:
+    x = np.asarray(x, dtype=np.int64).reshape(-1)
+  if x_rms is None:
+    if x is not None:
+      x_rms = float(np.sqrt(np.mean(x.astype(np.float64)**2)))
+    else:
+      x_rms = 2.0**(Width_in - 1) / math.sqrt(3)
+
+  ranges = {}
+  for generic, phase, h_acc, step in fir_accumulators(block, h, Factor):
+    r = {'worst': worst_case_range(h_acc, Width_in),
+         'gaussian': gaussian_range(h_acc, x_rms, crest)}
+    if x is not None:
+      # Phase of the decimator: one input sample every DecimFactor, from
+      # any of the DecimFactor offsets
+      m = [measured_range(h_acc, x[u::step]) for u in range(step)]
+      r['measured'] = (min(y[0] for y in m), max(y[1] for y in m))
+    # The statistical ranges cannot exceed the exact worst case
+    w_min, w_max = r['worst']
+    for key in r:
+      r[key] = (max(r[key][0], w_min), min(r[key][1], w_max))
+    # Widest phase of each generic
+    acc = ranges.setdefault(generic, {})
+    for key, (y_min, y_max) in r.items():
+      old = acc.get(key, (0, 0, 1))
+      y_min, y_max = min(y_min, old[0]), max(y_max, old[1])
+      acc[key] = (y_min, y_max, signed_bits(y_min, y_max))
+
+  Width_coeffs = signed_bits(int(np.min(h)), int(np.max(h)))
+  result = {'ranges': ranges,
+            'Width_sum': ranges['Width_sum']['worst'][2],
+            'Width_sum_rule': Width_in + Width_coeffs + math.ceil(math.log2(np.size(h)))}
+  last = 'Width_sum'
+  if block == 'fir_decimator':
+    result['Width_acc'] = ranges['Width_acc']['worst'][2]
+    last = 'Width_acc'
+
+  # Output bits: the MSB of the range is the MSB of data_out
+  Width = result[last]
+  result['Clip_bits'] = {key: max(0, min(Width - bits, Width - Width_out))
+                         for key, (_, _, bits) in ranges[last].items()}
+  return result
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Bit growth and Clip_bits of the FIR blocks.')
+  parser.add_argument('--block', choices=FIR_BLOCKS, default='fir_filter')
+  parser.add_argument('--coeffs', required=True, help='coefficient file of the testbench')
+  parser.add_argument('--width-coeffs', type=int, default=18)
+  parser.add_argument('--width-in', type=int, default=16)
+  parser.add_argument('--width-out', type=int, default=18)
+  parser.add_argument('--factor', type=int, default=1, help='DecimFactor or InterpFactor')
+  parser.add_argument('--data-in', default=None, help='input samples (measured ranges)')
+  parser.add_argument('--x-rms', type=float, default=None, help='rms of the input [LSB]')
+  parser.add_argument('--crest', type=float, default=CREST_FACTOR)
+  args = parser.parse_args(argv)
+
+  coeffs = read_fxp_txt(args.coeffs, args.width_coeffs)
+  x = None if args.data_in is None else read_fxp_txt(args.data_in, args.width_in)
+  res = fir_growth(args.block, coeffs, args.width_in, args.width_out, args.factor,
+                   x, args.x_rms, args.crest)
+
+  print("%s: Coeffs_len = %i, Width_in = %i, Width_out = %i"
+        % (args.block, np.size(coeffs), args.width_in, args.width_out))
+  for generic, acc in res['ranges'].items():
+    for key, (y_min, y_max, bits) in acc.items():
+      print("  %-9s %-8s [%i, %i] -> %i bits" % (generic, key, y_min, y_max, bits))
+  print("Width_sum = %i (rule of the comments: %i)" % (res['Width_sum'], res['Width_sum_rule']))
+  if 'Width_acc' in res:
+    print("Width_acc = %i" % res['Width_acc'])
+  for key, clip in res['Clip_bits'].items():
+    print("Clip_bits = %i (%s range)" % (clip, key))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
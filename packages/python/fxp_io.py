@@ -0,0 +1,240 @@
+"""
+fxp_io.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Functions to write and read the fixed-point (FXP) text files used by the
+  testbenches. Each sample is written as a 'Wl'-bit two's-complement
+  binary string, one sample per line, without a newline after the last
+  sample (the layout read by 'readline'/'read' of std.textio).
+
+  The conversion is vectorized: the samples are split in bytes and every
+  byte is converted to 8 chars with a lookup table, so whole NumPy arrays
+  are converted without Python loops. The file is written in large chunks.
+
+  The files written by the simulator (e.g. data_out.txt) are read through a
+  memory map and decoded in chunks with 'np.packbits', so the reading time
+  is linear in the number of samples.
+"""
+
+import numpy as np
+
+# Lookup table: byte value -> 8 ASCII chars ('0'/'1'), MSB first
+_BYTE_LUT = ((np.arange(256, dtype=np.uint8)[:, np.newaxis]
+              >> np.arange(7, -1, -1, dtype=np.uint8)) & 1) + ord('0')
+_BYTE_LUT = _BYTE_LUT.astype(np.uint8)
+
+# Default number of samples converted and written for each chunk
+CHUNK_SPS = 2**18
+
+
+def fxp_to_int(x):
+  """Converts an array of FXP samples to int64.
+
+  Floating-point values are truncated toward zero, like 'int()'.
+
+  Args:
+    x: Array-like of samples.
+
+  Returns:
+    The samples as a 1-D int64 array.
+  """
+  x = np.asarray(x).reshape(-1)
+  if not np.issubdtype(x.dtype, np.integer):
+    x = np.trunc(x)
+  return x.astype(np.int64)
+
+
+def fxp_to_chars(x, Wl):
+  """Converts FXP samples to 'Wl'-bit two's-complement ASCII chars.
+
+  Only the 'Wl' LSBs of each sample are kept, so out-of-range values wrap
+  around like a 'resize' of an unsigned vector in VHDL.
+
+  Args:
+    x: Array-like of samples (see 'fxp_to_int').
+    Wl: Word length in bits (1 to 64).
+
+  Returns:
+    uint8 matrix of size (len(x), Wl) with the chars '0' and '1', MSB first.
+  """
+  if Wl < 1 or Wl > 64:
+    raise ValueError("Wl must be between 1 and 64.")
+  x = fxp_to_int(x)
+
+  # Big-endian bytes of the two's-complement value
+  num_bytes = (Wl + 7) // 8
+  x_bytes = x.astype('>i8').view(np.uint8).reshape(-1, 8)[:, 8-num_bytes:]
+
+  # Byte to chars and take the last 'Wl' bits
+  chars = _BYTE_LUT[x_bytes].reshape(-1, 8*num_bytes)
+  return chars[:, 8*num_bytes-Wl:]
+
+
+def fxp_to_bin_str(x, Wl):
+  """Converts FXP samples to a list of 'Wl'-bit binary strings.
+
+  Args:
+    x: Array-like of samples (see 'fxp_to_int').
+    Wl: Word length in bits.
+
+  Returns:
+    List of strings, e.g. fxp_to_bin_str([-1, 2], 4) = ['1111', '0010'].
+  """
+  chars = np.ascontiguousarray(fxp_to_chars(x, Wl))
+  return [row.tobytes().decode('ascii') for row in chars]
+
+
+def write_fxp_txt_chunks(fileName, chunks, Wl):
+  """Writes chunks of FXP samples in a text file read by the testbenches.
+
+  Args:
+    fileName: Name of the output file.
+    chunks: Iterable of array-like chunks of samples (see 'fxp_to_int').
+    Wl: Word length in bits.
+
+  Returns:
+    The number of samples written in the file.
+  """
+  num_sps = 0
+  with open(fileName, "wb") as file:
+    for x_chunk in chunks:
+      x_chunk = fxp_to_int(x_chunk)
+      if np.size(x_chunk) == 0:
+        continue
+
+      # Chars and newline "\n" at the beginning of each line
+      buf = np.empty((np.size(x_chunk), Wl+1), dtype=np.uint8)
+      buf[:, 0] = ord('\n')
+      buf[:, 1:] = fxp_to_chars(x_chunk, Wl)
+      buf = buf.tobytes()
+
+      # No newline before the first sample
+      if num_sps == 0:
+        buf = buf[1:]
+      file.write(buf)
+      num_sps += np.size(x_chunk)
+  return num_sps
+
+
+def write_fxp_txt(fileName, x, Wl, chunk_sps=CHUNK_SPS):
+  """Writes FXP samples in a text file read by the testbenches.
+
+  Args:
+    fileName: Name of the output file.
+    x: Array-like of samples (see 'fxp_to_int').
+    Wl: Word length in bits.
+    chunk_sps: Number of samples converted and written for each chunk.
+  """
+  x = fxp_to_int(x)
+  write_fxp_txt_chunks(fileName,
+                       (x[i:i+chunk_sps] for i in range(0, np.size(x), chunk_sps)),
+                       Wl)
+
+
+def chars_to_fxp(chars, Wl, signed=True):
+  """Converts a matrix of ASCII chars '0'/'1' to FXP samples.
+
+  Args:
+    chars: uint8 matrix of size (num_sps, Wl) or wider. Only the first 'Wl'
+      columns are used (MSB first).
+    Wl: Word length in bits (1 to 64, up to 63 for unsigned numbers).
+    signed: True for two's-complement numbers, False for unsigned numbers.
+
+  Returns:
+    The samples as a 1-D int64 array.
+  """
+  if Wl < 1 or Wl > 64 or (not signed and Wl == 64):
+    raise ValueError("Wl must be between 1 and 64 (63 for unsigned numbers).")
+
+  bits = chars[:, :Wl] - np.uint8(ord('0'))
+  if np.any(bits > 1):
+    raise ValueError("Only '0' and '1' chars are allowed (e.g. no 'U' or 'X').")
+
+  # Bits to 64-bit big-endian words
+  bits_64 = np.zeros((np.shape(bits)[0], 64), dtype=np.uint8)
+  bits_64[:, 64-Wl:] = bits
+  x = np.packbits(bits_64, axis=1).view('>u8').reshape(-1).astype(np.int64)
+
+  # Sign extension
+  if signed and Wl < 64:
+    x = (x ^ (1 << (Wl-1))) - (1 << (Wl-1))
+  return x
+
+
+def _txt_layout(fileName):
+  """Returns the memory map of a text file, its line length and number of lines.
+
+  The line length includes the newline chars ("\n" or "\r\n"). A first
+  line without newline (one-sample file of write_fxp_txt) has an implicit
+  "\n".
+  """
+  with open(fileName, "rb") as file:
+    line = file.readline()
+  if len(line) == 0:
+    return np.zeros(0, dtype=np.uint8), 1, 0
+  line_len = len(line) if line.endswith(b"\n") else len(line) + 1
+  data = np.memmap(fileName, dtype=np.uint8, mode='r')
+
+  # Ignore the newline and the blank chars at the end of the file
+  num_bytes = np.size(data)
+  while num_bytes > 0 and data[num_bytes-1] in (ord('\n'), ord('\r'), ord(' ')):
+    num_bytes -= 1
+  return data[:num_bytes], line_len, -(-num_bytes // line_len)
+
+
+def iter_fxp_txt(fileName, Wl, signed=True, chunk_sps=CHUNK_SPS):
+  """Reads an FXP text file chunk by chunk.
+
+  All the lines must have the same length, as in the files written by the
+  testbenches. Only the first 'Wl' chars of each line are used.
+
+  Args:
+    fileName: Name of the input file.
+    Wl: Word length in bits.
+    signed: True for two's-complement numbers, False for unsigned numbers.
+    chunk_sps: Number of samples of each chunk.
+
+  Yields:
+    1-D int64 arrays with at most 'chunk_sps' samples.
+  """
+  data, line_len, num_sps = _txt_layout(fileName)
+  if num_sps > 0 and line_len-1 < Wl:
+    raise ValueError("The lines of '%s' have less than %i chars." % (fileName, Wl))
+
+  for i in range(0, num_sps, chunk_sps):
+    n = min(chunk_sps, num_sps-i)
+    rows = data[i*line_len:(i+n)*line_len]
+
+    # The last line has no newline
+    if np.size(rows) < n*line_len:
+      rows_tmp = np.full(n*line_len, ord('\n'), dtype=np.uint8)
+      rows_tmp[:np.size(rows)] = rows
+      rows = rows_tmp
+    rows = rows.reshape(n, line_len)
+
+    if np.any(rows[:, -1] != ord('\n')):
+      raise ValueError("The lines of '%s' do not have the same length." % fileName)
+    yield chars_to_fxp(rows, Wl, signed)
+
+
+def read_fxp_txt(fileName, Wl, signed=True, chunk_sps=CHUNK_SPS):
+  """Reads an FXP text file.
+
+  Args:
+    fileName: Name of the input file.
+    Wl: Word length in bits.
+    signed: True for two's-complement numbers, False for unsigned numbers.
+    chunk_sps: Number of samples decoded for each chunk.
+
+  Returns:
+    The samples as a 1-D int64 array.
+  """
+  num_sps = _txt_layout(fileName)[2]
+  x = np.empty(num_sps, dtype=np.int64)
+  i = 0
+  for x_chunk in iter_fxp_txt(fileName, Wl, signed, chunk_sps):
+    x[i:i+np.size(x_chunk)] = x_chunk
+    i += np.size(x_chunk)
+  return x
@@ -0,0 +1,169 @@
+"""
+fxp_round.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Bit-true models of the rounding blocks of math/rounding, applied to whole
+  NumPy arrays of int64 samples. The functions return the value of the
+  combinational output 'data_out' of the blocks; the synchronous outputs
+  are the same values delayed by the pipeline registers (see
+  rounding_latency).
+
+  The AXI-Stream blocks (axi_round_slv, axi_clip_slv,
+  axi_round_and_clip_slv) register the output of the same logic, so their
+  'o_tdata' has the same values.
+
+  round_slv ROUND_TYPE:
+    0 - Truncation (round to negative infinity)
+    1 - Round to zero
+    2 - Round to nearest (half up). If WIDTH_IN - WIDTH_OUT > 1, the
+        correction is not applied to the maximum positive value.
+    Other values - Truncation
+"""
+
+import numpy as np
+
+from fxp_bin import fxp_wrap
+
+# Pipeline registers of the synchronous outputs
+ROUND_SLV_LATENCY = 1
+CLIP_SLV_LATENCY = 1
+
+# Values of ROUND_TYPE
+ROUND_TRUNC = 0
+ROUND_TO_ZERO = 1
+ROUND_TO_NEAREST = 2
+
+
+def round_slv(x, WIDTH_IN, WIDTH_OUT, ROUND_TYPE=0):
+  """Model of round_slv.vhd.
+
+  Args:
+    x: Array-like of samples, interpreted as WIDTH_IN-bit signed numbers.
+    WIDTH_IN: Input width (up to 64).
+    WIDTH_OUT: Output width (up to WIDTH_IN).
+    ROUND_TYPE: See the module description.
+
+  Returns:
+    int64 array of WIDTH_OUT-bit signed numbers.
+  """
+  if WIDTH_OUT > WIDTH_IN:
+    raise ValueError("WIDTH_OUT must not be greater than WIDTH_IN.")
+  x = fxp_wrap(x, WIDTH_IN)
+  shift = WIDTH_IN - WIDTH_OUT
+  if shift == 0:
+    return x
+
+  # MSBs of the input (arithmetic shift)
+  x_trunc = x >> shift
+
+  if ROUND_TYPE == ROUND_TO_ZERO:
+    # Negative numbers with at least one LSB different from 0
+    corr = (x < 0) & ((x & ((1 << shift) - 1)) != 0)
+  elif ROUND_TYPE == ROUND_TO_NEAREST:
+    # MSB of the discarded bits
+    corr = ((x >> (shift - 1)) & 1) == 1
+    if shift > 1:
+      corr &= x_trunc != (1 << (WIDTH_OUT - 1)) - 1
+  else:
+    corr = np.zeros(np.shape(x), dtype=bool)
+
+  return fxp_wrap(x_trunc + corr, WIDTH_OUT)
+
+
+def clip_slv(x, WIDTH_IN, WIDTH_OUT):
+  """Model of clip_slv.vhd (saturation to WIDTH_OUT bits).
+
+  Args:
+    x: Array-like of samples, interpreted as WIDTH_IN-bit signed numbers.
+    WIDTH_IN: Input width (up to 64).
+    WIDTH_OUT: Output width (up to WIDTH_IN).
+
+  Returns:
+    int64 array of WIDTH_OUT-bit signed numbers.
+  """
+  if WIDTH_OUT > WIDTH_IN:
+    raise ValueError("WIDTH_OUT must not be greater than WIDTH_IN.")
+  x = fxp_wrap(x, WIDTH_IN)
+  if WIDTH_OUT == WIDTH_IN:
+    return x
+  return np.clip(x, -(1 << (WIDTH_OUT - 1)), (1 << (WIDTH_OUT - 1)) - 1)
+
+
+def round_and_clip_slv(x, WIDTH_IN, WIDTH_OUT, CLIP_BITS):
+  """Model of round_and_clip_slv.vhd.
+
+  Round to nearest from WIDTH_IN to WIDTH_OUT + CLIP_BITS bits, then
+  saturation to WIDTH_OUT bits.
+
+  Returns:
+    int64 array of WIDTH_OUT-bit signed numbers.
+  """
+  x = round_slv(x, WIDTH_IN, WIDTH_OUT + CLIP_BITS, ROUND_TYPE=ROUND_TO_NEAREST)
+  return clip_slv(x, WIDTH_OUT + CLIP_BITS, WIDTH_OUT)
+
+
+def round_and_clip_latency(WIDTH_IN, WIDTH_OUT, CLIP_BITS):
+  """Pipeline registers of round_and_clip_slv.vhd (sync outputs)."""
+  if WIDTH_IN == WIDTH_OUT + CLIP_BITS:
+    return CLIP_SLV_LATENCY
+  return ROUND_SLV_LATENCY + CLIP_SLV_LATENCY
+
+
+def axi_round_slv(x, WIDTH_IN, WIDTH_OUT, ROUND_TYPE=0):
+  """Model of axi_round_slv.vhd ('o_tdata')."""
+  return round_slv(x, WIDTH_IN, WIDTH_OUT, ROUND_TYPE)
+
+
+def axi_clip_slv(x, WIDTH_IN, WIDTH_OUT):
+  """Model of axi_clip_slv.vhd ('o_tdata')."""
+  return clip_slv(x, WIDTH_IN, WIDTH_OUT)
+
+
+def axi_round_and_clip_slv(x, WIDTH_IN, WIDTH_OUT, CLIP_BITS):
+  """Model of axi_round_and_clip_slv.vhd ('o_tdata')."""
+  return round_and_clip_slv(x, WIDTH_IN, WIDTH_OUT, CLIP_BITS)
+
+
+# Blocks of math/rounding
+ROUNDING_BLOCKS = ('round_slv', 'axi_round_slv', 'clip_slv', 'axi_clip_slv',
+                   'round_and_clip_slv', 'axi_round_and_clip_slv')
+
+
+def rounding_block(block, x, WIDTH_IN, WIDTH_OUT, CLIP_BITS=0, ROUND_TYPE=0):
+  """Output of a block of math/rounding, with the generics of all the blocks.
+
+  Args:
+    block: Name of the block (see ROUNDING_BLOCKS).
+    x: Array-like of samples, interpreted as WIDTH_IN-bit signed numbers.
+    WIDTH_IN, WIDTH_OUT: Generics of all the blocks.
+    CLIP_BITS: Generic of the round_and_clip blocks (ignored by the others).
+    ROUND_TYPE: Generic of the round blocks (ignored by the others).
+
+  Returns:
+    int64 array of WIDTH_OUT-bit signed numbers.
+  """
+  if block in ('round_slv', 'axi_round_slv'):
+    return round_slv(x, WIDTH_IN, WIDTH_OUT, ROUND_TYPE)
+  if block in ('clip_slv', 'axi_clip_slv'):
+    return clip_slv(x, WIDTH_IN, WIDTH_OUT)
+  if block in ('round_and_clip_slv', 'axi_round_and_clip_slv'):
+    return round_and_clip_slv(x, WIDTH_IN, WIDTH_OUT, CLIP_BITS)
+  raise ValueError('Invalid block. Choose one of %s.' % ', '.join(ROUNDING_BLOCKS))
+
+
+def rounding_latency(block, WIDTH_IN, WIDTH_OUT, CLIP_BITS=0):
+  """Clock cycles between the input and the output of a block of math/rounding.
+
+  For round_slv and clip_slv the output is 'sync_data_out' (enb = '1').
+  """
+  if block in ('round_slv', 'clip_slv'):
+    return 1
+  if block in ('axi_round_slv', 'axi_clip_slv'):
+    return int(WIDTH_IN != WIDTH_OUT)
+  if block == 'round_and_clip_slv':
+    return round_and_clip_latency(WIDTH_IN, WIDTH_OUT, CLIP_BITS)
+  if block == 'axi_round_and_clip_slv':
+    return int(WIDTH_IN != WIDTH_OUT + CLIP_BITS) + int(CLIP_BITS > 0)
+  raise ValueError('Invalid block. Choose one of %s.' % ', '.join(ROUNDING_BLOCKS))
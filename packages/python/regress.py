@@ -0,0 +1,377 @@
+"""
+regress.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Self-checking regression of the testbenches: for each case the stimulus
+  is generated, the testbench (simulator, see sim_tb.py) and the bit-true
+  Python model run concurrently, and the output file of the testbench is
+  compared with the output of the model.
+
+  Cases (REGRESSION_CASES):
+    - fir_filter, fir_decimator, fir_interpolator: input signal of the
+      genSignal.py scripts (random seed of the case), model of the block
+      with the generics of the testbench, comparison of data_out.txt with
+      the model output aligned by the latency of the block: the testbench
+      writes the first samples of the model output, the last ones (latency
+      of the block) are still in the pipeline when the input ends;
+    - round_and_clip_slv, axi_round_and_clip_slv, rom_slv: the testbenches
+      do not write an output file, only the simulation is checked (the
+      rounding blocks are verified exhaustively by rounding_exhaustive.py).
+
+  Each case runs in its own workspace (<work dir>/<case>) with a copy of
+  the testbench folder and the run folder at the depth of the Vivado one,
+  so the cases never share data files and all of them run concurrently
+  (worker pool of '--jobs' cases). The design is compiled once, before the
+  cases, with the incremental flow of sim_tb.py.
+
+  For each case the report gives the status (pass, fail or skip), the
+  number of compared samples, the first mismatch (index, testbench and
+  model values) and the time of each stage (stimulus, simulation, model,
+  compare); '--out' writes it as JSON.
+
+  If the samples differ, the report adds the delay between the testbench
+  and the model output estimated by vec_align.py.
+
+  Without a simulator, '--no-sim' compares the output files already in the
+  testbench folders with the model of their input files. A case is skipped
+  if the number of samples of its output file is not the one its testbench
+  writes for the input file (e.g. data_out.txt of sample_rate_converter is
+  written by both fir_decimator_tb and fir_interpolator_tb).
+
+  Usage:
+    python regress.py --list
+    python regress.py --jobs 4 --seed 7 --out regress.json
+    python regress.py fir_decimator --num-sps 100000
+    python regress.py --no-sim
+  The exit status is 1 if a case fails.
+"""
+
+import argparse
+import concurrent.futures
+import fnmatch
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+import sim_tb
+import toolbox
+import vhdl_deps
+from fxp_io import read_fxp_txt
+from vec_align import estimate_delay
+
+STAGES = ('stimulus', 'sim', 'model', 'compare')
+
+# Input samples and seed of the stimuli
+NUM_SPS = 2048
+SEED = 1
+
+
+# Models of the cases: model output samples written by the testbench (the
+# last ones are in the pipeline when the input ends, see the latency functions)
+
+def _fir_filter_model(m, tb_dir):
+  x = read_fxp_txt(os.path.join(tb_dir, 'data_in.txt'), 16)
+  coeffs = read_fxp_txt(os.path.join(tb_dir, 'coeffs_len64_Wl18.txt'), 18)
+  # Generics of fir_filter_tb.vhd
+  y = m.fir_filter_model(x, coeffs, Width_in=16, Width_coeffs=18, Width_sum=40,
+                         Clip_bits=5, Width_out=18)
+  latency = m.fir_filter_latency(np.size(coeffs), Width_sum=40, Clip_bits=5, Width_out=18)
+  return y[:max(np.size(x) - latency + 1, 0)]
+
+
+def _fir_decimator_model(m, tb_dir):
+  x = read_fxp_txt(os.path.join(tb_dir, 'data_in.txt'), 16)
+  coeffs = read_fxp_txt(os.path.join(tb_dir, 'coeffs_len128_Wl18_M8.txt'), 18)
+  # Generics of fir_decimator_tb.vhd
+  y = m.fir_decimator_model(x, coeffs, DecimFactor=3, Width_in=16, Width_coeffs=18,
+                            Width_sum=40, Width_acc=42, Clip_bits=9, Width_out=18)
+  latency = m.fir_decimator_latency(np.size(coeffs), DecimFactor=3, Width_acc=42,
+                                    Clip_bits=9, Width_out=18)
+  # Output j: input sample 3*(j+1) + latency
+  return y[:max((np.size(x) - 1 - latency) // 3, 0)]
+
+
+def _fir_interpolator_model(m, tb_dir):
+  x = read_fxp_txt(os.path.join(tb_dir, 'data_in.txt'), 16)
+  coeffs = read_fxp_txt(os.path.join(tb_dir, 'coeffs_len128_Wl18_L8.txt'), 18)
+  # Generics of fir_interpolator_tb.vhd
+  y = m.fir_interpolator_model(x, coeffs, InterpFactor=8, Width_in=16, Width_coeffs=18,
+                               Width_sum=40, Clip_bits=7, Width_out=18)
+  return y[:m.fir_interpolator_num_out(np.size(x), np.size(coeffs), InterpFactor=8,
+                                      Width_sum=40, Clip_bits=7, Width_out=18)]
+
+
+# Case: (testbench, testbench folder, stimulus command, model command, model,
+#        output file, Width_out)
+# The stimulus is the gen_signal function of its command (see toolbox.py), the
+# model is called with the module of its command and the testbench folder.
+REGRESSION_CASES = {
+  'fir_filter':             ('fir_filter_tb', 'digital_signal_processing/filters/testbench',
+                             'fir-signal', 'fir-model', _fir_filter_model, 'data_out.txt', 18),
+  'fir_decimator':          ('fir_decimator_tb', 'digital_signal_processing/sample_rate_converter/testbench',
+                             'src-signal', 'decim-model', _fir_decimator_model, 'data_out.txt', 18),
+  'fir_interpolator':       ('fir_interpolator_tb', 'digital_signal_processing/sample_rate_converter/testbench',
+                             'src-signal', 'interp-model', _fir_interpolator_model, 'data_out.txt', 18),
+  'round_and_clip_slv':     ('round_and_clip_slv_tb', 'math/rounding/testbench',
+                             None, None, None, None, None),
+  'axi_round_and_clip_slv': ('axi_round_and_clip_slv_tb', 'math/rounding/testbench',
+                             None, None, None, None, None),
+  'rom_slv':                ('rom_slv_tb', 'memory/rom/testbench',
+                             None, None, None, None, None),
+}
+
+
+def load_modules(cases):
+  """Modules of the stimulus and model commands of the cases.
+
+  They are imported before the workers start: the genSignal.py scripts of
+  two folders have the same module name (see toolbox.load_command).
+  """
+  modules = {}
+  for c in cases:
+    for command in REGRESSION_CASES[c][2:4]:
+      if command is not None and command not in modules:
+        modules[command] = toolbox.load_command(command)
+  return modules
+
+
+def select_cases(patterns):
+  """Cases whose name matches one of the patterns (None: all)."""
+  if not patterns:
+    return list(REGRESSION_CASES)
+  cases = [c for c in REGRESSION_CASES if any(fnmatch.fnmatch(c, p) for p in patterns)]
+  if not cases:
+    raise ValueError("No case matches %s. Use --list to show the cases." % ' '.join(patterns))
+  return cases
+
+
+def compare_outputs(dut, ref):
+  """Compares the testbench output with the aligned model output.
+
+  Args:
+    dut: Testbench output.
+    ref: Model output samples written by the testbench (see the models of
+      REGRESSION_CASES).
+
+  Returns:
+    Dictionary with n (compared samples), mismatches, first (index,
+    testbench value, model value) or None, lengths (True if the numbers of
+    samples are equal) and message. If the samples differ, the message
+    gives the delay of the testbench output estimated by vec_align.py.
+  """
+  dut = np.asarray(dut, dtype=np.int64)
+  ref = np.asarray(ref, dtype=np.int64)
+  if dut.size == 0:
+    return {'n': 0, 'mismatches': 0, 'first': None, 'lengths': ref.size == 0,
+            'message': 'no output samples'}
+  n = min(dut.size, ref.size)
+  diff = np.flatnonzero(dut[:n] != ref[:n])
+  res = {'n': int(n), 'mismatches': int(diff.size), 'first': None,
+         'lengths': dut.size == ref.size, 'message': ''}
+  msgs = []
+  if dut.size != ref.size:
+    msgs.append("%i samples, the testbench writes %i" % (dut.size, ref.size))
+  if diff.size:
+    i = int(diff[0])
+    res['first'] = (i, int(dut[i]), int(ref[i]))
+    msgs.append("%i mismatches, first at %i: %i (model %i)" % (diff.size, i, dut[i], ref[i]))
+    if n >= 2:
+      d = estimate_delay(ref, dut)
+      msgs.append("estimated delay %i (corr %.3f)" % (d['lag'], d['corr']))
+  res['message'] = '; '.join(msgs)
+  return res
+
+
+def _prepare_workspace(ws, folder, root):
+  """Copies the data files of the testbench folder (not the outputs) in ws."""
+  src = os.path.join(root, folder)
+  dst = os.path.join(ws, folder)
+  if os.path.isdir(dst):
+    shutil.rmtree(dst)
+  os.makedirs(dst)
+  for fileName in os.listdir(src):
+    path = os.path.join(src, fileName)
+    if os.path.isfile(path) and not fileName.lower().endswith(('.vhd', '.vhdl')) \
+       and not fileName.startswith('data_out'):
+      shutil.copy2(path, dst)
+  return dst
+
+
+def run_case(case, sim, lib, tb_file, work_dir, modules, num_sps=NUM_SPS, seed=SEED,
+             stop_time=sim_tb.STOP_TIME, timeout=sim_tb.TIMEOUT, root=sim_tb.ROOT):
+  """Runs the stages of a case.
+
+  Args:
+    case: Name of the case (see REGRESSION_CASES).
+    sim: 'ghdl', 'nvc' or None (no simulation: the files of the testbench
+      folder in root are compared).
+    lib: Library compiled by sim_tb.compile_files.
+    tb_file: VHDL file of the testbench (relative to root).
+    work_dir: Folder of the workspaces.
+    modules: Modules of the commands (see load_modules).
+    num_sps, seed: Input samples and seed of the stimulus.
+
+  Returns:
+    Dictionary with case, tb, status ('pass', 'fail' or 'skip'), n,
+    mismatches, first, message, times (seconds of each stage) and log.
+  """
+  top, folder, stimulus, model_cmd, model, out_file, Width_out = REGRESSION_CASES[case]
+  res = {'case': case, 'tb': top, 'status': 'pass', 'n': 0, 'mismatches': 0,
+         'first': None, 'message': '', 'times': {}, 'log': None}
+  times = res['times']
+
+  if sim is None:
+    if model is None:
+      res.update(status='skip', message='no output file')
+      return res
+    tb_dir = os.path.join(root, folder)
+  else:
+    ws = os.path.join(work_dir, case)
+    tb_dir = _prepare_workspace(ws, folder, root)
+    if stimulus is not None:
+      t0 = time.perf_counter()
+      modules[stimulus].gen_signal(numSps=num_sps, seed=seed, fileName=os.path.join(tb_dir, 'data_in.txt'))
+      times['stimulus'] = time.perf_counter() - t0
+
+  # Simulation and model run concurrently (the model in a thread)
+  ref = None
+  with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+    future = None
+    if model is not None:
+      t_model = time.perf_counter()
+      future = pool.submit(model, modules[model_cmd], tb_dir)
+    if sim is not None:
+      r = sim_tb.run_testbench(sim, top, os.path.join(folder, os.path.basename(tb_file)),
+                               ws, os.path.join(ws, 'sim_build'), stop_time, timeout, lib)
+      times['sim'] = r['time']
+      res['log'] = r['log']
+      if r['status'] != 'pass':
+        res.update(status='fail', message='simulation failed')
+    if future is not None:
+      ref = future.result()
+      times['model'] = time.perf_counter() - t_model
+
+  if model is None or res['status'] == 'fail':
+    return res
+  t0 = time.perf_counter()
+  dut_file = os.path.join(tb_dir, out_file)
+  if not os.path.isfile(dut_file):
+    res.update(status='fail', message='no output file %s' % out_file)
+    return res
+  dut = read_fxp_txt(dut_file, Width_out)
+  if sim is None and np.size(dut) != np.size(ref):
+    # Output file of another testbench, or of another input file
+    res.update(status='skip', message='%s not written by %s for data_in.txt '
+               '(%i samples, the testbench writes %i)' % (out_file, top, np.size(dut), np.size(ref)))
+    return res
+  cmp = compare_outputs(dut, ref)
+  times['compare'] = time.perf_counter() - t0
+  lengths = cmp.pop('lengths')
+  res.update(cmp)
+  if cmp['n'] == 0 or cmp['mismatches'] or not lengths:
+    res['status'] = 'fail'
+  return res
+
+
+def format_result(res):
+  times = ' '.join("%8.2f" % res['times'][s] if s in res['times'] else "%8s" % '-'
+                   for s in STAGES)
+  return "%-24s %-4s %8i %s  %s" % (res['case'], res['status'], res['n'], times, res['message'])
+
+
+def run_regression(cases, sim, work_dir, jobs=None, num_sps=NUM_SPS, seed=SEED,
+                   stop_time=sim_tb.STOP_TIME, timeout=sim_tb.TIMEOUT, force=False, log=print):
+  """Compiles the testbenches of the cases and runs the cases in a worker pool.
+
+  Returns:
+    List of the results of run_case, in the order of cases.
+  """
+  units = vhdl_deps.scan_units(sim_tb.ROOT)
+  tbs = sim_tb.find_testbenches(units)
+  failed = set()
+  lib = None
+  if sim is not None:
+    files = vhdl_deps.closure([tbs[REGRESSION_CASES[c][0]] for c in cases], units)
+    _, failed = sim_tb.compile_files(sim, files, units, force=force, log=log)
+    lib = sim_tb.lib_dir(sim)
+
+  modules = load_modules(cases)
+
+  def worker(case):
+    top = REGRESSION_CASES[case][0]
+    if vhdl_deps.closure([tbs[top]], units) & failed:
+      res = {'case': case, 'tb': top, 'status': 'fail', 'n': 0, 'mismatches': 0,
+             'first': None, 'message': 'compile error', 'times': {}, 'log': None}
+    else:
+      res = run_case(case, sim, lib, tbs[top], work_dir, modules, num_sps, seed, stop_time,
+                     timeout)
+    log(format_result(res))
+    return res
+
+  log("%-24s %-4s %8s %s" % ('case', '', 'samples', ' '.join("%8s" % s for s in STAGES)))
+  with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+    return list(pool.map(worker, cases))
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Self-checking regression of the testbenches against the bit-true models.')
+  parser.add_argument('cases', nargs='*', help="case names or patterns, default: all")
+  parser.add_argument('--list', action='store_true')
+  parser.add_argument('--sim', choices=sim_tb.SIMULATORS, default=None, help='default: the first one in PATH')
+  parser.add_argument('--no-sim', action='store_true',
+                      help='compare the output files already in the testbench folders')
+  parser.add_argument('--jobs', '-j', type=int, default=None, help='default: number of cores')
+  parser.add_argument('--num-sps', type=int, default=NUM_SPS)
+  parser.add_argument('--seed', type=int, default=SEED)
+  parser.add_argument('--stop-time', default=sim_tb.STOP_TIME)
+  parser.add_argument('--timeout', type=float, default=sim_tb.TIMEOUT, help='timeout of each simulation [s]')
+  parser.add_argument('--force', action='store_true', help='compile all the files again')
+  parser.add_argument('--work-dir', default=None,
+                      help='folder of the workspaces (default: sim_build/regress)')
+  parser.add_argument('--out', default=None, help='JSON file of the results')
+  args = parser.parse_args(argv)
+
+  cases = select_cases(args.cases)
+  if args.list:
+    for c in cases:
+      top, folder, _, _, model, _, _ = REGRESSION_CASES[c]
+      print("%-24s %-26s %s%s" % (c, top, folder, '' if model else ' (simulation only)'))
+    return 0
+
+  sim = None
+  if not args.no_sim:
+    sim = args.sim or sim_tb.find_simulator()
+    if sim is None or shutil.which(sim) is None:
+      raise ValueError("No simulator found in PATH (%s), use --no-sim to check the existing outputs."
+                       % ', '.join(sim_tb.SIMULATORS if args.sim is None else [args.sim]))
+  work_dir = args.work_dir or os.path.join(sim_tb.BUILD_DIR, 'regress')
+  os.makedirs(work_dir, exist_ok=True)
+
+  t0 = time.perf_counter()
+  stop_time = None if args.stop_time.lower() == 'none' else args.stop_time
+  results = run_regression(cases, sim, work_dir, args.jobs, args.num_sps, args.seed,
+                           stop_time, args.timeout, args.force)
+  elapsed = time.perf_counter() - t0
+
+  n_fail = sum(r['status'] == 'fail' for r in results)
+  n_skip = sum(r['status'] == 'skip' for r in results)
+  print("%i passed, %i failed, %i skipped (%.1f s)" %
+        (len(results) - n_fail - n_skip, n_fail, n_skip, elapsed))
+  for r in results:
+    if r['status'] == 'fail' and r['log']:
+      print("  %s: %s" % (r['case'], r['log']))
+  if args.out is not None:
+    with open(args.out, 'w') as fid:
+      json.dump({'sim': sim, 'num_sps': args.num_sps, 'seed': args.seed, 'time': elapsed,
+                 'results': results}, fid, indent=1)
+  return 1 if n_fail else 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
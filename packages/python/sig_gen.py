@@ -0,0 +1,69 @@
+"""
+sig_gen.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Generation of the test signals (sum of tones plus Gaussian noise) block by
+  block. The phase of each tone and the state of the random generator are
+  kept across the blocks, so the concatenation of the blocks is the same
+  signal generated in one step. Each block is quantized and written to disk
+  before the next one is generated, so the memory usage does not depend on
+  the length of the signal.
+"""
+
+import numpy as np
+
+from fxp_io import CHUNK_SPS, fxp_to_int
+
+
+def tone_noise_blocks(num_sps, Fs, tones, noise_std, block_sps=CHUNK_SPS, seed=None):
+  """Yields blocks of a sum of cosines plus Gaussian noise.
+
+  x[n] = sum_k(amp_k * cos(2*pi*fc_k/Fs*n)) + noise[n]
+
+  Args:
+    num_sps: Number of samples of the signal.
+    Fs: Sampling frequency.
+    tones: List of (amp, fc) pairs.
+    noise_std: Standard deviation of the noise.
+    block_sps: Number of samples of each block.
+    seed: Seed of the random generator (None for a random seed).
+
+  Yields:
+    1-D float64 arrays with at most 'block_sps' samples.
+  """
+  rng = np.random.default_rng(seed)
+
+  # Normalized frequencies and phases (in cycles) at the start of the block
+  f_norm = np.array([fc/Fs for amp, fc in tones], dtype=np.float64)
+  amp = np.array([amp for amp, fc in tones], dtype=np.float64)
+  phase = np.zeros(np.size(f_norm))
+
+  for i in range(0, num_sps, block_sps):
+    n = np.arange(min(block_sps, num_sps-i))
+
+    x = rng.normal(0, noise_std, size=np.size(n))
+    for k in range(np.size(f_norm)):
+      x += amp[k] * np.cos(2*np.pi*(phase[k] + f_norm[k]*n))
+
+    # Phase continuity (modulo 1 to keep the precision on long signals)
+    phase = np.mod(phase + f_norm*np.size(n), 1.0)
+    yield x
+
+
+def fxp_blocks(blocks, Wl):
+  """Quantizes blocks of samples with amplitude between -1 and 1.
+
+  The samples are multiplied by 2**(Wl-1)-1 and truncated toward zero.
+
+  Args:
+    blocks: Iterable of float arrays.
+    Wl: Word length in bits.
+
+  Yields:
+    1-D int64 arrays.
+  """
+  A = 2**(Wl-1)-1
+  for x in blocks:
+    yield fxp_to_int(A*x)
@@ -0,0 +1,388 @@
+"""
+sim_tb.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Incremental and parallel simulation of the testbenches with an
+  open-source simulator (GHDL or NVC), without Vivado (see sim_tb.tcl).
+
+  Compilation:
+    - only the files needed by the selected testbenches are compiled
+      (dependency closure, see vhdl_deps.py), in dependency order, in one
+      library per simulator (sim_build/<simulator>/lib);
+    - a file is compiled again only if its key changed: the key is the hash
+      of its content and of the keys of the files it depends on, so a change
+      propagates to all the dependent files. The keys are stored in
+      sim_build/<simulator>/lib/stamps.json (the library is rebuilt if the
+      simulator or the options change);
+    - a file that fails is reported, and the testbenches that need it are
+      not run.
+
+  Simulation:
+    - the testbenches (entities of the *_tb.vhd files) are selected by name
+      patterns, or by the files changed since a git revision ('--since':
+      only the testbenches affected by the change run);
+    - the testbenches of the same folder read and write the same data files,
+      so they run in sequence; the folders run concurrently ('--jobs');
+    - each testbench runs in sim_build/<simulator>/runs/<tb>/xsim, which has
+      the depth of the Vivado run folder under the repository root, and
+      ../testbench is a link to the testbench folder: the relative paths of
+      the data files resolve as in Vivado;
+    - a testbench passes if it stops with the end message of the toolbox
+      testbenches ("Replace this with your test cases" / "FINISH!"), with
+      finish or at the stop time, and no error or failure is reported.
+      The log is <run folder>/sim.log.
+
+  Usage:
+    python sim_tb.py --list
+    python sim_tb.py                      (all the testbenches)
+    python sim_tb.py 'fir_*' lfsr_gal_tb --jobs 4 --sim nvc
+    python sim_tb.py --since HEAD~1       (testbenches affected by a commit)
+    python sim_tb.py --dry-run 'delay_*'  (commands only)
+  The exit status is 1 if a file does not compile or a testbench fails.
+"""
+
+import argparse
+import concurrent.futures
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+import vhdl_deps
+
+# Root folder of the repository and build folder of the simulations
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
+BUILD_DIR = os.path.join(ROOT, 'sim_build')
+
+SIMULATORS = ('ghdl', 'nvc')
+
+# Options of the simulators (VHDL-2008)
+GHDL_OPTIONS = ['--std=08', '-frelaxed-rules']
+GHDL_RUN_OPTIONS = ['--ieee-asserts=disable-at-0']
+NVC_OPTIONS = ['--std=2008']
+
+# Stop time of the simulation (testbenches that never stop, e.g. cordic_ln_tb)
+# and timeout of each simulation [s]
+STOP_TIME = '100ms'
+TIMEOUT = 3600
+
+# Messages that end the toolbox testbenches (report ... severity failure)
+END_MESSAGES = ('Replace this with your test cases', 'FINISH!')
+
+# Errors and failures in the simulator logs (GHDL and NVC)
+ERROR_RE = re.compile(r'\((?:assertion|report) (?:error|failure)\)|\*\* (?:error|failure|fatal):|\berror:',
+                      re.IGNORECASE)
+
+
+def find_simulator():
+  """First simulator of SIMULATORS found in PATH (None: none)."""
+  for sim in SIMULATORS:
+    if shutil.which(sim):
+      return sim
+  return None
+
+
+def lib_dir(sim, build_dir=BUILD_DIR):
+  return os.path.join(build_dir, sim, 'lib')
+
+
+def analyze_cmd(sim, lib, fileName):
+  """Command that compiles a file in the work library."""
+  if sim == 'ghdl':
+    return ['ghdl', '-a'] + GHDL_OPTIONS + ['--workdir=' + lib, fileName]
+  if sim == 'nvc':
+    return ['nvc'] + NVC_OPTIONS + ['--work=' + os.path.join(lib, 'work'), '-a', fileName]
+  raise ValueError("Invalid simulator '%s'." % sim)
+
+
+def run_cmd(sim, lib, top, stop_time=STOP_TIME):
+  """Command that elaborates and runs a testbench (stop_time None: no limit)."""
+  if sim == 'ghdl':
+    cmd = ['ghdl', '--elab-run'] + GHDL_OPTIONS + ['--workdir=' + lib, top] + GHDL_RUN_OPTIONS
+  elif sim == 'nvc':
+    cmd = ['nvc'] + NVC_OPTIONS + ['--work=' + os.path.join(lib, 'work'),
+                                   '-e', '--jit', '--no-save', top, '-r']
+  else:
+    raise ValueError("Invalid simulator '%s'." % sim)
+  if stop_time is not None:
+    cmd.append('--stop-time=' + stop_time.replace(' ', ''))
+  return cmd
+
+
+def find_testbenches(units):
+  """Dictionary {testbench: file} of the entities of the *_tb.vhd files."""
+  tbs = {}
+  for f, (defines, _) in units.items():
+    if vhdl_deps.is_testbench(f):
+      for kind, name in defines:
+        if kind == 'entity':
+          tbs[name] = f
+  return dict(sorted(tbs.items()))
+
+
+def select_testbenches(tbs, patterns):
+  """Testbenches whose name matches one of the patterns (None: all)."""
+  if not patterns:
+    return dict(tbs)
+  selected = {tb: f for tb, f in tbs.items()
+              if any(fnmatch.fnmatch(tb, p.lower()) for p in patterns)}
+  if not selected:
+    raise ValueError("No testbench matches %s. Use --list to show the testbenches." %
+                     ' '.join(patterns))
+  return selected
+
+
+def file_keys(root, files, deps):
+  """Key of each file: hash of its content and of the keys of its dependencies."""
+  content = {}
+  for f in files:
+    with open(os.path.join(root, f), 'rb') as fid:
+      content[f] = hashlib.sha1(fid.read()).hexdigest()
+  keys = {}
+  for f in vhdl_deps.compile_order(files, deps):
+    h = hashlib.sha1(content[f].encode())
+    for d in sorted(deps[f] & set(files)):
+      h.update(keys[d].encode())
+    keys[f] = h.hexdigest()
+  return keys
+
+
+def load_stamps(lib, options):
+  """Keys of the compiled files ({} if the options of the library changed)."""
+  fileName = os.path.join(lib, 'stamps.json')
+  if not os.path.isfile(fileName):
+    return {}
+  with open(fileName) as fid:
+    stamps = json.load(fid)
+  if stamps.get('options') != options:
+    return {}
+  return stamps.get('files', {})
+
+
+def save_stamps(lib, options, files):
+  os.makedirs(lib, exist_ok=True)
+  with open(os.path.join(lib, 'stamps.json'), 'w') as fid:
+    json.dump({'options': options, 'files': files}, fid, indent=1, sort_keys=True)
+
+
+def compile_files(sim, files, units, root=ROOT, build_dir=BUILD_DIR, force=False,
+                  dry_run=False, log=print):
+  """Compiles the files that changed, in dependency order.
+
+  Args:
+    sim: 'ghdl' or 'nvc'.
+    files: Files to compile (with their dependencies, see vhdl_deps.closure).
+    units: Units of the tree (see vhdl_deps.scan_units).
+    force: True compiles all the files.
+    dry_run: True prints the commands only.
+
+  Returns:
+    Tuple (compiled, failed): files compiled and files not compiled (failed
+    or depending on a failed file).
+  """
+  lib = lib_dir(sim, build_dir)
+  options = [sim] + (GHDL_OPTIONS if sim == 'ghdl' else NVC_OPTIONS)
+  deps = vhdl_deps.file_deps(units)
+  order = vhdl_deps.compile_order(files, deps)
+  keys = file_keys(root, order, deps)
+  stamps = {} if force else load_stamps(lib, options)
+  if not stamps and not dry_run and os.path.isdir(lib):
+    shutil.rmtree(lib)
+  if not dry_run:
+    os.makedirs(lib, exist_ok=True)
+    if sim == 'nvc':
+      os.makedirs(os.path.join(lib, 'work'), exist_ok=True)
+
+  compiled = []
+  failed = set()
+  for f in order:
+    if stamps.get(f) == keys[f]:
+      continue
+    if deps[f] & failed:
+      failed.add(f)
+      continue
+    cmd = analyze_cmd(sim, lib, os.path.join(root, f))
+    if dry_run:
+      log(' '.join(cmd))
+      compiled.append(f)
+      continue
+    log("compile %s" % f)
+    proc = subprocess.run(cmd, cwd=lib, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True)
+    if proc.returncode != 0:
+      log(proc.stdout.rstrip())
+      failed.add(f)
+      stamps.pop(f, None)
+    else:
+      stamps[f] = keys[f]
+      compiled.append(f)
+  if not dry_run:
+    save_stamps(lib, options, stamps)
+  return compiled, failed
+
+
+def run_dir(sim, top, build_dir=BUILD_DIR):
+  """Run folder of a testbench (depth of the Vivado folder prj_tb/.../xsim)."""
+  return os.path.join(build_dir, sim, 'runs', top, 'xsim')
+
+
+def prepare_run_dir(sim, top, tb_file, root=ROOT, build_dir=BUILD_DIR):
+  """Creates the run folder and the link ../testbench to the testbench folder."""
+  path = run_dir(sim, top, build_dir)
+  os.makedirs(path, exist_ok=True)
+  link = os.path.join(os.path.dirname(path), 'testbench')
+  target = os.path.join(root, os.path.dirname(tb_file))
+  if os.path.islink(link):
+    if os.path.realpath(link) == os.path.realpath(target):
+      return path
+    os.remove(link)
+  if not os.path.exists(link):
+    os.symlink(target, link, target_is_directory=True)
+  return path
+
+
+def sim_status(returncode, log_text):
+  """'pass' or 'fail' of a simulation from its exit status and its log.
+
+  The end message stops the simulation with a failure: its line (and the
+  final 'simulation failed' of GHDL) is not an error.
+  """
+  ended = any(m in log_text for m in END_MESSAGES)
+  errors = [line for line in log_text.splitlines()
+            if ERROR_RE.search(line) and not any(m in line for m in END_MESSAGES)
+            and not (ended and 'simulation failed' in line)]
+  if errors or (returncode != 0 and not ended):
+    return 'fail'
+  return 'pass'
+
+
+def run_testbench(sim, top, tb_file, root=ROOT, build_dir=BUILD_DIR, stop_time=STOP_TIME,
+                  timeout=TIMEOUT, lib=None):
+  """Elaborates and runs a testbench.
+
+  The data paths of the testbench resolve in the parent folder of build_dir
+  and ../testbench is a link to the testbench folder of root: a copy of the
+  testbench folders (root, build_dir=root/sim_build) is a workspace, with
+  the library compiled in another folder (lib, default: the library of
+  build_dir).
+
+  Returns:
+    Dictionary with tb, status ('pass' or 'fail'), returncode, time [s] and
+    log (file name).
+  """
+  path = prepare_run_dir(sim, top, tb_file, root, build_dir)
+  cmd = run_cmd(sim, lib or lib_dir(sim, build_dir), top, stop_time)
+  logName = os.path.join(path, 'sim.log')
+  t0 = time.perf_counter()
+  try:
+    proc = subprocess.run(cmd, cwd=path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True, timeout=timeout)
+    returncode, text = proc.returncode, proc.stdout
+  except subprocess.TimeoutExpired as e:
+    returncode = None
+    text = (e.stdout or b'').decode(errors='replace') if isinstance(e.stdout, bytes) else (e.stdout or '')
+    text += "\nerror: timeout (%i s)\n" % timeout
+  elapsed = time.perf_counter() - t0
+  with open(logName, 'w') as fid:
+    fid.write(' '.join(cmd) + '\n' + text)
+  return {'tb': top, 'status': sim_status(returncode, text) if returncode is not None else 'fail',
+          'returncode': returncode, 'time': elapsed, 'log': logName}
+
+
+def run_testbenches(sim, tbs, root=ROOT, build_dir=BUILD_DIR, stop_time=STOP_TIME,
+                    timeout=TIMEOUT, jobs=None, log=print):
+  """Runs the testbenches, the folders concurrently (jobs: number of workers).
+
+  Returns:
+    List of the results of run_testbench, in the order of tbs.
+  """
+  groups = {}
+  for top, f in tbs.items():
+    groups.setdefault(os.path.dirname(f), []).append(top)
+
+  def run_group(tops):
+    res = []
+    for top in tops:
+      r = run_testbench(sim, top, tbs[top], root, build_dir, stop_time, timeout)
+      log("%-28s %-4s %8.2f s" % (top, r['status'], r['time']))
+      res.append(r)
+    return res
+
+  jobs = jobs or os.cpu_count() or 1
+  results = {}
+  with concurrent.futures.ThreadPoolExecutor(max_workers=min(jobs, len(groups) or 1)) as pool:
+    for res in pool.map(run_group, groups.values()):
+      for r in res:
+        results[r['tb']] = r
+  return [results[top] for top in tbs]
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Incremental and parallel simulation of the testbenches.')
+  parser.add_argument('patterns', nargs='*', help="testbench names or patterns (e.g. 'fir_*'), default: all")
+  parser.add_argument('--sim', choices=SIMULATORS, default=None, help='default: the first one in PATH')
+  parser.add_argument('--since', default=None,
+                      help='only the testbenches affected by the files changed since a git revision')
+  parser.add_argument('--list', action='store_true', help='list the testbenches and their files')
+  parser.add_argument('--jobs', '-j', type=int, default=None, help='default: number of cores')
+  parser.add_argument('--stop-time', default=STOP_TIME, help="e.g. '10ms', 'none': no limit")
+  parser.add_argument('--timeout', type=float, default=TIMEOUT, help='timeout of each simulation [s]')
+  parser.add_argument('--force', action='store_true', help='compile all the files again')
+  parser.add_argument('--compile-only', action='store_true')
+  parser.add_argument('--dry-run', action='store_true', help='print the compile commands only')
+  parser.add_argument('--build-dir', default=BUILD_DIR)
+  args = parser.parse_args(argv)
+
+  units = vhdl_deps.scan_units(ROOT)
+  tbs = select_testbenches(find_testbenches(units), args.patterns)
+  if args.since is not None:
+    affected = vhdl_deps.affected_testbenches(vhdl_deps.git_changed_files(ROOT, args.since), units)
+    tbs = {top: f for top, f in tbs.items() if f in affected}
+    if not tbs:
+      print("No testbench affected by the changes since %s." % args.since)
+      return 0
+  if args.list:
+    for top, f in tbs.items():
+      print("%-28s %s" % (top, f))
+    return 0
+
+  sim = args.sim or find_simulator()
+  if sim is None:
+    raise ValueError("No simulator found in PATH (%s)." % ', '.join(SIMULATORS))
+  if not args.dry_run and shutil.which(sim) is None:
+    raise ValueError("Simulator '%s' not found in PATH." % sim)
+
+  files = vhdl_deps.closure(tbs.values(), units)
+  compiled, failed = compile_files(sim, files, units, ROOT, args.build_dir, args.force,
+                                   args.dry_run)
+  print("%i files compiled, %i up to date, %i failed" %
+        (len(compiled), len(files) - len(compiled) - len(failed), len(failed)))
+  if args.dry_run or args.compile_only:
+    return 1 if failed else 0
+
+  runnable = {top: f for top, f in tbs.items()
+              if not vhdl_deps.closure([f], units) & failed}
+  for top in tbs:
+    if top not in runnable:
+      print("%-28s not run (compile error)" % top)
+  stop_time = None if args.stop_time.lower() == 'none' else args.stop_time
+  results = run_testbenches(sim, runnable, ROOT, args.build_dir, stop_time, args.timeout,
+                            args.jobs)
+
+  n_fail = sum(r['status'] != 'pass' for r in results) + len(tbs) - len(runnable)
+  print("%i passed, %i failed" % (len(tbs) - n_fail, n_fail))
+  for r in results:
+    if r['status'] != 'pass':
+      print("  %s: %s" % (r['tb'], r['log']))
+  return 1 if n_fail else 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+toolbox.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Single command line entry point of the Python scripts of the repository.
+
+  Each command is the main(argv) function of a script; only the module of
+  the selected command is imported, when the command is run (load_command).
+  The start-up loads only the standard library: numpy is imported by the
+  module of the command and matplotlib only if a figure is requested (see
+  fig_out.py), so 'list' and '-h' are immediate and the commands run on
+  headless machines.
+
+  Batch flows can call run(command, argv) in the same process (e.g. to
+  generate hundreds of vector sets without a start-up for each one).
+
+  Usage:
+    python toolbox.py list
+    python toolbox.py fir-signal --seed 1 --num-sps 4096 --file data_in.txt
+    python toolbox.py fir-coeffs --optimize-wl --out-dir ../../digital_signal_processing/filters/testbench
+    python toolbox.py <command> -h
+"""
+
+import importlib
+import os
+import sys
+
+# Root folder of the repository
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../..")
+
+# Command: (folder, module, description)
+COMMANDS = {
+  'fir-coeffs':    ('digital_signal_processing/filters/python', 'genFIRCoeffs',
+                    'coefficients of fir_filter_tb'),
+  'fir-signal':    ('digital_signal_processing/filters/python', 'genSignal',
+                    'input signal of fir_filter_tb'),
+  'fir-read':      ('digital_signal_processing/filters/python', 'readSignal',
+                    'output signal of fir_filter_tb'),
+  'fir-model':     ('digital_signal_processing/filters/python', 'fir_filter_model',
+                    'bit-true model of fir_filter'),
+  'decim-coeffs':  ('digital_signal_processing/sample_rate_converter/python', 'genFIRCoeffsDecimator',
+                    'coefficients of fir_decimator_tb'),
+  'interp-coeffs': ('digital_signal_processing/sample_rate_converter/python', 'genFIRCoeffsInterpolator',
+                    'coefficients of fir_interpolator_tb'),
+  'src-signal':    ('digital_signal_processing/sample_rate_converter/python', 'genSignal',
+                    'input signal of the sample rate converter testbenches'),
+  'src-read':      ('digital_signal_processing/sample_rate_converter/python', 'readSignal',
+                    'output signal of the sample rate converter testbenches'),
+  'decim-model':   ('digital_signal_processing/sample_rate_converter/python', 'fir_decimator_model',
+                    'bit-true model of fir_decimator'),
+  'interp-model':  ('digital_signal_processing/sample_rate_converter/python', 'fir_interpolator_model',
+                    'bit-true model of fir_interpolator'),
+  'lagrange':      ('digital_signal_processing/farrow_filter/python', 'lagrange_main',
+                    'Lagrange Farrow filter design'),
+  'wls':           ('digital_signal_processing/farrow_filter/python', 'wls_deng_main',
+                    'WLS Farrow filter design'),
+  'farrow-sweep':  ('digital_signal_processing/farrow_filter/python', 'farrow_sweep',
+                    'parameter sweep of the Farrow designs'),
+  'rom-counter':   ('memory/rom/python', 'genCounter',
+                    'counter of the ROM testbench'),
+  'rounding':      ('math/rounding/python', 'rounding_exhaustive',
+                    'exhaustive verification of the rounding blocks'),
+  'cordic-sqrt':   ('math/square_root/cordic/python', 'cordic_sqrt',
+                    'CORDIC square root model and error sweep'),
+  'cordic-ln':     ('math/natural_log/cordic/python', 'cordic_ln',
+                    'CORDIC natural logarithm model and error sweep'),
+  'dds-rom':       ('math/waves/python', 'dds_rom',
+                    'ROM images and SFDR of the DDS blocks'),
+  'lfsr-stats':    ('random_generator/python', 'lfsr_stats',
+                    'statistics and period of the LFSR outputs'),
+  'fir-growth':    ('packages/python', 'fxp_growth',
+                    'bit growth and Clip_bits of the FIR blocks'),
+  'bench':         ('packages/python', 'bench',
+                    'benchmark suite with baseline comparison'),
+  'vhdl-deps':     ('packages/python', 'vhdl_deps',
+                    'files to recompile and testbenches affected by a change'),
+  'sim':           ('packages/python', 'sim_tb',
+                    'incremental and parallel GHDL/NVC simulation of the testbenches'),
+  'regress':       ('packages/python', 'regress',
+                    'self-checking regression of the testbenches against the models'),
+  'compare':       ('packages/python', 'vec_compare',
+                    'streaming comparison of two vector files (SNR, ENOB, SFDR)'),
+  'align':         ('packages/python', 'vec_align',
+                    'delay between two vector files (FFT cross-correlation)'),
+}
+
+
+def load_command(command):
+  """Imports the module of a command (its folder is added to sys.path)."""
+  if command not in COMMANDS:
+    raise ValueError("Invalid command '%s'. Use 'list' to show the commands." % command)
+  folder, module, _ = COMMANDS[command]
+  path = os.path.normpath(os.path.join(ROOT, folder))
+  if path not in sys.path:
+    sys.path.insert(0, path)
+
+  # Modules with the same name in different folders (e.g. genSignal)
+  loaded = sys.modules.get(module)
+  if loaded is not None and os.path.dirname(os.path.abspath(loaded.__file__)) != path:
+    del sys.modules[module]
+    sys.path.remove(path)
+    sys.path.insert(0, path)
+  return importlib.import_module(module)
+
+
+def run(command, argv=()):
+  """Runs a command in this process.
+
+  Args:
+    command: Name of the command (see COMMANDS).
+    argv: Arguments of the command.
+
+  Returns:
+    Exit status of the command (0: no error).
+  """
+  main = load_command(command).main
+  prog = sys.argv[0]
+  sys.argv[0] = "toolbox.py %s" % command
+  try:
+    ret = main(list(argv))
+  finally:
+    sys.argv[0] = prog
+  return 0 if ret is None else ret
+
+
+def main(argv=None):
+  argv = sys.argv[1:] if argv is None else list(argv)
+  if not argv or argv[0] in ('list', '-h', '--help'):
+    print("usage: toolbox.py <command> [options], toolbox.py <command> -h\n\ncommands:")
+    for command, (folder, module, description) in COMMANDS.items():
+      print("  %-14s %s (%s/%s.py)" % (command, description, folder, module))
+    return 0
+  return run(argv[0], argv[1:])
+
+
+if __name__ == '__main__':
+  sys.exit(main())
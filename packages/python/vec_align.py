@@ -0,0 +1,231 @@
+"""
+vec_align.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Delay between two sequences (e.g. stimulus and testbench output, or
+  testbench output and model output) with FFT cross-correlation, so the
+  latency of a block (which changes with its generics, e.g. the register
+  lengths of multAdd or the stages of the CORDIC blocks) does not have to be
+  counted by hand.
+
+  The delay d is defined by y[n] ~ g * x[n - d] (y is late if d > 0).
+
+  Long sequences are aligned in two steps:
+    1. coarse: the sequences are decimated by D (mean of D samples, the DC
+       is removed) to about COARSE_SPS samples and cross-correlated: the lag
+       is known within +-D samples;
+    2. refined: a window of WIN_SPS samples of y is cross-correlated with
+       the samples of x around the coarse lag, at the full rate.
+  Both steps are FFT correlations, so the cost is O(n log n) and the
+  memory is O(n/D + WIN_SPS) (the inputs can be memory maps of fxp_bin.py
+  files). If the refined peak is weak (decimation removed the signal, e.g.
+  a high-pass signal), the full-rate correlation of the whole sequences is
+  used.
+
+  The optional fractional delay is the vertex of the parabola through the
+  correlation peak and its two neighbours.
+
+  Periodic sequences (e.g. a single tone) have a correlation peak every
+  period: max_lag must be lower than half a period.
+
+  Usage:
+    python vec_align.py data_in.txt data_out.txt --wl-x 16 --wl-y 18
+    python vec_align.py out.fxb ref.fxb --fractional --max-lag 1000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from fxp_bin import FXP_BIN_EXT, read_fxp_bin
+from fxp_io import CHUNK_SPS, read_fxp_txt
+
+# Samples of the decimated sequences and of the refined window
+COARSE_SPS = 2**16
+WIN_SPS = 2**16
+
+# Minimum normalized correlation of the refined peak
+MIN_CORR = 0.5
+
+
+def _nfft(n):
+  return 1 << int(n - 1).bit_length()
+
+
+def xcorr_fft(x, y, max_lag=None):
+  """Cross-correlation c[lag] = sum_n y[n] * x[n - lag] with one FFT.
+
+  Args:
+    x, y: Real sequences.
+    max_lag: Maximum absolute lag (None: all the lags).
+
+  Returns:
+    Tuple (lags, c).
+  """
+  x = np.asarray(x, dtype=np.float64)
+  y = np.asarray(y, dtype=np.float64)
+  N = _nfft(np.size(x) + np.size(y) - 1)
+  c = np.fft.irfft(np.fft.rfft(y, N) * np.conj(np.fft.rfft(x, N)), N)
+  lo = -(np.size(x) - 1)
+  hi = np.size(y) - 1
+  if max_lag is not None:
+    lo, hi = max(lo, -max_lag), min(hi, max_lag)
+  lags = np.arange(lo, hi + 1)
+  return lags, c[lags % N]
+
+
+def decimate_mean(x, D, chunk_sps=CHUNK_SPS):
+  """Means of D consecutive samples (the last incomplete block is dropped).
+
+  The input is read in chunks of about chunk_sps samples.
+  """
+  n = np.size(x) // D
+  out = np.empty(n)
+  step = max(chunk_sps // D, 1)
+  for i in range(0, n, step):
+    m = min(step, n - i)
+    out[i:i+m] = np.asarray(x[i*D:(i+m)*D], dtype=np.float64).reshape(m, D).mean(axis=1)
+  return out
+
+
+def _parabola(c, k):
+  """Vertex offset (-0.5 to 0.5) of the parabola through c[k-1], c[k], c[k+1]."""
+  if k <= 0 or k >= np.size(c) - 1:
+    return 0.0
+  den = c[k-1] - 2*c[k] + c[k+1]
+  return 0.0 if den == 0 else float(0.5 * (c[k-1] - c[k+1]) / den)
+
+
+def _peak(lags, c, fractional):
+  k = int(np.argmax(c))
+  frac = _parabola(c, k) if fractional else 0.0
+  return int(lags[k]), frac
+
+
+def _window_corr(x, y, lag, start, length):
+  """Normalized correlation of y[start:start+length] and x shifted by lag."""
+  a = start - lag
+  if a < 0 or a + length > np.size(x) or start + length > np.size(y):
+    return 0.0
+  xs = np.asarray(x[a:a+length], dtype=np.float64)
+  ys = np.asarray(y[start:start+length], dtype=np.float64)
+  xs = xs - np.mean(xs)
+  ys = ys - np.mean(ys)
+  den = np.sqrt(np.dot(xs, xs) * np.dot(ys, ys))
+  return float(np.dot(xs, ys) / den) if den > 0 else 0.0
+
+
+def estimate_delay(x, y, max_lag=None, fractional=False, coarse_sps=COARSE_SPS,
+                   win_sps=WIN_SPS, min_corr=MIN_CORR):
+  """Delay of y with respect to x.
+
+  Args:
+    x, y: Sequences (arrays or memory maps).
+    max_lag: Maximum absolute delay (None: any delay).
+    fractional: True adds the fractional part of the delay.
+    coarse_sps: Samples of the decimated sequences (decimation factor
+      D = min(len) // coarse_sps, no decimation if D < 2).
+    win_sps: Samples of the refined window.
+    min_corr: Minimum normalized correlation of the refined peak.
+
+  Returns:
+    Dictionary with delay (int, or float if fractional), lag (integer
+    delay), frac, corr (normalized correlation at lag), decim (D) and
+    method ('decimated', 'full').
+  """
+  n = min(np.size(x), np.size(y))
+  if n < 2:
+    raise ValueError("The sequences must have at least 2 samples.")
+  D = n // coarse_sps
+
+  if D >= 2:
+    # 1. Coarse lag on the decimated sequences
+    xd = decimate_mean(x, D)
+    yd = decimate_mean(y, D)
+    lags, c = xcorr_fft(xd - np.mean(xd), yd - np.mean(yd),
+                        None if max_lag is None else max_lag // D + 1)
+    lag_c = int(lags[np.argmax(c)]) * D
+
+    # 2. Refined lag in +-2D samples, window of y in the middle of the overlap
+    margin = 2 * D
+    length = min(win_sps, n - abs(lag_c) - 2 * margin)
+    if length > 0:
+      start = max(lag_c, 0) + margin + max((n - abs(lag_c) - 2 * margin - length) // 2, 0)
+      a = start - lag_c - margin
+      xs = np.asarray(x[a:a + length + 2*margin], dtype=np.float64)
+      ys = np.asarray(y[start:start + length], dtype=np.float64)
+      N = _nfft(np.size(xs))
+      # r[j] = sum_n ys[n] * xs[n + j], lag = start - (a + j)
+      r = np.fft.irfft(np.fft.rfft(xs - np.mean(xs), N) *
+                       np.conj(np.fft.rfft(ys - np.mean(ys), N)), N)[:2*margin + 1]
+      lags = start - a - np.arange(2*margin + 1)
+      # Increasing lags for the parabola
+      lag, frac = _peak(lags[::-1], r[::-1], fractional)
+      corr = _window_corr(x, y, lag, start, length)
+      if corr >= min_corr and (max_lag is None or abs(lag) <= max_lag):
+        return {'delay': lag + frac if fractional else lag, 'lag': lag, 'frac': frac,
+                'corr': corr, 'decim': D, 'method': 'decimated'}
+
+  # Full-rate correlation of the whole sequences
+  xf = np.asarray(x, dtype=np.float64)
+  yf = np.asarray(y, dtype=np.float64)
+  lags, c = xcorr_fft(xf - np.mean(xf), yf - np.mean(yf), max_lag)
+  lag, frac = _peak(lags, c, fractional)
+  start = max(lag, 0)
+  corr = _window_corr(x, y, lag, start, n - abs(lag))
+  return {'delay': lag + frac if fractional else lag, 'lag': lag, 'frac': frac,
+          'corr': corr, 'decim': 1, 'method': 'full'}
+
+
+def load_vectors(fileName, Wl=None, signed=True):
+  """Samples of a vector file: memory map of a binary file, array of a text file."""
+  if fileName.lower().endswith(FXP_BIN_EXT):
+    return read_fxp_bin(fileName, mmap=True)[0]
+  if Wl is None:
+    raise ValueError("The word length of the text file '%s' is required." % fileName)
+  return read_fxp_txt(fileName, Wl, signed)
+
+
+def align(x, y, lag):
+  """Overlapping parts of x and y for an integer delay (see estimate_delay).
+
+  Returns:
+    Tuple (x_aligned, y_aligned) with the same length.
+  """
+  if lag >= 0:
+    y = y[lag:]
+  else:
+    x = x[-lag:]
+  n = min(np.size(x), np.size(y))
+  return x[:n], y[:n]
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Delay between two vector files (FFT cross-correlation).')
+  parser.add_argument('x', help='first file (e.g. input or model output)')
+  parser.add_argument('y', help='second file (e.g. testbench output)')
+  parser.add_argument('--wl-x', type=int, default=None, help='word length (text files)')
+  parser.add_argument('--wl-y', type=int, default=None, help='default: --wl-x')
+  parser.add_argument('--unsigned', action='store_true')
+  parser.add_argument('--max-lag', type=int, default=None)
+  parser.add_argument('--fractional', action='store_true')
+  parser.add_argument('--coarse-sps', type=int, default=COARSE_SPS)
+  parser.add_argument('--win-sps', type=int, default=WIN_SPS)
+  args = parser.parse_args(argv)
+
+  x = load_vectors(args.x, args.wl_x, not args.unsigned)
+  y = load_vectors(args.y, args.wl_x if args.wl_y is None else args.wl_y, not args.unsigned)
+  t0 = time.perf_counter()
+  res = estimate_delay(x, y, args.max_lag, args.fractional, args.coarse_sps, args.win_sps)
+  print("delay = %s samples (%s, D = %i, corr = %.4f, %.1f ms)" %
+        (("%.3f" % res['delay']) if args.fractional else res['delay'], res['method'],
+         res['decim'], res['corr'], 1e3 * (time.perf_counter() - t0)))
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,367 @@
+"""
+vec_compare.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Streaming comparison of two vector files (simulation output and golden
+  output), text (.txt) or binary (.fxb, see fxp_bin.py).
+
+  The files are read in chunks of chunk_sps samples and each pair of
+  chunks updates:
+    - the number of samples and of exact matches;
+    - the error statistics (ErrorStats of err_stats.py: max absolute error
+      and its sample index, mean, RMS, histogram);
+    - the power of the reference and of the error, so
+        SNR  = 10*log10(P_ref / P_err) [dB]
+        ENOB = (SNR - 1.76) / 6.02;
+    - the Welch spectra (averaged periodograms of nperseg samples with a
+      cosine-sum window and 50 % overlap) of the simulation output and of
+      the reference: the SFDR and the SINAD of each signal are computed from
+      the averaged spectra (the carrier is the strongest bin, its main lobe
+      is excluded from the spurs, as the DC lobe).
+  Only the current chunks, the overlap of the Welch segments and the
+  spectra are kept in memory, so the memory use does not depend on the
+  length of the files (e.g. 10**9-sample captures).
+
+  The values of a file are x * scale (e.g. scale=2**-Fl for real values);
+  'offset' skips the first samples of the simulation output (latency), or
+  of the reference if it is negative. With '--align' the offset is the
+  delay between the first ALIGN_SPS samples of the files (see vec_align.py).
+
+  Usage:
+    python vec_compare.py data_out.txt data_out_model.txt --wl 18
+    python vec_compare.py out.fxb ref.fxb --nperseg 8192 --offset 3
+    python vec_compare.py data_out.txt data_out_model.txt --wl 18 --align
+  The exit status is 1 if the files do not match exactly (--min-snr: if the
+  SNR is lower than the threshold) or if samples of the output are left
+  (the reference samples left are the pipeline tail of a model output;
+  --strict-length also fails on them).
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from err_stats import ErrorStats
+from fxp_bin import FXP_BIN_EXT, read_fxp_bin
+from fxp_coeffs import WINDOWS
+from fxp_io import CHUNK_SPS, iter_fxp_txt
+from vec_align import estimate_delay
+
+# Welch segments
+NPERSEG = 4096
+WINDOW = 'nuttall'
+
+# Samples of each file used to estimate the delay (--align)
+ALIGN_SPS = 2**20
+
+
+def iter_vectors(fileName, Wl=None, signed=True, chunk_sps=CHUNK_SPS, offset=0):
+  """Samples of a text or binary vector file, chunk by chunk.
+
+  Args:
+    fileName: Text file (Wl required) or binary file (FXP_BIN_EXT).
+    Wl, signed: Format of the text file.
+    chunk_sps: Samples of each chunk.
+    offset: Samples skipped at the beginning of the file.
+
+  Yields:
+    1-D int64 arrays.
+  """
+  if fileName.lower().endswith(FXP_BIN_EXT):
+    x, _ = read_fxp_bin(fileName, mmap=True)
+    for i in range(offset, np.size(x), chunk_sps):
+      yield np.asarray(x[i:i+chunk_sps], dtype=np.int64)
+    return
+  if Wl is None:
+    raise ValueError("The word length of the text file '%s' is required." % fileName)
+  for chunk in iter_fxp_txt(fileName, Wl, signed, chunk_sps):
+    if offset >= np.size(chunk):
+      offset -= np.size(chunk)
+      continue
+    yield chunk[offset:]
+    offset = 0
+
+
+def iter_pairs(chunks_a, chunks_b, left=None):
+  """Pairs of blocks with the same length from two chunk iterators.
+
+  The pairs stop at the end of the shorter sequence; if 'left' is a list,
+  the numbers of samples left in the two sequences are appended to it.
+  """
+  buf_a = np.zeros(0, dtype=np.int64)
+  buf_b = np.zeros(0, dtype=np.int64)
+  chunks_a, chunks_b = iter(chunks_a), iter(chunks_b)
+  while True:
+    if np.size(buf_a) == 0:
+      buf_a = next(chunks_a, None)
+    if np.size(buf_b) == 0:
+      buf_b = next(chunks_b, None)
+    if buf_a is None or buf_b is None:
+      break
+    n = min(np.size(buf_a), np.size(buf_b))
+    yield buf_a[:n], buf_b[:n]
+    buf_a, buf_b = buf_a[n:], buf_b[n:]
+  if left is not None:
+    left.append(np.size(buf_a) + sum(np.size(c) for c in chunks_a) if buf_a is not None else 0)
+    left.append(np.size(buf_b) + sum(np.size(c) for c in chunks_b) if buf_b is not None else 0)
+
+
+def cosine_window(N, window=WINDOW):
+  """Periodic cosine-sum window of N samples (see fxp_coeffs.WINDOWS)."""
+  if window not in WINDOWS:
+    raise ValueError("Invalid window. Choose one of %s." % ', '.join(WINDOWS))
+  n = np.arange(N) * (2*np.pi / N)
+  w = np.zeros(N)
+  for k, a in enumerate(WINDOWS[window]):
+    w += (-1)**k * a * np.cos(k * n)
+  return w
+
+
+class WelchPSD:
+  """Streaming Welch spectrum (averaged periodograms) of a real signal.
+
+  Attributes:
+    nperseg: Samples of each segment (50 % overlap).
+    window: Window of the segments (see fxp_coeffs.WINDOWS).
+    num_segments: Number of averaged segments.
+    psd_sum: Sum of the one-sided periodograms (nperseg//2 + 1 bins).
+  """
+
+  def __init__(self, nperseg=NPERSEG, window=WINDOW):
+    self.nperseg = nperseg
+    self.step = nperseg // 2
+    self.window = window
+    self.lobe = len(WINDOWS[window])
+    self._w = cosine_window(nperseg, window)
+    self._tail = np.zeros(0)
+    self.num_segments = 0
+    self.psd_sum = np.zeros(nperseg // 2 + 1)
+
+  def update(self, x):
+    """Adds a block of samples (the last samples are kept for the overlap)."""
+    buf = np.concatenate((self._tail, np.asarray(x, dtype=np.float64)))
+    if np.size(buf) < self.nperseg:
+      self._tail = buf
+      return
+    segs = np.lib.stride_tricks.sliding_window_view(buf, self.nperseg)[::self.step]
+    X = np.fft.rfft(segs * self._w, axis=-1)
+    self.psd_sum += np.sum(X.real**2 + X.imag**2, axis=0)
+    self.num_segments += np.shape(segs)[0]
+    self._tail = buf[np.shape(segs)[0] * self.step:]
+
+  @property
+  def psd(self):
+    """Averaged one-sided power spectrum (arbitrary scale)."""
+    psd = self.psd_sum / max(self.num_segments, 1)
+    psd[1:-1] *= 2
+    return psd
+
+  def metrics(self):
+    """SFDR and SINAD [dB] of the averaged spectrum (nan: no segment).
+
+    The carrier is the strongest bin out of the DC lobe; the power of the
+    carrier is the power of its main lobe, the spurs are the other bins.
+    The sidelobes of the window bound the measured values (about -31 dB for
+    'hann', -93 dB for 'nuttall'): the SNR of StreamCompare does not depend
+    on the window.
+    """
+    if self.num_segments == 0:
+      return float('nan'), float('nan')
+    psd = self.psd
+    L = self.lobe
+    # Main lobe: +-L bins around a tone (L+1 bins for a tone between two bins)
+    spurs = psd.copy()
+    spurs[:L+1] = 0
+    k = int(np.argmax(spurs))
+    lo, hi = max(k - L, 0), k + L + 1
+    P_carrier = np.sum(psd[lo:hi])
+    spurs[lo:hi] = 0
+    tiny = np.finfo(np.float64).tiny
+    if P_carrier <= tiny:
+      return float('nan'), float('nan')
+    sfdr = 10 * np.log10(psd[k] / max(float(np.max(spurs)), tiny))
+    sinad = 10 * np.log10(P_carrier / max(float(np.sum(spurs)), tiny))
+    return float(sfdr), float(sinad)
+
+
+class StreamCompare:
+  """Streaming comparison of a simulation output and a reference.
+
+  Attributes:
+    num_sps: Compared samples.
+    num_exact: Samples with the same value.
+    err: ErrorStats of dut - ref (arg_max_abs: sample index).
+    sum_ref_sq, sum_err_sq: Energy of the reference and of the error.
+    psd_dut, psd_ref: WelchPSD of the two signals (None: no spectra).
+  """
+
+  def __init__(self, nperseg=NPERSEG, window=WINDOW, hist_edges=None, spectra=True):
+    self.num_sps = 0
+    self.num_exact = 0
+    self.err = ErrorStats(hist_edges)
+    self.sum_ref_sq = 0.0
+    self.sum_err_sq = 0.0
+    self.psd_dut = WelchPSD(nperseg, window) if spectra else None
+    self.psd_ref = WelchPSD(nperseg, window) if spectra else None
+
+  def update(self, dut, ref, scale_dut=1.0, scale_ref=1.0):
+    """Adds a pair of blocks with the same length (raw integer samples)."""
+    dut = np.asarray(dut)
+    ref = np.asarray(ref)
+    if scale_dut == scale_ref:
+      self.num_exact += int(np.count_nonzero(dut == ref))
+    x = dut * float(scale_dut)
+    r = ref * float(scale_ref)
+    if scale_dut != scale_ref:
+      self.num_exact += int(np.count_nonzero(x == r))
+    e = x - r
+    self.err.update(e, np.arange(self.num_sps, self.num_sps + np.size(e)))
+    self.sum_ref_sq += float(np.dot(r, r))
+    self.sum_err_sq += float(np.dot(e, e))
+    self.num_sps += np.size(e)
+    if self.psd_dut is not None:
+      self.psd_dut.update(x)
+      self.psd_ref.update(r)
+
+  @property
+  def snr(self):
+    """P_ref / P_err [dB] (inf: exact match)."""
+    if self.num_sps == 0:
+      return float('nan')
+    if self.sum_err_sq == 0:
+      return float('inf')
+    if self.sum_ref_sq == 0:
+      return float('-inf')
+    return float(10 * np.log10(self.sum_ref_sq / self.sum_err_sq))
+
+  def summary(self):
+    """Returns the metrics as a dictionary."""
+    snr = self.snr
+    res = {'num_sps': self.num_sps, 'num_exact': self.num_exact,
+           'max_abs_err': self.err.max_abs, 'arg_max_abs_err': self.err.arg_max_abs,
+           'mean_err': self.err.mean, 'rms_err': self.err.rms,
+           'snr_db': snr, 'enob': (snr - 1.76) / 6.02}
+    if self.psd_dut is not None:
+      res['sfdr_db'], res['sinad_db'] = self.psd_dut.metrics()
+      res['sfdr_ref_db'], res['sinad_ref_db'] = self.psd_ref.metrics()
+      res['num_segments'] = self.psd_dut.num_segments
+    return res
+
+
+def _head(chunks, num_sps):
+  """First num_sps samples of a chunk iterator."""
+  head = []
+  left = num_sps
+  for chunk in chunks:
+    head.append(chunk[:left])
+    left -= np.size(head[-1])
+    if left <= 0:
+      break
+  return np.concatenate(head) if head else np.zeros(0, dtype=np.int64)
+
+
+def estimate_offset(dutName, refName, Wl_dut=None, Wl_ref=None, signed=True,
+                    max_lag=None, num_sps=ALIGN_SPS):
+  """Offset of the simulation output (delay with respect to the reference).
+
+  Only the first num_sps samples of each file are read.
+
+  Returns:
+    Result of vec_align.estimate_delay (integer delay in 'lag').
+  """
+  dut = _head(iter_vectors(dutName, Wl_dut, signed), num_sps)
+  ref = _head(iter_vectors(refName, Wl_ref, signed), num_sps)
+  return estimate_delay(ref, dut, max_lag)
+
+
+def compare_files(dutName, refName, Wl_dut=None, Wl_ref=None, signed=True,
+                  scale_dut=1.0, scale_ref=1.0, offset=0, nperseg=NPERSEG,
+                  window=WINDOW, spectra=True, chunk_sps=CHUNK_SPS):
+  """Compares two vector files chunk by chunk.
+
+  Args:
+    dutName, refName: Simulation output and reference (text or binary).
+    Wl_dut, Wl_ref: Word lengths of the text files (binary: from the header).
+    signed: Signed numbers (text files).
+    scale_dut, scale_ref: Scale of the values of each file.
+    offset: Samples of the simulation output skipped at the beginning
+      (negative: samples of the reference).
+    nperseg, window: Welch segments.
+    spectra: False skips the spectra (SFDR, SINAD).
+    chunk_sps: Samples of each chunk.
+
+  Returns:
+    StreamCompare with the metrics, and the samples left in each file after
+    the shorter one ended (tuple).
+  """
+  cmp = StreamCompare(nperseg, window, spectra=spectra)
+  chunks_dut = iter_vectors(dutName, Wl_dut, signed, chunk_sps, max(offset, 0))
+  chunks_ref = iter_vectors(refName, Wl_ref, signed, chunk_sps, max(-offset, 0))
+  left = []
+  for dut, ref in iter_pairs(chunks_dut, chunks_ref, left):
+    cmp.update(dut, ref, scale_dut, scale_ref)
+  return cmp, tuple(left)
+
+
+def format_summary(res, left=(0, 0)):
+  lines = ["samples      %i (exact %i, %.4f %%)" %
+           (res['num_sps'], res['num_exact'], 100 * res['num_exact'] / max(res['num_sps'], 1)),
+           "max error    %g (sample %s)" % (res['max_abs_err'], res['arg_max_abs_err']),
+           "mean error   %g, RMS %g" % (res['mean_err'], res['rms_err']),
+           "SNR          %.2f dB, ENOB %.2f bits" % (res['snr_db'], res['enob'])]
+  if 'sfdr_db' in res:
+    lines.append("SFDR         %.2f dB (reference %.2f dB), %i segments" %
+                 (res['sfdr_db'], res['sfdr_ref_db'], res['num_segments']))
+    lines.append("SINAD        %.2f dB (reference %.2f dB)" % (res['sinad_db'], res['sinad_ref_db']))
+  if any(left):
+    lines.append("not compared %i samples of the output, %i of the reference" % left)
+  return '\n'.join(lines)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Streaming comparison of two vector files.')
+  parser.add_argument('dut', help='simulation output (.txt or %s)' % FXP_BIN_EXT)
+  parser.add_argument('ref', help='reference output (.txt or %s)' % FXP_BIN_EXT)
+  parser.add_argument('--wl', type=int, default=None, help='word length of the text files')
+  parser.add_argument('--wl-ref', type=int, default=None, help='default: --wl')
+  parser.add_argument('--unsigned', action='store_true')
+  parser.add_argument('--scale', type=float, default=1.0, help='scale of the output values')
+  parser.add_argument('--scale-ref', type=float, default=1.0)
+  parser.add_argument('--offset', type=int, default=0,
+                      help='output samples skipped (latency), negative: reference samples')
+  parser.add_argument('--align', action='store_true', help='estimate the offset (FFT correlation)')
+  parser.add_argument('--max-lag', type=int, default=None, help='maximum offset of --align')
+  parser.add_argument('--nperseg', type=int, default=NPERSEG)
+  parser.add_argument('--window', choices=list(WINDOWS), default=WINDOW)
+  parser.add_argument('--no-spectra', action='store_true')
+  parser.add_argument('--chunk-sps', type=int, default=CHUNK_SPS)
+  parser.add_argument('--min-snr', type=float, default=None,
+                      help='pass if SNR >= MIN_SNR [dB] (default: exact match)')
+  parser.add_argument('--strict-length', action='store_true',
+                      help='fail if samples of the reference are left')
+  args = parser.parse_args(argv)
+
+  Wl_ref = args.wl if args.wl_ref is None else args.wl_ref
+  offset = args.offset
+  if args.align:
+    res = estimate_offset(args.dut, args.ref, args.wl, Wl_ref, not args.unsigned, args.max_lag)
+    offset = res['lag']
+    print("offset       %i (%s, corr %.4f)" % (offset, res['method'], res['corr']))
+  cmp, left = compare_files(args.dut, args.ref, args.wl, Wl_ref,
+                            not args.unsigned, args.scale, args.scale_ref, offset,
+                            args.nperseg, args.window, not args.no_spectra, args.chunk_sps)
+  res = cmp.summary()
+  print(format_summary(res, left))
+  if args.min_snr is not None:
+    ok = res['snr_db'] >= args.min_snr
+  else:
+    ok = res['num_sps'] > 0 and res['num_exact'] == res['num_sps']
+  ok = ok and left[0] == 0 and (left[1] == 0 or not args.strict_length)
+  return 0 if ok else 1
+
+
+if __name__ == '__main__':
+  sys.exit(main())
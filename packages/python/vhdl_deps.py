@@ -0,0 +1,349 @@
+"""
+vhdl_deps.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Design units and dependencies of the VHDL files of the toolbox, and
+  compile order of a set of files.
+
+  Each file is parsed with regular expressions (comments and strings
+  removed, case-insensitive):
+    - defined units: entity E, architecture A of E, package P, package
+      body P;
+    - required units: 'use work.P...', 'entity work.E' instantiations,
+      component instantiations 'U : [component] E generic/port map' of
+      the entities of the tree, the entity of an architecture and the
+      package of a package body.
+  Only the 'work' library is resolved (ieee, std and the vendor libraries
+  are provided by the simulator).
+
+  A file depends on the files that define the units it requires. To
+  elaborate an entity, the files of its architectures (and the bodies of
+  its packages) are needed as well: 'closure' adds them.
+
+  The parsed units are kept in a persistent index (sim_build/vhdl_index.json)
+  keyed by the hash of each file: a file is parsed again only if its content
+  changed (its hash is computed only if its size or its modification time
+  changed). With the index, the questions "which files must be recompiled"
+  and "which testbenches are affected" by a change take a few milliseconds.
+
+  Usage:
+    python vhdl_deps.py basic/delay/vhdl/delay_sl.vhd
+    python vhdl_deps.py --since HEAD~1   (files changed since a git revision)
+    python vhdl_deps.py --order          (compile order of the tree)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Folders not scanned
+SKIP_DIRS = ('.git', 'sim_build', 'prj_tb', '__pycache__')
+
+# Persistent index (relative to the root) and version of its format/parser
+INDEX_FILE = 'sim_build/vhdl_index.json'
+INDEX_VERSION = 1
+
+_COMMENT_RE = re.compile(r'("(?:[^"\n]|"")*")|--[^\n]*')
+_ENTITY_RE = re.compile(r'\bentity\s+(\w+)\s+is\b')
+_ARCH_RE = re.compile(r'\barchitecture\s+(\w+)\s+of\s+(\w+)\s+is\b')
+_PACKAGE_RE = re.compile(r'\bpackage\s+(\w+)\s+is\b')
+_BODY_RE = re.compile(r'\bpackage\s+body\s+(\w+)\s+is\b')
+_USE_RE = re.compile(r'\buse\s+([\w\s.,]+);')
+_ENTITY_INST_RE = re.compile(r'\bentity\s+(\w+)\s*\.\s*(\w+)')
+_COMP_INST_RE = re.compile(r'\b\w+\s*:\s*(?:component\s+)?(\w+)\s+(?:generic|port)\s+map\b')
+
+
+def strip_comments(text):
+  """VHDL text without comments and with empty string literals."""
+  return _COMMENT_RE.sub(lambda m: '""' if m.group(1) else '', text)
+
+
+def parse_vhdl(text):
+  """Units defined and required by a VHDL file.
+
+  Returns:
+    Tuple (defines, requires, components): sets of (kind, name) pairs
+    (kind: 'entity', 'architecture', 'package' or 'body'; the name of an
+    architecture is its entity), and the set of the component names
+    instantiated (resolved to entities by the caller).
+  """
+  text = strip_comments(text).lower()
+  defines = set()
+  requires = set()
+  for name in _ENTITY_RE.findall(text):
+    defines.add(('entity', name))
+  for _, entity in _ARCH_RE.findall(text):
+    defines.add(('architecture', entity))
+    requires.add(('entity', entity))
+  for name in _BODY_RE.findall(text):
+    defines.add(('body', name))
+    requires.add(('package', name))
+  for name in _PACKAGE_RE.findall(text):
+    defines.add(('package', name))
+
+  for clause in _USE_RE.findall(text):
+    for item in clause.split(','):
+      parts = [p.strip() for p in item.split('.')]
+      if len(parts) >= 2 and parts[0] == 'work':
+        requires.add(('package', parts[1]))
+  for lib, name in _ENTITY_INST_RE.findall(text):
+    if lib == 'work':
+      requires.add(('entity', name))
+  components = set(_COMP_INST_RE.findall(text)) - {'entity', 'process', 'block'}
+  return defines, requires - defines, components
+
+
+def find_vhdl_files(root):
+  """Paths (relative to root, '/' separators) of the .vhd/.vhdl files."""
+  files = []
+  for dirpath, dirnames, filenames in os.walk(root):
+    dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+    for fileName in sorted(filenames):
+      if fileName.lower().endswith(('.vhd', '.vhdl')):
+        files.append(os.path.relpath(os.path.join(dirpath, fileName), root).replace(os.sep, '/'))
+  return files
+
+
+def _load_index(fileName):
+  """Entries of the index ({} if it does not exist or has another version)."""
+  try:
+    with open(fileName) as fid:
+      index = json.load(fid)
+  except (OSError, ValueError):
+    return {}
+  if index.get('version') != INDEX_VERSION:
+    return {}
+  return index.get('files', {})
+
+
+def _save_index(fileName, entries):
+  """Writes the index (temporary file and rename: concurrent runs are safe)."""
+  os.makedirs(os.path.dirname(fileName) or '.', exist_ok=True)
+  tmp = "%s.%i.tmp" % (fileName, os.getpid())
+  with open(tmp, 'w') as fid:
+    json.dump({'version': INDEX_VERSION, 'files': entries}, fid, sort_keys=True)
+  os.replace(tmp, fileName)
+
+
+def parse_files(root, files, index=INDEX_FILE, stats=None):
+  """parse_vhdl of the files, with the persistent index.
+
+  Args:
+    root: Root folder of the files.
+    files: Paths relative to root.
+    index: Index file (relative to root), None: no index.
+    stats: Optional dictionary, filled with the number of files 'parsed',
+      'hashed' and 'cached'.
+
+  Returns:
+    Dictionary {file: (defines, requires, components)}.
+  """
+  fileName = None if index is None else os.path.join(root, index)
+  entries = {} if fileName is None else _load_index(fileName)
+  new_entries = {}
+  parsed = {}
+  n_parsed = n_hashed = 0
+  for f in files:
+    path = os.path.join(root, f)
+    st = os.stat(path)
+    entry = entries.get(f)
+    if entry is None or entry['size'] != st.st_size or entry['mtime'] != st.st_mtime_ns:
+      with open(path, 'rb') as fid:
+        data = fid.read()
+      digest = hashlib.sha1(data).hexdigest()
+      n_hashed += 1
+      if entry is None or entry['hash'] != digest:
+        defines, requires, components = parse_vhdl(data.decode('latin-1'))
+        entry = {'hash': digest,
+                 'defines': sorted(defines), 'requires': sorted(requires),
+                 'components': sorted(components)}
+        n_parsed += 1
+      entry = dict(entry, size=st.st_size, mtime=st.st_mtime_ns)
+    new_entries[f] = entry
+    parsed[f] = ({tuple(u) for u in entry['defines']}, {tuple(u) for u in entry['requires']},
+                 set(entry['components']))
+  if fileName is not None and new_entries != entries:
+    _save_index(fileName, new_entries)
+  if stats is not None:
+    stats.update(parsed=n_parsed, hashed=n_hashed, cached=len(files) - n_hashed)
+  return parsed
+
+
+def scan_units(root, files=None, index=INDEX_FILE, stats=None):
+  """Parses the files of the tree (see parse_files for index and stats).
+
+  Returns:
+    Dictionary {file: (defines, requires)}, the components are resolved
+    to the entities defined in the files.
+  """
+  if files is None:
+    files = find_vhdl_files(root)
+  parsed = parse_files(root, files, index, stats)
+  entities = {name for defines, _, _ in parsed.values() for kind, name in defines
+              if kind == 'entity'}
+  units = {}
+  for f, (defines, requires, components) in parsed.items():
+    requires = requires | {('entity', c) for c in components if c in entities}
+    units[f] = (defines, requires - defines)
+  return units
+
+
+def unit_files(units):
+  """Dictionary {(kind, name): set of files that define the unit}."""
+  where = {}
+  for f, (defines, _) in units.items():
+    for unit in defines:
+      where.setdefault(unit, set()).add(f)
+  return where
+
+
+def file_deps(units):
+  """Dictionary {file: set of files it depends on}."""
+  where = unit_files(units)
+  deps = {}
+  for f, (_, requires) in units.items():
+    deps[f] = set()
+    for unit in requires:
+      deps[f] |= where.get(unit, set())
+    deps[f].discard(f)
+  return deps
+
+
+def closure(files, units):
+  """Files needed to compile and elaborate the given files.
+
+  The dependencies are followed transitively, with the architectures of the
+  required entities and the bodies of the required packages.
+  """
+  where = unit_files(units)
+  deps = file_deps(units)
+  needed = set()
+  stack = list(files)
+  while stack:
+    f = stack.pop()
+    if f in needed:
+      continue
+    needed.add(f)
+    stack.extend(deps[f])
+    for kind, name in units[f][0] | units[f][1]:
+      if kind == 'entity':
+        stack.extend(where.get(('architecture', name), ()))
+      elif kind == 'package':
+        stack.extend(where.get(('body', name), ()))
+  return needed
+
+
+def compile_order(files, deps):
+  """Files sorted so that each file follows its dependencies.
+
+  Ties are sorted by path, so the order is reproducible.
+  """
+  files = set(files)
+  pending = {f: deps[f] & files for f in files}
+  order = []
+  ready = sorted(f for f, d in pending.items() if not d)
+  while ready:
+    f = ready.pop(0)
+    order.append(f)
+    del pending[f]
+    new = [g for g, d in pending.items() if f in d and len(d - set(order)) == 0]
+    ready = sorted(set(ready) | set(new))
+  if pending:
+    raise ValueError("Circular dependency between: %s" % ', '.join(sorted(pending)))
+  return order
+
+
+def reverse_deps(units):
+  """Dictionary {file: set of files that depend on it}."""
+  rdeps = {f: set() for f in units}
+  for f, d in file_deps(units).items():
+    for g in d:
+      rdeps[g].add(f)
+  return rdeps
+
+
+def dependents(files, units):
+  """Files to compile again when the given files change (files included)."""
+  rdeps = reverse_deps(units)
+  needed = set()
+  stack = [f for f in files if f in units]
+  while stack:
+    f = stack.pop()
+    if f not in needed:
+      needed.add(f)
+      stack.extend(rdeps[f])
+  return needed
+
+
+def is_testbench(fileName):
+  return os.path.basename(fileName).lower().endswith('_tb.vhd')
+
+
+def affected_testbenches(files, units):
+  """Testbench files whose compilation or elaboration needs one of the files."""
+  files = set(files)
+  return sorted(tb for tb in units if is_testbench(tb) and closure([tb], units) & files)
+
+
+def git_changed_files(root, since):
+  """VHDL files changed since a git revision (working tree and untracked files)."""
+  cmds = (['git', 'diff', '--name-only', since, '--'],
+          ['git', 'ls-files', '--others', '--exclude-standard'])
+  files = set()
+  for cmd in cmds:
+    out = subprocess.run(cmd, cwd=root, stdout=subprocess.PIPE, check=True,
+                         universal_newlines=True).stdout
+    files |= {f for f in out.split() if f.lower().endswith(('.vhd', '.vhdl'))}
+  return sorted(files)
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Dependencies of the VHDL files of the toolbox.')
+  parser.add_argument('files', nargs='*', help='changed files (relative to the root)')
+  parser.add_argument('--since', default=None, help='files changed since a git revision')
+  parser.add_argument('--order', action='store_true', help='compile order of the tree')
+  parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "../.."))
+  parser.add_argument('--no-index', action='store_true', help='do not use the persistent index')
+  args = parser.parse_args(argv)
+
+  root = os.path.normpath(args.root)
+  t0 = time.perf_counter()
+  stats = {}
+  units = scan_units(root, index=None if args.no_index else INDEX_FILE, stats=stats)
+  print("%i files: %i parsed, %i hashed, %i cached (%.1f ms)" %
+        (len(units), stats['parsed'], stats['hashed'], stats['cached'],
+         1e3 * (time.perf_counter() - t0)))
+
+  deps = file_deps(units)
+  if args.order:
+    for f in compile_order(units, deps):
+      print(f)
+    return 0
+
+  changed = [os.path.relpath(os.path.abspath(f), root).replace(os.sep, '/')
+             if os.path.isabs(f) else f for f in args.files]
+  if args.since is not None:
+    changed += git_changed_files(root, args.since)
+  unknown = [f for f in changed if f not in units]
+  if unknown:
+    print("not in the tree: %s" % ' '.join(unknown))
+  recompile = compile_order(dependents(changed, units), deps)
+  tbs = affected_testbenches(changed, units)
+  print("recompile (%i):" % len(recompile))
+  for f in recompile:
+    print("  %s" % f)
+  print("testbenches (%i):" % len(tbs))
+  for tb in tbs:
+    print("  %s" % tb)
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
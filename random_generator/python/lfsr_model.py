@@ -0,0 +1,223 @@
+"""
+lfsr_model.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Bit-true models of lfsr_fib.vhd and lfsr_gal.vhd.
+
+  The register lfsr_reg is an integer (bit i = lfsr_reg(i)) and one clock
+  cycle with enb = '1' is a linear map over GF(2):
+    - 'fib': lfsr_reg <= lfsr_reg(W-2 downto 0) & xor(lfsr_reg and lfsr_taps)
+    - 'gal': lfsr_reg <= lfsr_reg(0) & (lfsr_reg(W-1 downto 1) xor
+             (lfsr_taps(W-2 downto 0) and lfsr_reg(0)))
+  The map is stored as a GF(2) matrix (one integer for each column), so
+  n clock cycles are the matrix power A**n, computed with O(log n) matrix
+  products (jump-ahead).
+
+  The output words are generated in bulk: a block of LANE_SPS consecutive
+  states is moved forward by A**LANE_SPS with lookup tables (16 bits of the
+  state -> contribution to the new state), so each block costs a few NumPy
+  gathers and XORs for all its states.
+
+  Output sequence of the testbenches: the word n written in data_out.txt
+  is the lfsr_out of the state after data_out_width + n enabled clock
+  cycles from the seed (the latency of lfsr_valid). The disabled cycles do
+  not change the sequence.
+
+  Usage:
+    from lfsr_model import lfsr_words
+    x = lfsr_words('fib', 32, 0x80200006, 0x00000001, 16, num_sps=10**6)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Types of LFSR: Fibonacci (lfsr_fib.vhd) and Galois (lfsr_gal.vhd)
+LFSR_TYPES = ('fib', 'gal')
+
+# Maximum width of the register (uint64 states)
+LFSR_WIDTH_MAX = 64
+
+# Default number of states of each block
+BLOCK_SPS = 2**20
+
+# Number of states moved forward together (the arrays fit in the cache)
+LANE_SPS = 2**14
+
+
+def _check_params(lfsr_type, lfsr_width):
+  if lfsr_type not in LFSR_TYPES:
+    raise ValueError("Invalid lfsr_type. Choose one of %s." % ', '.join(LFSR_TYPES))
+  if lfsr_width < 2 or lfsr_width > LFSR_WIDTH_MAX:
+    raise ValueError("lfsr_width must be between 2 and %i." % LFSR_WIDTH_MAX)
+
+
+def lfsr_step(lfsr_type, lfsr_width, lfsr_taps, state):
+  """State after one enabled clock cycle (scalar reference of the VHDL process)."""
+  mask = (1 << lfsr_width) - 1
+  lfsr_taps &= mask
+  if lfsr_type == 'fib':
+    feedback_bit = bin(state & lfsr_taps).count('1') & 1
+    return ((state << 1) | feedback_bit) & mask
+  # 'gal': lfsr_taps(W-1) is not used, the MSB is lfsr_reg(0)
+  feedback_mask = (lfsr_taps & (mask >> 1)) | (1 << (lfsr_width - 1))
+  return (state >> 1) ^ (feedback_mask if state & 1 else 0)
+
+
+def lfsr_matrix(lfsr_type, lfsr_width, lfsr_taps):
+  """GF(2) matrix of one enabled clock cycle.
+
+  Returns:
+    Tuple of lfsr_width integers, the column j is the next state of the
+    state with only bit j set.
+  """
+  _check_params(lfsr_type, lfsr_width)
+  return tuple(lfsr_step(lfsr_type, lfsr_width, lfsr_taps, 1 << j)
+               for j in range(lfsr_width))
+
+
+def gf2_matvec(cols, state):
+  """Product of a GF(2) matrix (columns) and a state."""
+  out = 0
+  j = 0
+  while state:
+    if state & 1:
+      out ^= cols[j]
+    state >>= 1
+    j += 1
+  return out
+
+
+def gf2_matmul(cols_a, cols_b):
+  """Product A*B of two GF(2) matrices (columns)."""
+  return tuple(gf2_matvec(cols_a, col) for col in cols_b)
+
+
+@lru_cache(maxsize=256)
+def gf2_matpow(cols, n):
+  """Power A**n of a GF(2) matrix (columns), with O(log n) products."""
+  out = tuple(1 << j for j in range(len(cols)))
+  while n > 0:
+    if n & 1:
+      out = gf2_matmul(cols, out)
+    n >>= 1
+    if n:
+      cols = gf2_matmul(cols, cols)
+  return out
+
+
+def lfsr_jump(lfsr_type, lfsr_width, lfsr_taps, state, n):
+  """State after n enabled clock cycles (jump-ahead)."""
+  cols = lfsr_matrix(lfsr_type, lfsr_width, lfsr_taps)
+  return gf2_matvec(gf2_matpow(cols, n), state)
+
+
+@lru_cache(maxsize=16)
+def _word_tables(cols):
+  """Lookup tables of a GF(2) matrix: T[c, v] = A * (v << 16*c)."""
+  num_words = -(-len(cols) // 16)
+  cols = np.array(cols + (0,) * (16*num_words - len(cols)), dtype=np.uint64)
+
+  # Tables of the bytes, then tables of the 16-bit words (index hi*256 + lo)
+  bits = (np.arange(256)[:, np.newaxis] >> np.arange(8)) & 1
+  byte_tables = [np.bitwise_xor.reduce(np.where(bits == 1, cols[8*c:8*c+8], np.uint64(0)), axis=1)
+                 for c in range(2*num_words)]
+  return np.stack([(byte_tables[2*c+1][:, np.newaxis] ^ byte_tables[2*c][np.newaxis, :]).reshape(-1)
+                   for c in range(num_words)])
+
+
+def gf2_apply(cols, states, out=None):
+  """Product of a GF(2) matrix (columns) and a uint64 array of states.
+
+  The states are split in 16-bit words and each word is converted with a
+  lookup table, so the cost is one gather and one XOR for each 16 bits.
+  """
+  tables = _word_tables(tuple(cols))
+  states = np.ascontiguousarray(states, dtype='<u8')
+  words = states.view('<u2').reshape(-1, 4)
+  if out is None:
+    out = np.empty(np.size(states), dtype=np.uint64)
+  idx = np.empty(np.size(states), dtype=np.intp)
+  tmp = np.empty(np.size(states), dtype=np.uint64)
+  idx[:] = words[:, 0]
+  np.take(tables[0], idx, out=out)
+  for c in range(1, np.shape(tables)[0]):
+    idx[:] = words[:, c]
+    np.take(tables[c], idx, out=tmp)
+    out ^= tmp
+  return out
+
+
+def iter_lfsr_states(lfsr_type, lfsr_width, lfsr_taps, state, num_sps,
+                     block_sps=BLOCK_SPS):
+  """Yields blocks of consecutive states, starting from 'state'.
+
+  The states are computed in LANE_SPS lanes: the lanes contain LANE_SPS
+  consecutive states and are moved forward together by A**LANE_SPS.
+
+  Args:
+    lfsr_type: 'fib' or 'gal'.
+    lfsr_width, lfsr_taps: Generics of the LFSR.
+    state: First state.
+    num_sps: Number of states.
+    block_sps: Number of states of each block (rounded up to a multiple of
+      LANE_SPS).
+
+  Yields:
+    uint64 arrays with at most block_sps states.
+  """
+  cols = lfsr_matrix(lfsr_type, lfsr_width, lfsr_taps)
+  if num_sps <= 0:
+    return
+  num_lanes = min(LANE_SPS, num_sps)
+  block_sps = -(-block_sps // num_lanes) * num_lanes
+
+  # First states of the lanes
+  lanes = np.empty(num_lanes, dtype=np.uint64)
+  for i in range(num_lanes):
+    lanes[i] = state
+    state = lfsr_step(lfsr_type, lfsr_width, lfsr_taps, state)
+
+  cols_lanes = gf2_matpow(cols, num_lanes)
+  for i in range(0, num_sps, block_sps):
+    states = np.empty(min(block_sps, num_sps - i), dtype=np.uint64)
+    for k in range(0, np.size(states), num_lanes):
+      num = min(num_lanes, np.size(states) - k)
+      states[k:k+num] = lanes[:num]
+      if i + k + num < num_sps:
+        lanes = gf2_apply(cols_lanes, lanes)
+    yield states
+
+
+def iter_lfsr_words(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, data_out_width,
+                    start=0, num_sps=1, block_sps=BLOCK_SPS):
+  """Yields blocks of the output words written by the testbench.
+
+  Args:
+    lfsr_type: 'fib' or 'gal'.
+    lfsr_width, lfsr_taps, lfsr_seed, data_out_width: Generics of the LFSR.
+    start: Index of the first word (0 is the first line of data_out.txt).
+    num_sps: Number of words.
+    block_sps: Number of words of each block.
+
+  Yields:
+    int64 arrays with at most block_sps words (unsigned values).
+  """
+  if data_out_width < 1 or data_out_width > lfsr_width:
+    raise ValueError("data_out_width must be between 1 and lfsr_width.")
+  state = lfsr_jump(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed,
+                    data_out_width + start)
+  mask = np.uint64((1 << data_out_width) - 1)
+  for states in iter_lfsr_states(lfsr_type, lfsr_width, lfsr_taps, state,
+                                 num_sps, block_sps):
+    yield (states & mask).astype(np.int64)
+
+
+def lfsr_words(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, data_out_width,
+               start=0, num_sps=1, block_sps=BLOCK_SPS):
+  """Output words [start, start+num_sps) written by the testbench (see iter_lfsr_words)."""
+  blocks = list(iter_lfsr_words(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed,
+                                data_out_width, start, num_sps, block_sps))
+  return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int64)
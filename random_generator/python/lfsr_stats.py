@@ -0,0 +1,589 @@
+"""
+lfsr_stats.py
+Author: Daniele Giardino
+Date: 2026.10.16
+
+Description:
+  Statistics of the output of lfsr_fib.vhd and lfsr_gal.vhd (Python
+  version of matlab/histo_out.m).
+
+  The statistics are computed block by block, from the data_out.txt of a
+  simulation or from the bit-true model (lfsr_model.py):
+    - histogram of the output words (2**data_out_width bins, or the
+      hist_width MSBs of the words) and number of observed values;
+    - run lengths of lfsr_out(0), i.e. of the bit sequence of the LFSR
+      (number of runs of zeros and ones of each length).
+  The model sequence is split in chunks computed by a process pool: each
+  worker jumps to the first word of its chunk (lfsr_jump) and the
+  statistics of the chunks are merged in order.
+
+  The period of the LFSR is the order of x modulo the minimal polynomial
+  of the seed (factored over GF(2), exact for non-maximal taps too), or
+  it is verified by scanning the states of the model.
+
+  Usage:
+    python lfsr_stats.py --file ../Galois_LFSR/testbench/data_out.txt --plot
+    python lfsr_stats.py --type fib --width 32 --taps 80200006 --out-width 16 \\
+      --file ../Fibonacci_LFSR/testbench/data_out.txt --check
+    python lfsr_stats.py --type gal --width 16 --taps B400 --out-width 8 --num 65535
+    python lfsr_stats.py --type fib --width 32 --taps 80200006 --period
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "../../packages/python"))
+from fxp_io import iter_fxp_txt
+import fig_out
+from lfsr_model import (BLOCK_SPS, gf2_matvec, iter_lfsr_states,
+                        iter_lfsr_words, lfsr_jump, lfsr_matrix, lfsr_words)
+
+# Number of words of each chunk of the sweep
+CHUNK_SPS = 2**24
+
+# Maximum number of bits of the histogram (2**24 bins)
+HIST_WIDTH_MAX = 24
+
+
+class LfsrStats:
+  """Statistics of a sequence of output words, merged in order.
+
+  Attributes:
+    data_out_width: Bits of the words.
+    hist_width: Bits of the histogram (the MSBs of the words).
+    max_run: Runs of max_run bits or more are counted in the last bin.
+    num_sps: Number of words.
+    hist: Histogram counts (2**hist_width bins).
+    runs: Matrix (2, max_run+1), runs[b, k] is the number of runs of the
+      bit b with length k. The first and the last runs of the sequence
+      (still open) are in 'head' and 'tail' (see run_hist).
+  """
+
+  def __init__(self, data_out_width, hist_width=None, max_run=32):
+    if hist_width is None:
+      hist_width = min(data_out_width, HIST_WIDTH_MAX)
+    if hist_width > HIST_WIDTH_MAX:
+      raise ValueError("hist_width must not be greater than %i." % HIST_WIDTH_MAX)
+    self.data_out_width = data_out_width
+    self.hist_width = hist_width
+    self.max_run = max_run
+    self.num_sps = 0
+    self.hist = np.zeros(2**hist_width, dtype=np.int64)
+    self.runs = np.zeros((2, max_run + 1), dtype=np.int64)
+    self.head = None   # (bit, length) of the first run
+    self.tail = None   # (bit, length) of the last run
+
+  def _add_run(self, bit, length):
+    self.runs[bit, min(length, self.max_run)] += 1
+
+  def update(self, words):
+    """Adds the next block of words."""
+    words = np.asarray(words, dtype=np.int64).reshape(-1)
+    if np.size(words) == 0:
+      return
+
+    chunk = LfsrStats(self.data_out_width, self.hist_width, self.max_run)
+    chunk.num_sps = np.size(words)
+    chunk.hist = np.bincount(words >> (self.data_out_width - self.hist_width),
+                             minlength=2**self.hist_width)
+
+    # Runs of lfsr_out(0): edges between different bits
+    bits = (words & 1).astype(np.int8)
+    edges = np.flatnonzero(bits[1:] != bits[:-1]) + 1
+    bounds = np.concatenate(([0], edges, [np.size(bits)]))
+    lengths = np.diff(bounds)
+    chunk.head = (int(bits[0]), int(lengths[0]))
+    chunk.tail = (int(bits[-1]), int(lengths[-1]))
+    if np.size(lengths) > 2:
+      for b in (0, 1):
+        inner = lengths[1:-1][bits[bounds[1:-2]] == b]
+        chunk.runs[b] = np.bincount(np.minimum(inner, self.max_run),
+                                    minlength=self.max_run + 1)
+    self.merge(chunk)
+
+  def merge(self, other):
+    """Adds the statistics of the words that follow this sequence."""
+    if (other.data_out_width != self.data_out_width
+        or other.hist_width != self.hist_width or other.max_run != self.max_run):
+      raise ValueError("The statistics must have the same parameters.")
+    if other.num_sps == 0:
+      return self
+    if self.num_sps == 0:
+      self.head, self.tail = other.head, other.tail
+    else:
+      self_single = self.head_is_tail()
+      other_single = other.head_is_tail()
+      if self.tail[0] == other.head[0]:
+        # The last run continues in the other sequence
+        run = (self.tail[0], self.tail[1] + other.head[1])
+        if self_single and other_single:
+          self.head = self.tail = run
+        elif self_single:
+          self.head, self.tail = run, other.tail
+        elif other_single:
+          self.tail = run
+        else:
+          self._add_run(*run)
+          self.tail = other.tail
+      else:
+        # Both the runs at the boundary are closed
+        if not self_single:
+          self._add_run(*self.tail)
+        if not other_single:
+          self._add_run(*other.head)
+        self.tail = other.tail
+    self.num_sps += other.num_sps
+    self.hist += other.hist
+    self.runs += other.runs
+    return self
+
+  def head_is_tail(self):
+    """True if the sequence is a single run."""
+    return self.num_sps > 0 and self.head[1] == self.num_sps
+
+  def run_hist(self, cyclic=False):
+    """Runs of each length, including the first and the last runs.
+
+    Args:
+      cyclic: True if the sequence is a whole number of periods, so the
+        last run continues in the first one.
+
+    Returns:
+      Matrix (2, max_run+1) of the number of runs (see 'runs').
+    """
+    runs = self.runs.copy()
+    if self.num_sps == 0:
+      return runs
+    if self.head_is_tail():
+      runs[self.head[0], min(self.head[1], self.max_run)] += 1
+    elif cyclic and self.head[0] == self.tail[0]:
+      runs[self.head[0], min(self.head[1] + self.tail[1], self.max_run)] += 1
+    else:
+      runs[self.head[0], min(self.head[1], self.max_run)] += 1
+      runs[self.tail[0], min(self.tail[1], self.max_run)] += 1
+    return runs
+
+  def summary(self, cyclic=False):
+    """Returns the main statistics as a dictionary.
+
+    'chi2' is the chi-square statistic of the histogram against the uniform
+    distribution (about num_bins-1 for a uniform random sequence).
+    """
+    num_bins = np.size(self.hist)
+    expected = self.num_sps / num_bins
+    chi2 = float(np.sum((self.hist - expected)**2) / expected) if self.num_sps else float('nan')
+    runs = self.run_hist(cyclic)
+    return {'num_sps': self.num_sps, 'num_bins': num_bins,
+            'num_observed': int(np.count_nonzero(self.hist)),
+            'hist_min': int(np.min(self.hist)), 'hist_max': int(np.max(self.hist)),
+            'chi2': chi2, 'num_runs': int(np.sum(runs)),
+            'max_run_zeros': int(np.max(np.flatnonzero(runs[0]), initial=0)),
+            'max_run_ones': int(np.max(np.flatnonzero(runs[1]), initial=0))}
+
+
+def _model_chunk(args):
+  """Statistics of the words [start, stop) of the model (executed by the workers)."""
+  (lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, data_out_width,
+   hist_width, max_run, start, stop) = args
+  stats = LfsrStats(data_out_width, hist_width, max_run)
+  for words in iter_lfsr_words(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed,
+                               data_out_width, start, stop - start):
+    stats.update(words)
+  return stats
+
+
+def lfsr_model_stats(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, data_out_width,
+                     num_sps, start=0, hist_width=None, max_run=32,
+                     jobs=None, chunk_sps=CHUNK_SPS):
+  """Statistics of the output words [start, start+num_sps) of the model.
+
+  Args:
+    lfsr_type: 'fib' or 'gal'.
+    lfsr_width, lfsr_taps, lfsr_seed, data_out_width: Generics of the LFSR.
+    num_sps: Number of words.
+    start: Index of the first word (0 is the first line of data_out.txt).
+    hist_width, max_run: See LfsrStats.
+    jobs: Number of worker processes (None: number of CPUs, 1: no pool).
+    chunk_sps: Number of words of each chunk.
+
+  Returns:
+    LfsrStats.
+  """
+  points = [(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, data_out_width,
+             hist_width, max_run, i, min(i + chunk_sps, start + num_sps))
+            for i in range(start, start + num_sps, chunk_sps)]
+  stats = LfsrStats(data_out_width, hist_width, max_run)
+  if jobs == 1:
+    for chunk in map(_model_chunk, points):
+      stats.merge(chunk)
+  else:
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+      for chunk in pool.map(_model_chunk, points):
+        stats.merge(chunk)
+  return stats
+
+
+def lfsr_file_stats(fileName, data_out_width=None, hist_width=None, max_run=32,
+                    model=None, chunk_sps=BLOCK_SPS):
+  """Statistics of the output words written by a testbench.
+
+  Args:
+    fileName: data_out.txt of the simulation.
+    data_out_width: Bits of the words (default: length of the first line).
+    hist_width, max_run: See LfsrStats.
+    model: Optional tuple (lfsr_type, lfsr_width, lfsr_taps, lfsr_seed) to
+      compare the words with the bit-true model.
+    chunk_sps: Number of words of each block.
+
+  Returns:
+    Tuple (stats, num_errors, first_error), where first_error is
+    (index, simulation, model) of the first different word, or None.
+  """
+  if data_out_width is None:
+    with open(fileName, "rb") as file:
+      data_out_width = len(file.readline().strip())
+  stats = LfsrStats(data_out_width, hist_width, max_run)
+  num_errors = 0
+  first_error = None
+
+  for words in iter_fxp_txt(fileName, data_out_width, signed=False, chunk_sps=chunk_sps):
+    if model is not None:
+      words_model = lfsr_words(*model, data_out_width, stats.num_sps, np.size(words))
+      err = np.flatnonzero(words != words_model)
+      if np.size(err) and first_error is None:
+        first_error = (stats.num_sps + int(err[0]), int(words[err[0]]), int(words_model[err[0]]))
+      num_errors += np.size(err)
+    stats.update(words)
+  return stats, num_errors, first_error
+
+
+def _is_prime(n):
+  """Deterministic Miller-Rabin test (n < 3.3e24)."""
+  if n < 2:
+    return False
+  bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+  for p in bases:
+    if n % p == 0:
+      return n == p
+  d, r = n - 1, 0
+  while d % 2 == 0:
+    d, r = d // 2, r + 1
+  for a in bases:
+    x = pow(a, d, n)
+    if x in (1, n - 1):
+      continue
+    for _ in range(r - 1):
+      x = x * x % n
+      if x == n - 1:
+        break
+    else:
+      return False
+  return True
+
+
+def _pollard_rho(n):
+  """A non-trivial factor of the composite number n (Pollard rho, Brent)."""
+  if n % 2 == 0:
+    return 2
+  c = 1
+  while True:
+    x = y = 2
+    d = 1
+    while d == 1:
+      x = (x * x + c) % n
+      y = (y * y + c) % n
+      y = (y * y + c) % n
+      d = math.gcd(abs(x - y), n)
+    if d != n:
+      return d
+    c += 1
+
+
+def prime_factors(n):
+  """Distinct prime factors of n."""
+  factors = set()
+  stack = [n]
+  while stack:
+    m = stack.pop()
+    if m == 1:
+      continue
+    if _is_prime(m):
+      factors.add(m)
+      continue
+    d = _pollard_rho(m)
+    stack += [d, m // d]
+  return sorted(factors)
+
+
+def _gf2_polymulmod(a, b, m):
+  """Product a*b mod m of GF(2) polynomials (bit k: coefficient of x**k)."""
+  deg_m = m.bit_length() - 1
+  out = 0
+  while b:
+    if b & 1:
+      out ^= a
+    b >>= 1
+    a <<= 1
+    if a >> deg_m & 1:
+      a ^= m
+  return out
+
+
+def _gf2_polymod(a, m):
+  """Remainder of the GF(2) polynomial a divided by m."""
+  deg_m = m.bit_length() - 1
+  while a.bit_length() - 1 >= deg_m:
+    a ^= m << (a.bit_length() - 1 - deg_m)
+  return a
+
+
+def _gf2_polydiv(a, m):
+  """Quotient of the GF(2) polynomial a divided by m (m divides a)."""
+  deg_m = m.bit_length() - 1
+  q = 0
+  while a.bit_length() - 1 >= deg_m:
+    shift = a.bit_length() - 1 - deg_m
+    q |= 1 << shift
+    a ^= m << shift
+  return q
+
+
+def _gf2_polygcd(a, b):
+  """Greatest common divisor of two GF(2) polynomials."""
+  while b:
+    a, b = b, _gf2_polymod(a, b)
+  return a
+
+
+def _gf2_x_pow(n, m):
+  """x**n mod m."""
+  out, x = _gf2_polymod(1, m), _gf2_polymod(2, m)
+  while n > 0:
+    if n & 1:
+      out = _gf2_polymulmod(out, x, m)
+    n >>= 1
+    if n:
+      x = _gf2_polymulmod(x, x, m)
+  return out
+
+
+def gf2_min_poly(cols, state):
+  """Minimal polynomial of a state under a GF(2) matrix (columns).
+
+  The smallest-degree m(x) with m(A) * state = 0, from the first linear
+  dependency among state, A*state, A**2*state, ... (bit k: x**k).
+  """
+  # Reduced vectors by pivot bit, with the powers of A that compose them
+  basis = {}
+  v, k = state, 0
+  while True:
+    r, combo = v, 1 << k
+    while r:
+      pivot = r.bit_length() - 1
+      if pivot not in basis:
+        break
+      r ^= basis[pivot][0]
+      combo ^= basis[pivot][1]
+    if r == 0:
+      return combo
+    basis[r.bit_length() - 1] = (r, combo)
+    v, k = gf2_matvec(cols, v), k + 1
+
+
+def gf2_poly_order(m):
+  """Order of x modulo the GF(2) polynomial m (m(0) = 1).
+
+  The degrees d of the irreducible factors of m (distinct-degree
+  factorization) and their maximum multiplicity e give a multiple
+  2**ceil(log2(e)) * lcm(2**d-1) of the order, which is then reduced by
+  each of its prime factors.
+  """
+  if m & 1 == 0:
+    raise ValueError("x divides the polynomial, it has no order.")
+  degrees, mult = [], 1
+  f, d = m, 0
+  while f.bit_length() > 1:
+    d += 1
+    g = _gf2_polygcd(f, _gf2_x_pow(2**d, f) ^ 2)
+    if g == 1:
+      continue
+    degrees.append(d)
+    # Remove the factors of degree d, with their multiplicity
+    e = 0
+    while True:
+      g = _gf2_polygcd(f, g)
+      if g == 1:
+        break
+      f = _gf2_polydiv(f, g)
+      e += 1
+    mult = max(mult, e)
+  order, primes = 1, set()
+  for d in degrees:
+    order = order * (2**d - 1) // math.gcd(order, 2**d - 1)
+    primes.update(prime_factors(2**d - 1))
+  if mult > 1:
+    order <<= (mult - 1).bit_length()
+    primes.add(2)
+  for p in sorted(primes):
+    while order % p == 0 and _gf2_x_pow(order // p, m) == 1:
+      order //= p
+  return order
+
+
+def lfsr_period(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed):
+  """Period of the sequence of states from the seed.
+
+  The period is the order of x modulo the minimal polynomial of the seed
+  (gf2_min_poly, a divisor of the characteristic polynomial of the LFSR),
+  so it is exact for reducible polynomials too.
+
+  Returns:
+    The smallest p > 0 with A**p * seed = seed (2**lfsr_width-1 for a
+    maximal-length LFSR), or None if the seed never comes back (singular
+    matrix).
+  """
+  cols = lfsr_matrix(lfsr_type, lfsr_width, lfsr_taps)
+  m = gf2_min_poly(cols, lfsr_seed)
+  if m & 1 == 0:
+    return None
+  return gf2_poly_order(m)
+
+
+def _scan_chunk(args):
+  """Indexes of the states equal to 'target' in [start, stop) (executed by the workers)."""
+  lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, target, start, stop = args
+  state = lfsr_jump(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, start)
+  found = []
+  i = start
+  for states in iter_lfsr_states(lfsr_type, lfsr_width, lfsr_taps, state, stop - start):
+    found += (np.flatnonzero(states == np.uint64(target)) + i).tolist()
+    i += np.size(states)
+  return found
+
+
+def lfsr_period_scan(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, num_sps,
+                     jobs=None, chunk_sps=CHUNK_SPS):
+  """Period of the states from the seed, by scanning the states 1, ..., num_sps.
+
+  Returns:
+    The first n in [1, num_sps] with state n = seed, or None.
+  """
+  points = [(lfsr_type, lfsr_width, lfsr_taps, lfsr_seed, lfsr_seed,
+             i, min(i + chunk_sps, num_sps + 1))
+            for i in range(1, num_sps + 1, chunk_sps)]
+  if jobs == 1:
+    results = map(_scan_chunk, points)
+    for found in results:
+      if found:
+        return found[0]
+  else:
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+      for found in pool.map(_scan_chunk, points):
+        if found:
+          return found[0]
+  return None
+
+
+def _print_stats(stats, cyclic, max_run_print=8):
+  summary = stats.summary(cyclic)
+  print("Read %i samples. Nbits = %i, nbins = %i." % (summary['num_sps'],
+        stats.data_out_width, summary['num_bins']))
+  print("observed values: %i over %i (%.2f%%)." % (summary['num_observed'], summary['num_bins'],
+        100 * summary['num_observed'] / summary['num_bins']))
+  print("bin counts: min %i, max %i, chi-square %.1f (%i bins)"
+        % (summary['hist_min'], summary['hist_max'], summary['chi2'], summary['num_bins']))
+
+  runs = stats.run_hist(cyclic)
+  num_runs = max(summary['num_runs'], 1)
+  print("runs of lfsr_out(0): %i" % summary['num_runs'])
+  print("  length      zeros       ones   fraction   expected")
+  for k in range(1, min(max_run_print, stats.max_run) + 1):
+    print("  %6i %10i %10i %10.6f %10.6f" % (k, runs[0, k], runs[1, k],
+          (runs[0, k] + runs[1, k]) / num_runs, 2.0**-k))
+
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Statistics of the output of the LFSRs.')
+  parser.add_argument('--type', choices=('fib', 'gal'), default='fib', help='Fibonacci or Galois LFSR')
+  parser.add_argument('--width', type=int, default=32, help='lfsr_width')
+  parser.add_argument('--taps', default='80200006', help='lfsr_taps (hex)')
+  parser.add_argument('--seed', default='1', help='lfsr_seed (hex)')
+  parser.add_argument('--out-width', type=int, default=None, help='data_out_width')
+  parser.add_argument('--file', default=None, help='data_out.txt of the simulation')
+  parser.add_argument('--check', action='store_true', help='compare the file with the model')
+  parser.add_argument('--num', type=float, default=None,
+                      help='words of the model (default: one period if --file is not used)')
+  parser.add_argument('--start', type=float, default=0, help='first word of the model')
+  parser.add_argument('--period', action='store_true', help='exact period (order of the minimal polynomial)')
+  parser.add_argument('--scan', type=float, default=None,
+                      help='verify the period by scanning this number of states')
+  parser.add_argument('--hist-width', type=int, default=None)
+  parser.add_argument('--max-run', type=int, default=32)
+  parser.add_argument('--plot', nargs='?', const='show', default=None,
+                      help="histogram: --plot (interactive) or --plot file name")
+  parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: number of CPUs)')
+  parser.add_argument('--chunk-sps', type=int, default=CHUNK_SPS)
+  args = parser.parse_args(argv)
+
+  model = (args.type, args.width, int(args.taps, 16), int(args.seed, 16))
+  t_start = time.perf_counter()
+
+  if args.period or args.scan is not None:
+    period = lfsr_period(*model)
+    print("Period: %s (2**%i-1 = %i)" % (period, args.width, 2**args.width - 1))
+    if args.scan is not None:
+      period_scan = lfsr_period_scan(*model, int(args.scan), args.jobs, args.chunk_sps)
+      print("Period (scan of %i states): %s" % (int(args.scan), period_scan))
+    print("Time taken by program is %.2f s" % (time.perf_counter() - t_start))
+    return 0
+
+  cyclic = False
+  if args.file is not None:
+    stats, num_errors, first_error = lfsr_file_stats(
+        args.file, args.out_width, args.hist_width, args.max_run,
+        model if args.check else None)
+    title = args.file
+  else:
+    out_width = args.width // 2 if args.out_width is None else args.out_width
+    if args.num is None:
+      num_sps = lfsr_period(*model)
+      if num_sps is None:
+        raise ValueError("The seed never comes back (singular matrix), use --num.")
+      cyclic = True
+    else:
+      num_sps = int(args.num)
+    stats = lfsr_model_stats(*model, out_width, num_sps, int(args.start),
+                             args.hist_width, args.max_run, args.jobs, args.chunk_sps)
+    title = 'lfsr_%s (model)' % args.type
+
+  _print_stats(stats, cyclic)
+  ret = 0
+  if args.file is not None and args.check:
+    print("Checked %i words with the model, %i errors" % (stats.num_sps, num_errors))
+    if first_error is not None:
+      print("First error: word %i, simulation %i, model %i" % first_error)
+    ret = int(num_errors > 0)
+  print("Time taken by program is %.2f s" % (time.perf_counter() - t_start))
+
+  if args.plot is not None:
+    plt = fig_out.pyplot(args.plot)
+    plt.figure()
+    plt.bar(np.arange(np.size(stats.hist)), stats.hist, width=1)
+    plt.xlim([0, np.size(stats.hist) - 1])
+    plt.grid(True)
+    plt.xlabel('LFSR out')
+    plt.ylabel('Frequency')
+    plt.title('Histogram of %s (%d bit, %d bins)' % (title, stats.hist_width, np.size(stats.hist)))
+    fig_out.finish(plt, args.plot)
+  return ret
+
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -3,6 +3,8 @@
 #
 # > vivado -mode tcl -source sim_tb.tcl
 #
+# (without Vivado: python packages/python/sim_tb.py, GHDL or NVC)
+#
 # simulated file at the end of the script in section 
 # "SET TOP FILES"
 ################################################